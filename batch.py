@@ -0,0 +1,256 @@
+from typing import List, Union, Iterator, Tuple
+import argparse
+import concurrent.futures
+import itertools
+import os
+import signal
+
+import enums
+import support
+import sinks
+import parse_cache
+import main
+import vector
+
+# variable the output of a batch call is stored in
+result_name = "batch_result"
+
+class BatchResult(object):
+    """BatchResult class, outcome of one program or one function call of a batch"""
+    def __init__(self, source : str, lines : List[str], value : Union[dict, support.lit_types, None], error : support.Error = None):
+        """__init__ for BatchResult
+
+        Args:
+            source (str): file name of the program or the call that was made
+            lines (List[str]): values the OUT statements wrote
+            value (Union[dict, support.lit_types, None]): variables of the main code for a program, the output for a call
+            error (support.Error, optional): error the run stopped with. Defaults to None.
+        """
+        self.source = source
+        self.lines = lines
+        self.value = value
+        self.error = error
+
+    def __str__(self) -> str:
+        return '{source} = {value}'.format(
+            source = self.source,
+            value = self.error if self.error is not None else self.value
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+class TaskTimeout(Exception):
+    """TaskTimeout class, raised in a worker when a single program or call runs too long"""
+    pass
+
+# raiseTimeout :: int, object -> None
+def raiseTimeout(signal_number : int, frame : object) -> None:
+    raise TaskTimeout()
+
+# runTask :: List[support.Node], dict, str, float, int -> Tuple[List[str], Union[support.Error, dict]]
+def runTask(tree : List[support.Node], found_funcs : dict, engine : str, timeout : float, max_steps : int = None) -> Tuple[List[str], Union[support.Error, dict]]:
+    """runTask function, runs a parsed program in a worker, stopping it with an error after the timeout
+
+    Args:
+        tree (List[support.Node]): parsed main code
+        found_funcs (dict): al found functions
+        engine (str): engine to run the program with, see main.run
+        timeout (float): seconds the program may run, None or 0 for no limit
+        max_steps (int, optional): statements the program may run, frames and tracing only. Defaults to no limit.
+
+    Returns:
+        Tuple[List[str], Union[support.Error, dict]]: written lines and the outcome of main.run
+    """
+    sink = sinks.ListSink()
+    use_timer = bool(timeout) and hasattr(signal, "setitimer")
+    if use_timer:
+        signal.signal(signal.SIGALRM, raiseTimeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        result = main.run(tree, found_funcs, engine, sink, max_steps=max_steps)
+    except TaskTimeout:
+        result = support.Error("timed out after " + str(timeout) + " seconds", 0)
+    except RecursionError:
+        result = support.Error("maximum recursion depth exceeded", 0)
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return sink.lines(), result
+
+# runFile :: Tuple[str, List[support.Node], dict], str, float, int -> BatchResult
+def runFile(program : Tuple[str, List[support.Node], dict], engine : str, timeout : float, max_steps : int = None) -> BatchResult:
+    file_name, tree, found_funcs = program
+    if len(tree) > 0 and type(tree[0]) == support.Error:
+        return BatchResult(file_name, [], None, tree[0])
+    lines, result = runTask(tree, found_funcs, engine, timeout, max_steps)
+    if type(result) is support.Error:
+        return BatchResult(file_name, lines, None, result)
+    return BatchResult(file_name, lines, result)
+
+# callTree :: str, support.lit_types -> List[support.Node]
+def callTree(function_name : str, input : support.lit_types) -> List[support.Node]:
+    """callTree function, main code that calls a function with an input and stores its output in result_name
+
+    Args:
+        function_name (str): function to call
+        input (support.lit_types): input of the call
+
+    Returns:
+        List[support.Node]: main code with the single call
+    """
+    input = support.literalValue(input)
+    input_type = enums.token_types.INT if type(input) is int else enums.token_types.STRING
+    call = support.FunctionCall(function_name, 1, support.Node(input, 1, input_type), None, enums.token_types.VAR)
+    call.output = support.VariableNode(result_name, support.Node(None, 1, None), 1, enums.token_types.VAR)
+    return [call]
+
+# functions of the program a worker makes calls to, set once per worker by setFunctions
+worker_functions = {}
+
+# setFunctions :: dict -> None
+def setFunctions(found_funcs : dict) -> None:
+    global worker_functions
+    worker_functions = found_funcs
+
+# runCall :: Tuple[str, support.lit_types], str, float, int -> BatchResult
+def runCall(call : Tuple[str, support.lit_types], engine : str, timeout : float, max_steps : int = None) -> BatchResult:
+    function_name, input = call
+    lines, result = runTask(callTree(function_name, input), worker_functions, engine, timeout, max_steps)
+    source = function_name + "(" + str(input) + ")"
+    if type(result) is support.Error:
+        return BatchResult(source, lines, None, result)
+    return BatchResult(source, lines, result.get(result_name))
+
+# parseProgram :: parse_cache.ParseCache, str -> Tuple[str, List[support.Node], dict]
+def parseProgram(cache : parse_cache.ParseCache, file_name : str) -> Tuple[str, List[support.Node], dict]:
+    """parseProgram function, parses a file of a batch, a file that can not be read gives an error as its tree
+
+    Args:
+        cache (parse_cache.ParseCache): cache the file is parsed through
+        file_name (str): path of the file
+
+    Returns:
+        Tuple[str, List[support.Node], dict]: the file name, either list of errors or created AST and al found functions
+    """
+    try:
+        tree, found_funcs = cache.parseFile(file_name)
+    except OSError as error:
+        return file_name, [support.Error("cant read " + file_name + ": " + (error.strerror or str(error)), 0)], {}
+    return file_name, tree, found_funcs
+
+# runFiles :: List[str], str, int, int, float, int -> Iterator[BatchResult]
+def runFiles(file_names : List[str], engine : str = "vm", workers : int = None, chunk_size : int = 1, timeout : float = None,
+             max_steps : int = None) -> Iterator[BatchResult]:
+    """runFiles function, runs many programs on a process pool, each file is parsed once in this process
+
+    Args:
+        file_names (List[str]): programs to run
+        engine (str, optional): engine to run them with, see main.run. Defaults to "vm".
+        workers (int, optional): amount of worker processes. Defaults to the amount of cores.
+        chunk_size (int, optional): programs sent to a worker at once. Defaults to 1.
+        timeout (float, optional): seconds a single program may run. Defaults to no limit.
+        max_steps (int, optional): statements a single program may run, frames and tracing only. Defaults to no limit.
+
+    Yields:
+        BatchResult: outcome of every program, in the order of the files, with an error for a file that can not be read
+    """
+    cache = parse_cache.ParseCache()
+    programs = (parseProgram(cache, file_name) for file_name in file_names)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(runFile, programs, itertools.repeat(engine), itertools.repeat(timeout), itertools.repeat(max_steps), chunksize=chunk_size)
+
+# runInputs :: str, str, List[support.lit_types], str, int, int, float, int -> Iterator[BatchResult]
+def runInputs(file_name : str, function_name : str, inputs : List[support.lit_types], engine : str = "vm", workers : int = None,
+              chunk_size : int = 64, timeout : float = None, max_steps : int = None) -> Iterator[BatchResult]:
+    """runInputs function, calls a declared function for many inputs on a process pool
+
+    The program is parsed once and its functions are sent to every worker once, the
+    inputs go in chunks.
+
+    Args:
+        file_name (str): program with the function
+        function_name (str): function to call
+        inputs (List[support.lit_types]): inputs to call it with
+        engine (str, optional): engine to run the calls with, see main.run. Defaults to "vm".
+        workers (int, optional): amount of worker processes. Defaults to the amount of cores.
+        chunk_size (int, optional): calls sent to a worker at once. Defaults to 64.
+        timeout (float, optional): seconds a single call may run. Defaults to no limit.
+        max_steps (int, optional): statements a single call may run, frames and tracing only. Defaults to no limit.
+
+    Yields:
+        BatchResult: outcome of every call, in the order of the inputs
+    """
+    file_name, tree, found_funcs = parseProgram(parse_cache.ParseCache(), file_name)
+    if len(tree) > 0 and type(tree[0]) == support.Error:
+        yield BatchResult(file_name, [], None, tree[0])
+        return
+    if function_name not in found_funcs:
+        yield BatchResult(file_name, [], None, support.Error("function " + function_name + " not declared", 0))
+        return
+    calls = ((function_name, input) for input in inputs)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=setFunctions, initargs=(found_funcs,)) as executor:
+        yield from executor.map(runCall, calls, itertools.repeat(engine), itertools.repeat(timeout), itertools.repeat(max_steps), chunksize=chunk_size)
+
+# runVector :: str, str, List[int] -> Iterator[BatchResult]
+def runVector(file_name : str, function_name : str, inputs : List[int]) -> Iterator[BatchResult]:
+    """runVector function, calls a pure function for many int inputs in lockstep with vector.BatchInterpreter
+
+    Runs in this process instead of on a pool, an error stops al calls.
+
+    Args:
+        file_name (str): program with the function
+        function_name (str): function to call
+        inputs (List[int]): inputs to call it with
+
+    Yields:
+        BatchResult: outcome of every call, in the order of the inputs, or the single error of the batch
+    """
+    file_name, tree, found_funcs = parseProgram(parse_cache.ParseCache(), file_name)
+    if len(tree) > 0 and type(tree[0]) == support.Error:
+        yield BatchResult(file_name, [], None, tree[0])
+        return
+    outputs = vector.BatchInterpreter(found_funcs).run(function_name, [support.literalValue(input) for input in inputs])
+    if type(outputs) is support.Error:
+        yield BatchResult(file_name, [], None, outputs)
+        return
+    for input, output in zip(inputs, outputs.tolist()):
+        yield BatchResult(function_name + "(" + str(input) + ")", [], output)
+
+def batch():
+    argument_parser = argparse.ArgumentParser(description="runs many FROM HERE TO THERE programs, or many calls to one function, on a process pool")
+    argument_parser.add_argument("files", nargs="+", help="programs to run, the program with the function when --function is given")
+    argument_parser.add_argument("--function", help="function to call for every input instead of running the programs")
+    argument_parser.add_argument("--inputs", nargs="+", default=[], help="inputs to call the function with")
+    argument_parser.add_argument("--range", nargs=2, type=int, metavar=("START", "STOP"), help="call the function for every int from START up to STOP")
+    argument_parser.add_argument("--engine", choices=["tree", "frames", "tracing", "vm", "closures", "python"], default="vm", help="execution engine")
+    argument_parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    argument_parser.add_argument("--chunk-size", type=int, default=None, help="programs or calls sent to a worker at once")
+    argument_parser.add_argument("--timeout", type=float, default=None, help="seconds a single program or call may run")
+    argument_parser.add_argument("--max-steps", type=int, default=None, help="statements a single program or call may run, frames and tracing engines only")
+    argument_parser.add_argument("--vector", action="store_true", help="run the calls in lockstep with numpy in this process, pure functions with int inputs only")
+    arguments = argument_parser.parse_args()
+    if arguments.max_steps is not None and arguments.engine not in ("frames", "tracing"):
+        argument_parser.error("--max-steps only works with --engine frames or tracing")
+    if arguments.vector and arguments.function is None:
+        argument_parser.error("--vector needs --function")
+
+    if arguments.function is not None:
+        inputs = list(arguments.inputs)
+        if arguments.range is not None:
+            inputs += list(range(*arguments.range))
+        if arguments.vector:
+            results = runVector(arguments.files[0], arguments.function, inputs)
+        else:
+            results = runInputs(arguments.files[0], arguments.function, inputs, arguments.engine, arguments.workers,
+                                arguments.chunk_size or 64, arguments.timeout, arguments.max_steps)
+    else:
+        results = runFiles(arguments.files, arguments.engine, arguments.workers, arguments.chunk_size or 1, arguments.timeout, arguments.max_steps)
+
+    for result in results:
+        for line in result.lines:
+            print(line)
+        print(result)
+
+if __name__ == "__main__":
+    batch()
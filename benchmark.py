@@ -0,0 +1,173 @@
+from typing import Tuple
+import argparse
+import contextlib
+import io
+import os
+import time
+
+import lexer
+import parser
+import support
+import main
+import sinks
+import interpreter
+
+# example programs with the function to call and its input
+examples = [
+    ("fibonaci.txt", "fib", 15),
+    ("test_subroutines_2.txt", "sommig", 1000),
+    ("test_subroutines_1.txt", "bool_even", 50),
+]
+
+# prints the numbers from 0 up to the given count, the lexer reads "-" as adding
+output_program = """FROM 0 TO i
+FROM i TO OUT
+FROM i TO i - 1
+FROM i TO loop
+FROM loop TO < {count} : -4 ELSE 1
+FROM loop TO LINE
+"""
+
+# loadExample :: str, str, int -> Tuple[list, dict]
+def loadExample(file_name : str, function_name : str, input : int) -> Tuple[list, dict]:
+    """loadExample function, parses an example program with a call to one of its functions as main code
+
+    Args:
+        file_name (str): file with the function definitions
+        function_name (str): function to call
+        input (int): input of the call
+
+    Returns:
+        Tuple[list, dict]: parsed main code and al found functions
+    """
+    with open(file_name, "r") as code:
+        source = code.read()
+    source += "\nFROM {function} : {input} TO benchmark_result\nFROM benchmark_result TO OUT\n".format(
+        function = function_name,
+        input = input
+    )
+    return parser.Parser().parse(list(lexer.lexTokenize(source)))
+
+# timeEngine :: list, dict, str, int -> float
+def timeEngine(tree : list, found_funcs : dict, engine : str, repeats : int) -> float:
+    """timeEngine function, best wall time of running a program, output is thrown away
+
+    Args:
+        tree (list): parsed main code
+        found_funcs (dict): al found functions
+        engine (str): engine to run the program with, see main.run
+        repeats (int): amount of runs
+
+    Returns:
+        float: fastest run in seconds
+    """
+    best = None
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = main.run(tree, found_funcs, engine)
+            elapsed = time.perf_counter() - start
+        if type(result) is support.Error:
+            raise RuntimeError(str(result))
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+# memoStats :: list, dict, str -> dict
+def memoStats(tree : list, found_funcs : dict, engine : str) -> dict:
+    """memoStats function, statistics of the memo of pure function calls after one run of a program, output is thrown away
+
+    Args:
+        tree (list): parsed main code
+        found_funcs (dict): al found functions
+        engine (str): frames or tracing, the engines that memoize, see main.run
+
+    Returns:
+        dict: size, max_size, hits, misses and evictions of the memo, see memo.LRUCache.stats
+    """
+    machine = interpreter.Interpreter(found_funcs, sink=sinks.NullSink(), hot_loop=main.hot_loop if engine == "tracing" else 0)
+    result = machine.run(tree)
+    if type(result) is support.Error:
+        raise RuntimeError(str(result))
+    return machine.memo.stats()
+
+# timeOutput :: list, dict, str, str, int -> float
+def timeOutput(tree : list, found_funcs : dict, engine : str, sink_name : str, repeats : int) -> float:
+    """timeOutput function, best wall time of running a program that mostly prints, written to the null device
+
+    The text streams are line buffered like a terminal, so every printed line costs a write.
+
+    Args:
+        tree (list): parsed main code
+        found_funcs (dict): al found functions
+        engine (str): engine to run the program with, see main.run
+        sink_name (str): sink to write to, see sinks.makeSink
+        repeats (int): amount of runs
+
+    Returns:
+        float: fastest run in seconds
+    """
+    best = None
+    for _ in range(repeats):
+        with open(os.devnull, "w", buffering=1) as text_stream, open(os.devnull, "wb") as binary_stream:
+            with contextlib.redirect_stdout(text_stream):
+                if sink_name == "buffered":
+                    sink = sinks.BufferedSink(text_stream)
+                elif sink_name == "binary":
+                    sink = sinks.BinarySink(binary_stream)
+                else:
+                    sink = sinks.makeSink(sink_name)
+                start = time.perf_counter()
+                result = main.run(tree, found_funcs, engine, sink)
+                elapsed = time.perf_counter() - start
+        if type(result) is support.Error:
+            raise RuntimeError(str(result))
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def benchmark():
+    argument_parser = argparse.ArgumentParser(description="times the execution engines on the example programs")
+    argument_parser.add_argument("--engines", nargs="+", default=["tree", "frames", "tracing", "vm", "closures", "python"], help="engines to time, the first is the baseline")
+    argument_parser.add_argument("--repeats", type=int, default=5, help="runs per engine, the fastest counts")
+    argument_parser.add_argument("--sinks", nargs="+", default=["stdout", "buffered", "binary", "null"], help="OUT sinks to time")
+    argument_parser.add_argument("--lines", type=int, default=20000, help="lines the OUT throughput program prints")
+    arguments = argument_parser.parse_args()
+
+    for file_name, function_name, input in examples:
+        tree, found_funcs = loadExample(file_name, function_name, input)
+        baseline = None
+        for engine in arguments.engines:
+            elapsed = timeEngine(tree, found_funcs, engine, arguments.repeats)
+            if baseline is None:
+                baseline = elapsed
+            print('{call:16} {engine:8} {elapsed:10.6f}s {speedup:8.1f}x'.format(
+                call = function_name + "(" + str(input) + ")",
+                engine = engine,
+                elapsed = elapsed,
+                speedup = baseline / elapsed
+            ))
+            if engine == "frames" or engine == "tracing":
+                # the hits show how much of the time of frames and tracing the memo saves
+                print('{call:16} {engine:8} memo {size}/{max_size}, hits={hits}, misses={misses}, evictions={evictions}'.format(
+                    call = "",
+                    engine = "",
+                    **memoStats(tree, found_funcs, engine)
+                ))
+
+    tree, found_funcs = parser.Parser().parse(list(lexer.lexTokenize(output_program.format(count = arguments.lines))))
+    for engine in arguments.engines:
+        if engine == "tree":
+            # the Visitor copies al variables on every statement, the sink would not show
+            continue
+        for sink_name in arguments.sinks:
+            elapsed = timeOutput(tree, found_funcs, engine, sink_name, arguments.repeats)
+            print('{call:16} {engine:8} {sink:8} {rate:12.0f} lines/s'.format(
+                call = "OUT(" + str(arguments.lines) + ")",
+                engine = engine,
+                sink = sink_name,
+                rate = arguments.lines / elapsed
+            ))
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,409 @@
+from typing import List, Union, Callable
+import sys
+
+import enums
+import support
+import symbol_table
+import interpreter
+import vm
+import sinks
+
+class Halt(Exception):
+    """Halt class, stops a closure program with the error of the statement that failed"""
+    def __init__(self, error : support.Error):
+        """__init__ for Halt
+
+        Args:
+            error (support.Error): error the program stops with
+        """
+        super().__init__(str(error))
+        self.error = error
+
+# index a call closure gives back, past the end of every code block so the statement loop of execute stops
+CALL = sys.maxsize
+
+# execute :: Program, List[Callable[[list], int]], list -> None
+def execute(program : "Program", steps : List[Callable[[list], int]], values : list) -> None:
+    """execute function, runs the closures of a code block, each one gives back the index of the next
+
+    A call closure leaves the callee in program.call and gives back CALL, the callee then runs in
+    the same loop while the caller waits on a list, so deep recursion does not grow the python stack.
+
+    Args:
+        program (Program): program the code block belongs to
+        steps (List[Callable[[list], int]]): closures of the code block
+        values (list): frame of the code block, variables and constants by slot
+    """
+    stack = []
+    program_counter = 0
+    program_length = len(steps)
+    while True:
+        while program_counter < program_length:
+            program_counter = steps[program_counter](values)
+        if program_counter == CALL:
+            callee_steps, callee_values, finish, line_nr = program.call
+            if len(stack) >= program.max_depth:
+                raise Halt(support.Error("function calls nested deeper than " + str(program.max_depth), line_nr))
+            stack.append((steps, values, finish))
+            steps = callee_steps
+            values = callee_values
+            program_counter = 0
+            program_length = len(steps)
+            continue
+        if not stack:
+            return
+        callee_values = values
+        steps, values, finish = stack.pop()
+        program_length = len(steps)
+        program_counter = finish(values, callee_values)
+
+# unsetError :: vm.Block, list, List[int], int -> support.Error
+def unsetError(block : vm.Block, values : list, read_slots : List[int], line_nr : int) -> support.Error:
+    for slot in read_slots:
+        if values[slot] is None:
+            return support.Error("Var " + block.names[slot] + " has no value", line_nr)
+    return support.Error("Var has no value", line_nr)
+
+class Program(object):
+    """Program class, the closures of the main code and al functions"""
+    def __init__(self, max_depth : int = 100000):
+        """__init__ for Program
+
+        Args:
+            max_depth (int, optional): amount of function calls that may wait for their callee. Defaults to 100000.
+        """
+        self.main = None
+        self.functions = {}
+        # steps per vm.Block, keyed by the block so a function named main does not replace the main code
+        self.bodies = {}
+        self.sink = sinks.default_sink
+        self.max_depth = max_depth
+        # steps, frame, finish closure and line number of the call that is about to start
+        self.call = None
+
+    def __str__(self) -> str:
+        return 'Program({statements} statements, {functions} functions)'.format(
+            statements = sum(len(steps) for steps in self.bodies.values()),
+            functions = len(self.functions)
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # run :: sinks.Sink -> Union[support.Error, dict]
+    def run(self, sink : sinks.Sink = None) -> Union[support.Error, dict]:
+        """run function, runs the main code
+
+        Args:
+            sink (sinks.Sink, optional): where OUT statements write to. Defaults to sinks.current().
+
+        Returns:
+            Union[support.Error, dict]: the first error or the variables of the main code after the last statement
+        """
+        self.sink = sinks.current() if sink is None else sink
+        block = self.main
+        values = list(block.template)
+        try:
+            execute(self, self.bodies[block], values)
+        except Halt as halt:
+            return halt.error
+        return {name : values[slot] for name, slot in block.slots.items() if values[slot] is not None}
+
+class Compiler(object):
+    """Compiler class, turns every statement of a parsed tree into a Python closure once
+
+    The operator, the slots a statement reads and writes and the index of the next
+    statement are bound when the closure is made, so running a statement does no
+    dispatch on node types. Values are plain ints and strings, the same as in the vm.
+    """
+    def __init__(self):
+        self.program = None
+
+    def __str__(self) -> str:
+        return 'Compiler()'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # compile :: List[support.Node], dict -> Program
+    def compile(self, tree : List[support.Node], found_funcs : dict) -> Program:
+        """compile function, makes the closures of the main code and al functions
+
+        Args:
+            tree (List[support.Node]): parsed main code
+            found_funcs (dict): al found functions
+
+        Returns:
+            Program: compiled program
+        """
+        program = Program()
+        self.program = program
+        table = symbol_table.resolveSlots(tree, found_funcs)
+        program.main = vm.Block(table.main.name, 1, table.main)
+        program.bodies[program.main] = []
+        for function_name, function in found_funcs.items():
+            program.functions[function_name] = vm.Block(function_name, function.line_nr, table.scope(function_name))
+            program.bodies[program.functions[function_name]] = []
+
+        self.compileBlock(program.main, tree)
+        for function_name, function in found_funcs.items():
+            # the Visitor runs a function as an INPUT assignment followed by the body, jumps count that first statement
+            self.compileBlock(program.functions[function_name], [None] + function.commands)
+        return program
+
+    # compileBlock :: vm.Block, List[support.Node] -> None
+    def compileBlock(self, block : vm.Block, node_list : List[support.Node]) -> None:
+        """compileBlock function, makes the closures of one code block, the list is filled in place so calls made earlier see it
+
+        Args:
+            block (vm.Block): slot layout of the code block
+            node_list (List[support.Node]): statements of the code block, None for the INPUT assignment of a function
+        """
+        steps = self.program.bodies[block]
+        for index, node in enumerate(node_list):
+            if node is None:
+                steps.append(self.compileSkip(index + 1))
+            else:
+                steps.append(self.compileStatement(block, node, index, len(node_list)))
+
+    # compileStatement :: vm.Block, support.Node, int, int -> Callable[[list], int]
+    def compileStatement(self, block : vm.Block, node : support.Node, index : int, length : int) -> Callable[[list], int]:
+        """compileStatement function, makes the closure of a single statement
+
+        Args:
+            block (vm.Block): slot layout of the code block
+            node (support.Node): statement to compile
+            index (int): index of the statement in the code block
+            length (int): amount of statements in the code block
+
+        Returns:
+            Callable[[list], int]: closure that runs the statement on a frame and gives back the index of the next statement
+        """
+        line_nr = node.line_nr
+        node_type = type(node)
+
+        if node_type is support.MathNode:
+            function = interpreter.math_functions.get(node.token_type)
+            if function is None:
+                return self.compileError(support.Error("unknown operator in Math statement", line_nr))
+            return self.compileMath(block, function, block.variable(node.value.variable_name), self.operand(block, node.rhs), line_nr, index + 1)
+
+        elif node_type is support.IfNode:
+            return self.compileIf(block, node, index + 1)
+
+        elif node_type is support.FunctionCall:
+            callee = self.program.functions.get(node.value)
+            if callee is None:
+                return self.compileError(support.Error("function " + node.value + " not declared", line_nr))
+            return self.compileCall(block, callee, self.operand(block, node.input), block.variable(node.output.variable_name), line_nr, index + 1)
+
+        elif node_type is support.VariableNode:
+            token_type = node.token_type
+            value = node.value
+            if token_type == enums.token_types.VAR or token_type == enums.token_types.OUTPUT:
+                target = block.variable(node.variable_name)
+                if value.value == "INPUT" or value.token_type == enums.token_types.INPUT:
+                    return self.compileMove(block, target, block.variable("INPUT"), line_nr, index + 1)
+                elif value.token_type == enums.token_types.VAR:
+                    return self.compileMove(block, target, block.variable(value.variable_name), line_nr, index + 1)
+                return self.compileStore(target, support.literalValue(value.value), index + 1)
+
+            elif token_type == enums.token_types.OUT:
+                return self.compileOut(block, self.operand(block, value), line_nr, index + 1)
+
+            elif token_type == enums.token_types.LINE:
+                if value.token_type == enums.token_types.VAR:
+                    return self.compileJumpVariable(block, block.variable(value.variable_name), line_nr, index, length)
+                jump = interpreter.toOperand(value.value)
+                if type(jump) is not int:
+                    return self.compileError(support.Error("Line number to jump to not int", line_nr))
+                return self.compileSkip(vm.jumpTarget(index, jump, length))
+
+            elif token_type == enums.token_types.ERR:
+                return self.compileError(support.Error(value, line_nr))
+
+        elif node_type is support.FunctionNode:
+            return self.compileError(support.Error("function " + node.value + " has no END", line_nr))
+
+        return self.compileSkip(index + 1)
+
+    # operand :: vm.Block, support.Node -> int
+    def operand(self, block : vm.Block, node : support.Node) -> int:
+        if node.token_type == enums.token_types.VAR:
+            return block.variable(node.variable_name)
+        return block.constant(node.value)
+
+    # compileSkip :: int -> Callable[[list], int]
+    def compileSkip(self, next_index : int) -> Callable[[list], int]:
+        def skip(values : list) -> int:
+            return next_index
+        return skip
+
+    # compileError :: support.Error -> Callable[[list], int]
+    def compileError(self, error : support.Error) -> Callable[[list], int]:
+        def fail(values : list) -> int:
+            raise Halt(error)
+        return fail
+
+    # compileStore :: int, support.lit_types, int -> Callable[[list], int]
+    def compileStore(self, target : int, constant : support.lit_types, next_index : int) -> Callable[[list], int]:
+        def store(values : list) -> int:
+            # assigning a literal to an existing variable keeps its value
+            if values[target] is None:
+                values[target] = constant
+            return next_index
+        return store
+
+    # compileMove :: vm.Block, int, int, int, int -> Callable[[list], int]
+    def compileMove(self, block : vm.Block, target : int, source : int, line_nr : int, next_index : int) -> Callable[[list], int]:
+        def move(values : list) -> int:
+            value = values[source]
+            if value is None:
+                raise Halt(unsetError(block, values, [source], line_nr))
+            values[target] = value
+            return next_index
+        return move
+
+    # compileOut :: vm.Block, int, int, int -> Callable[[list], int]
+    def compileOut(self, block : vm.Block, source : int, line_nr : int, next_index : int) -> Callable[[list], int]:
+        program = self.program
+
+        def out(values : list) -> int:
+            value = values[source]
+            if value is None:
+                raise Halt(unsetError(block, values, [source], line_nr))
+            program.sink.write(value)
+            return next_index
+        return out
+
+    # compileMath :: vm.Block, Callable, int, int, int, int -> Callable[[list], int]
+    def compileMath(self, block : vm.Block, function : Callable, target : int, source : int, line_nr : int, next_index : int) -> Callable[[list], int]:
+        """compileMath function, makes the closure of a math statement with its operator already picked
+
+        Args:
+            block (vm.Block): slot layout of the code block
+            function (Callable): operator of the statement
+            target (int): slot of the variable that is changed
+            source (int): slot of the right hand side
+            line_nr (int): line number of the statement
+            next_index (int): index of the next statement
+
+        Returns:
+            Callable[[list], int]: closure of the statement
+        """
+        to_operand = interpreter.toOperand
+
+        def math(values : list) -> int:
+            lhs = values[target]
+            rhs = values[source]
+            if type(lhs) is int and type(rhs) is int:
+                values[target] = function(lhs, rhs)
+                return next_index
+            if lhs is None or rhs is None:
+                raise Halt(unsetError(block, values, [target, source], line_nr))
+            try:
+                values[target] = function(to_operand(lhs), to_operand(rhs))
+            except TypeError:
+                raise Halt(support.Error("cant use operator on variables of different type", line_nr))
+            return next_index
+        return math
+
+    # compileIf :: vm.Block, support.IfNode, int -> Callable[[list], int]
+    def compileIf(self, block : vm.Block, node : support.IfNode, next_index : int) -> Callable[[list], int]:
+        """compileIf function, makes the closure of an if statement with the compare operator already picked
+
+        Args:
+            block (vm.Block): slot layout of the code block
+            node (support.IfNode): if statement to compile
+            next_index (int): index of the next statement
+
+        Returns:
+            Callable[[list], int]: closure of the statement
+        """
+        condition = node.condition
+        line_nr = node.line_nr
+        function = interpreter.condition_functions.get(condition.token_type)
+        if function is None:
+            return self.compileError(support.Error("unknown operator in condition statement", line_nr))
+        lhs_slot = self.operand(block, condition.value)
+        rhs_slot = self.operand(block, condition.condition)
+        target = block.variable(node.value.variable_name)
+        source_true = self.operand(block, node.new_value_true)
+        source_false = -1 if node.new_value_false is None else self.operand(block, node.new_value_false)
+        compare = vm.VirtualMachine().compare
+        to_operand = interpreter.toOperand
+
+        def select(values : list) -> int:
+            lhs = values[lhs_slot]
+            rhs = values[rhs_slot]
+            if type(lhs) is int and type(rhs) is int:
+                result = function(lhs, rhs)
+            else:
+                if lhs is None or rhs is None:
+                    raise Halt(unsetError(block, values, [lhs_slot, rhs_slot], line_nr))
+                result = compare(function, to_operand(lhs), to_operand(rhs))
+                if result is None:
+                    return next_index
+            source = source_true if result else source_false
+            if source >= 0:
+                if values[source] is None:
+                    raise Halt(unsetError(block, values, [source], line_nr))
+                values[target] = values[source]
+            return next_index
+        return select
+
+    # compileCall :: vm.Block, vm.Block, int, int, int, int -> Callable[[list], int]
+    def compileCall(self, block : vm.Block, callee : vm.Block, source : int, target : int, line_nr : int, next_index : int) -> Callable[[list], int]:
+        """compileCall function, makes the closure of a function call, the body of the function is bound by reference
+
+        The closure hands the callee to execute, finish stores the output once the callee is done.
+
+        Args:
+            block (vm.Block): slot layout of the calling code block
+            callee (vm.Block): slot layout of the function
+            source (int): slot of the input
+            target (int): slot the output is stored in
+            line_nr (int): line number of the statement
+            next_index (int): index of the next statement
+
+        Returns:
+            Callable[[list], int]: closure of the statement
+        """
+        program = self.program
+        steps = program.bodies[callee]
+        template = callee.template
+        input_slot = callee.input_slot
+        output_slot = callee.output_slot
+
+        def finish(values : list, callee_values : list) -> int:
+            output = callee_values[output_slot]
+            if output is None:
+                raise Halt(support.Error("No output specified in function", callee.line_nr))
+            values[target] = output
+            return next_index
+
+        def call(values : list) -> int:
+            value = values[source]
+            if value is None:
+                raise Halt(unsetError(block, values, [source], line_nr))
+            callee_values = list(template)
+            callee_values[input_slot] = value
+            program.call = (steps, callee_values, finish, line_nr)
+            return CALL
+        return call
+
+    # compileJumpVariable :: vm.Block, int, int, int, int -> Callable[[list], int]
+    def compileJumpVariable(self, block : vm.Block, source : int, line_nr : int, index : int, length : int) -> Callable[[list], int]:
+        jump_target = vm.jumpTarget
+
+        def jump(values : list) -> int:
+            value = values[source]
+            if type(value) is not int:
+                if value is None:
+                    raise Halt(unsetError(block, values, [source], line_nr))
+                text = str(value)
+                if not text.lstrip("-").isnumeric():
+                    raise Halt(support.Error("Line number to jump to not int", line_nr))
+                value = int(text)
+            return jump_target(index, value, length)
+        return jump
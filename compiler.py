@@ -1,18 +1,11 @@
-from typing import List, TypeVar, Union, Tuple
-import copy
-
-import lexer
-import parser
-import enums
 import support
 import compiler_base
+import parse_cache
 
 def main():
     file_name = input("enter file name without extension: ")
     # file_name = "test_subroutines_1"
-    lexed = lexer.lexen(file_name+".txt")
-    parse = parser.Parser()
-    tree, found_funcs = parse.parse(lexed)
+    tree, found_funcs = parse_cache.ParseCache().parseFile(file_name+".txt")
 
     if len(tree) == 1 and type(tree[0]) == support.Error:
         print(tree[0])
@@ -30,5 +23,5 @@ def main():
         print(compiled_txt)
 
 
-
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,56 +1,38 @@
 from typing import List, TypeVar, Union, Tuple
 
 import support
+import symbol_table
+import peephole
 import copy
 import enums
 import sys
 
-# getAmountOfVarsBytes :: List[support.Node], int -> int
-def getAmountOfVarsBytes( tree: List[support.Node], counter: int = 0  ) -> int:
-    """gets the amount of bytes to reserve on the stack for a function body
+# getAmountOfVarsBytes :: symbol_table.Scope -> int
+def getAmountOfVarsBytes( scope: symbol_table.Scope ) -> int:
+    """gets the amount of bytes to reserve on the stack for a code block
+
+    INPUT and OUTPUT of a function have the last slots and are passed in registers, they get no spot.
 
     Args:
-        tree (List[support.Node]): ast of function body
-        counter (int, optional): byte counter. Defaults to 0.
+        scope (symbol_table.Scope): resolved scope of the code block
 
     Returns:
         int: amount of bytes to reserve
     """
-    if len(tree) == 0:
-        return counter
-
-    tree_copy = copy.copy(tree)
-    counter_copy = copy.copy(counter)
-
-    head, *tail = tree_copy
-    if head.token_type == enums.token_types.VAR:
-        counter_copy += 8 # Ik zet de grens op 1 variable op 8 bytes max
-    return getAmountOfVarsBytes(tail, counter_copy)
+    stored_slots = [slot for slot in range(len(scope.slot_names)) if slot != scope.input_slot and slot != scope.output_slot]
+    return len(stored_slots) * 8 # Ik zet de grens op 1 variable op 8 bytes max
 
-# getNewStackSpotAddress ::dict, str -> int
-def getNewStackSpotAddress( variable_memory_adresses : dict, name :str ) -> int:
-    """getNewStackSpotAddress supplies the next spot on the reserved stack to store a new variable
+# getStackAddress :: int -> int
+def getStackAddress( slot : int ) -> int:
+    """getStackAddress supplies the spot on the reserved stack of a variable
 
     Args:
-        variable_memory_adresses (dict): dictionary with current taken addresses.
-        name (str): name of var to be stored
+        slot (int): slot of the variable, from symbol_table.resolveSlots
 
     Returns:
-        new stackpoint adress relative to R7
+        stackpoint adress relative to R7
     """
-    variable_memory_adresses_copy = copy.copy(variable_memory_adresses)
-
-    if name in variable_memory_adresses_copy.keys():
-        return variable_memory_adresses_copy[name][0]
-
-    values = variable_memory_adresses_copy.values()
-    if values:
-        highest_adress = max(values)
-        new_adress = highest_adress[0] + highest_adress[1]
-    else:
-        new_adress = 0
-    
-    return new_adress
+    return slot * 8
 
 # startAssemblyCode :: str -> str
 def startAssemblyCode(file_name : str, found_funcs :List[str], start_txt:str = "") -> str:
@@ -211,9 +193,9 @@ def createLookupTable( line_numbers : List[str], asm_string : str = "\nlookUpTab
     asm_string_copy += "\nBEQ _line_" + str(head)
     return createLookupTable(tail, asm_string_copy)
 
-# def compile( str,List[list_types], dict,str ,dict, List[str], dict, List[int]): -> Tuple[str, dict, List[str], List[int]]
+# def compile( str,List[list_types], dict,str ,dict, List[str], dict, List[int], symbol_table.SymbolTable): -> Tuple[str, dict, List[str], List[int]]
 list_types = TypeVar(support.Node, support.VariableNode, support.MathNode, support.Error)
-def compile( main_func_name : str, ast: List[list_types], found_funcs : dict, asm_string : str = "", variable_memory_adresses : dict = {}, word_List : List[str] = [], func_offset : dict = {}, line_numbers : List[int] = []) -> Tuple[str, dict, List[str], List[int]]:
+def compile( main_func_name : str, ast: List[list_types], found_funcs : dict, asm_string : str = "", variable_memory_adresses : dict = {}, word_List : List[str] = [], func_offset : dict = {}, line_numbers : List[int] = [], slot_table : symbol_table.SymbolTable = None) -> Tuple[str, dict, List[str], List[int]]:
     """main compile function
 
     Args:
@@ -221,10 +203,11 @@ def compile( main_func_name : str, ast: List[list_types], found_funcs : dict, as
         ast (List[list_types]): parser tree to compile
         found_funcs (dict): dictionary al functions in code
         asm_string (str, optional): assembly code. Defaults to "".
-        variable_memory_adresses (dict, optional): dictionary containing variable memory stack adresses. Defaults to {}.
+        variable_memory_adresses (dict, optional): dictionary containing variable memory stack adresses by slot. Defaults to {}.
         word_List (List[str], optional): list of strings that occured in code. Defaults to [].
         func_offset (dict, optional): function offset dictionary. Defaults to {}.
         line_numbers (List[int], optional): list op al passed line numbers. Defaults to [].
+        slot_table (symbol_table.SymbolTable, optional): slots of al variables, resolved when not given. Defaults to None.
 
     Returns:
         Tuple[str, dict, List[str], List[int]]: assembly code, memory addresses, word list, line numbers list
@@ -239,10 +222,13 @@ def compile( main_func_name : str, ast: List[list_types], found_funcs : dict, as
     line_numbers_copy = copy.copy(line_numbers)
 
     if asm_string == "":
-        amount_of_bytes_to_reserve = getAmountOfVarsBytes(ast_copy)
+        if slot_table is None:
+            slot_table = symbol_table.resolveSlots(ast_copy, found_funcs, main_func_name)
+        ast_copy = peephole.fuseBranches(ast_copy, main_func_name in found_funcs.keys())
+        amount_of_bytes_to_reserve = getAmountOfVarsBytes(slot_table.scope(main_func_name))
         func_offset = getFoundFuncsOffsetDict( ["code"]+ list(found_funcs.values()), main_func_name )
         if main_func_name not in found_funcs.keys():
-            asm_string_copy, word_List_copy, line_numbers_copy =  compileAlFunctions(list(found_funcs.values()), main_func_name, found_funcs_copy, word_List_copy)    
+            asm_string_copy, word_List_copy, line_numbers_copy =  compileAlFunctions(list(found_funcs.values()), main_func_name, found_funcs_copy, word_List_copy, slot_table)    
         else:
             asm_string_copy = copy.copy(asm_string)
         asm_string_copy += "\n\n" + main_func_name + ":"  
@@ -268,7 +254,7 @@ def compile( main_func_name : str, ast: List[list_types], found_funcs : dict, as
         asm_string_copy += string
     
     elif head.node_type == enums.node_types.INPUT:
-        if head.variable_name in variable_memory_adresses_copy.keys():
+        if head.slot in variable_memory_adresses_copy.keys():
             string, variable_memory_adresses_copy, word_List_copy = compilerVariable(head, main_func_name, variable_memory_adresses_copy, func_offset, word_List_copy)
         else:
             string, variable_memory_adresses_copy, word_List_copy = compilerFunctionInput(head, main_func_name, variable_memory_adresses_copy, word_List_copy)
@@ -282,11 +268,15 @@ def compile( main_func_name : str, ast: List[list_types], found_funcs : dict, as
         string, variable_memory_adresses_copy, word_List_copy = compilerIf(head, main_func_name, variable_memory_adresses_copy, word_List_copy, func_offset)
         asm_string_copy += string
 
+    elif head.node_type == enums.node_types.BRANCH:
+        string, variable_memory_adresses_copy, word_List_copy = compilerBranch(head, main_func_name, variable_memory_adresses_copy, word_List_copy, func_offset)
+        asm_string_copy += string
+
     elif head.node_type == enums.node_types.FUNCTION_CALL:
         string, variable_memory_adresses_copy, word_List_copy = compilerFunctionCall(head, main_func_name, found_funcs, variable_memory_adresses_copy, word_List_copy)
         asm_string_copy += string
 
-    return compile( main_func_name, tail, found_funcs_copy, asm_string_copy, variable_memory_adresses_copy, word_List_copy, func_offset, line_numbers_copy)
+    return compile( main_func_name, tail, found_funcs_copy, asm_string_copy, variable_memory_adresses_copy, word_List_copy, func_offset, line_numbers_copy, slot_table)
 
 
 # compilerBase :: support.Node, List[str] -> str
@@ -308,7 +298,7 @@ def compilerBase( node: support.Node, word_List : List[str] ) -> str:
             string +="\nSUB R3, R4, R3"
             return string, word_List_copy, enums.token_types.INT
         else:
-            return "#" + node.value, word_List_copy, enums.token_types.INT
+            return "#" + str(node.value), word_List_copy, enums.token_types.INT
     elif node.token_type == enums.token_types.STRING:
         bare_word = node.value[1:-1]
         if " " in bare_word:
@@ -343,9 +333,9 @@ def compilerVariable( node: support.VariableNode, main_func_name : str, variable
 
     if node_copy.token_type == enums.token_types.OUT:
         if node_copy.value.node_type == enums.node_types.VAR:
-            load_value = "\nLDR R3,[R7, #" + str(variable_memory_adresses_copy[main_func_name + node.value.variable_name][0]) + "]"
+            load_value = "\nLDR R3,[R7, #" + str(variable_memory_adresses_copy[node.value.slot][0]) + "]"
             load_into_R0 = "\nMOV R0, R3"
-            base_type = variable_memory_adresses_copy[main_func_name +node.value.variable_name][2]
+            base_type = variable_memory_adresses_copy[node.value.slot][2]
             if base_type == enums.token_types.STRING:
                 print_statement = "\nBL print_word"
             else:
@@ -355,9 +345,9 @@ def compilerVariable( node: support.VariableNode, main_func_name : str, variable
             string, word_List_copy = printValueBase(node_copy, word_List_copy)
             assembly_string += string
         elif node_copy.value.node_type == enums.node_types.INPUT:
-            load_value = "\nLDR R3,[R7,#" + str(variable_memory_adresses_copy[main_func_name +node.value.variable_name][0]) + "]"
+            load_value = "\nLDR R3,[R7,#" + str(variable_memory_adresses_copy[node.value.slot][0]) + "]"
             load_into_R0 = "\nMOV R0, R3"
-            base_type = variable_memory_adresses_copy[main_func_name +node.value.variable_name][2]
+            base_type = variable_memory_adresses_copy[node.value.slot][2]
             if base_type == enums.token_types.STRING:
                 print_statement = "\nBL print_word"
             else:
@@ -374,7 +364,7 @@ def compilerVariable( node: support.VariableNode, main_func_name : str, variable
         return assembly_string, variable_memory_adresses_copy, word_List_copy
     elif node_copy.token_type == enums.token_types.OUTPUT:
         if node_copy.value.token_type == enums.token_types.VAR:
-            load_into_R0 = "\nLDR R0, [R7,#" + str(variable_memory_adresses_copy[main_func_name +node_copy.value.variable_name][0]) +"]"
+            load_into_R0 = "\nLDR R0, [R7,#" + str(variable_memory_adresses_copy[node_copy.value.slot][0]) +"]"
         else:
             value, word_List_copy, value_type = compilerBase(node_copy.value, word_List_copy)
             if value_type == enums.token_types.STRING:
@@ -390,7 +380,7 @@ def compilerVariable( node: support.VariableNode, main_func_name : str, variable
             assembly_string += branch
             return assembly_string, variable_memory_adresses_copy, word_List_copy
         elif node_copy.value.token_type == enums.token_types.VAR:
-            load_into_R0 = "\nLDR R0 ,[R7, #" + str(variable_memory_adresses_copy[main_func_name +node.value.variable_name][0]) + "]"
+            load_into_R0 = "\nLDR R0 ,[R7, #" + str(variable_memory_adresses_copy[node.value.slot][0]) + "]"
             load_line_number = "\nADD R0, R0" + ", #" + str(node_copy.line_nr)
             load_line_number2 = "\nADD R0, R0, #" + str(func_offset[main_func_name_copy])
             branch = "\nB lookUpTable"
@@ -398,7 +388,7 @@ def compilerVariable( node: support.VariableNode, main_func_name : str, variable
             return assembly_string, variable_memory_adresses_copy, word_List_copy
     else: #var not known
         if node_copy.value.node_type == enums.node_types.BASE and node_copy.value.token_type != enums.token_types.INPUT:
-            adress = getNewStackSpotAddress( variable_memory_adresses_copy, main_func_name + node_copy.variable_name)
+            adress = getStackAddress(node_copy.slot)
             adress = str(adress)
             value, word_List_copy, value_type = compilerBase(node_copy.value, word_List_copy)
             if value_type == enums.token_types.STRING:
@@ -407,15 +397,15 @@ def compilerVariable( node: support.VariableNode, main_func_name : str, variable
                 load_into_R0 = "\nMOV R3, " + value
             store = "\nSTR R3,[R7,#" + adress + "]" 
             assembly_string += load_into_R0 + store
-            variable_memory_adresses_copy[main_func_name + node_copy.variable_name] = [int(adress), 8, node_copy.value.token_type]
+            variable_memory_adresses_copy[node_copy.slot] = [int(adress), 8, node_copy.value.token_type]
         elif node_copy.value.node_type == enums.node_types.VAR or node_copy.value.node_type == enums.node_types.INPUT:
-            load_var_value = "\nLDR R3,[R7,#" + str(variable_memory_adresses[main_func_name+ node.value.variable_name][0]) + "]"
-            new_address = getNewStackSpotAddress(variable_memory_adresses_copy, main_func_name + node_copy.variable_name)
+            load_var_value = "\nLDR R3,[R7,#" + str(variable_memory_adresses[node.value.slot][0]) + "]"
+            new_address = getStackAddress(node_copy.slot)
             new_address = str(new_address)
             restore_under_new_var_name = "\nSTR R3,[R7,#" + new_address + "]" 
             assembly_string += load_var_value + restore_under_new_var_name
-            base_type = variable_memory_adresses[main_func_name+node.value.variable_name][2]
-            variable_memory_adresses_copy[main_func_name +node_copy.variable_name] = [int(new_address), 8, base_type ]
+            base_type = variable_memory_adresses[node.value.slot][2]
+            variable_memory_adresses_copy[node_copy.slot] = [int(new_address), 8, base_type ]
 
     return assembly_string, variable_memory_adresses_copy, word_List_copy
 
@@ -439,7 +429,7 @@ def compilerMath( node: support.MathNode, main_func_name : str, variable_memory_
 
 
     #load var into R3
-    command_start = "\nLDR R3,[R7,#" + str(variable_memory_adresses_copy[main_func_name +node_copy.value.variable_name][0]) + "]"
+    command_start = "\nLDR R3,[R7,#" + str(variable_memory_adresses_copy[node_copy.value.slot][0]) + "]"
     # check if rhs is var or base object
     if node_copy.token_type == enums.token_types.ADD:
         operator = "\nADD"
@@ -448,7 +438,7 @@ def compilerMath( node: support.MathNode, main_func_name : str, variable_memory_
     elif node_copy.token_type == enums.token_types.MUL:
         operator = "\nMUL"
     elif node_copy.token_type == enums.token_types.DIV:
-        load_into_R0 = "\nLDR R0,[R7,#" + str(variable_memory_adresses[main_func_name+node_copy.value.variable_name][0]) + "]"
+        load_into_R0 = "\nLDR R0,[R7,#" + str(variable_memory_adresses[node_copy.value.slot][0]) + "]"
         if node_copy.rhs.node_type == enums.node_types.BASE:
             value, word_List_copy, value_type =  compilerBase(node_copy.rhs, word_List_copy)
             if value_type == enums.token_types.STRING:
@@ -456,9 +446,9 @@ def compilerMath( node: support.MathNode, main_func_name : str, variable_memory_
             else:
                 load_into_R1 = "\nMOV R1, " + value
         else:
-            load_into_R1 = "\nLDR R1,[R7,#" + str(variable_memory_adresses[main_func_name+node_copy.rhs.variable_name][0]) + "]"
+            load_into_R1 = "\nLDR R1,[R7,#" + str(variable_memory_adresses[node_copy.rhs.slot][0]) + "]"
         link_to_divide = "\nBL divide"
-        restore_Result = "\nSTR R0,[R7,#" + str(variable_memory_adresses[main_func_name+node_copy.value.variable_name][0]) + "]"
+        restore_Result = "\nSTR R0,[R7,#" + str(variable_memory_adresses[node_copy.value.slot][0]) + "]"
         message = load_into_R0 + load_into_R1 + link_to_divide + restore_Result
         return message, variable_memory_adresses_copy, word_List_copy
 
@@ -468,16 +458,26 @@ def compilerMath( node: support.MathNode, main_func_name : str, variable_memory_
             command_start += operator + " R3 , R3, " + value
     elif node_copy.rhs.node_type == enums.node_types.VAR or node_copy.rhs.node_type == enums.node_types.INPUT:
         #load rhs into R2
-        load_var = "\nLDR R2,[R7,#" + str(variable_memory_adresses[main_func_name+node_copy.rhs.variable_name][0]) + "]"
+        load_var = "\nLDR R2,[R7,#" + str(variable_memory_adresses[node_copy.rhs.slot][0]) + "]"
         command_start += load_var + operator + " R3, R3, R2"
     
     #store new result
-    store = "\nSTR R3, [R7,#" + str(variable_memory_adresses_copy[main_func_name +node_copy.value.variable_name][0]) +"]"
+    store = "\nSTR R3, [R7,#" + str(variable_memory_adresses_copy[node_copy.value.slot][0]) +"]"
     command_start += store
-    variable_memory_adresses_copy[main_func_name +node_copy.value.variable_name][2] = enums.token_types.INT
+    variable_memory_adresses_copy[node_copy.value.slot][2] = enums.token_types.INT
 
     return command_start, variable_memory_adresses_copy, word_List_copy
 
+# branch instructions taken when a condition holds
+condition_branches = {
+    enums.token_types.EQUAL : "BEQ",
+    enums.token_types.NOTEQUAL : "BNE",
+    enums.token_types.EQUALGREATER : "BGE",
+    enums.token_types.EQUALSMALLER : "BLE",
+    enums.token_types.GREATER : "BHI",
+    enums.token_types.SMALLER : "BLT",
+}
+
 # compilerIf :: support.IfNode, str, dict, List[str], dict -> Tuple[str,dict,List[str]]
 def compilerIf( node: support.IfNode, main_func_name : str, variable_memory_adresses : dict, word_List : List[str], func_offset : dict ) -> Tuple[str,dict,List[str]]:
     """compile if node
@@ -498,21 +498,10 @@ def compilerIf( node: support.IfNode, main_func_name : str, variable_memory_adre
     word_List_copy = copy.copy(word_List)
     main_func_name_copy = copy.copy(main_func_name)
 
-    if condition_node_copy.token_type == enums.token_types.EQUAL:
-        operator = "\nBEQ"
-    elif condition_node_copy.token_type == enums.token_types.NOTEQUAL:
-        operator = "\nBNE"
-    elif condition_node_copy.token_type == enums.token_types.EQUALGREATER:
-        operator = "\nBGE"
-    elif condition_node_copy.token_type == enums.token_types.EQUALSMALLER:
-        operator = "\nBLE"
-    elif condition_node_copy.token_type == enums.token_types.GREATER:
-        operator = "\nBHI"
-    elif condition_node_copy.token_type == enums.token_types.SMALLER:
-        operator = "\nBLT"
-    load_var1 = "\nLDR R3,[R7,#" + str(variable_memory_adresses[main_func_name+node_copy.value.variable_name][0]) + "]"
+    operator = "\n" + condition_branches[condition_node_copy.token_type]
+    load_var1 = "\nLDR R3,[R7,#" + str(variable_memory_adresses[node_copy.value.slot][0]) + "]"
     if condition_node_copy.condition.node_type == enums.node_types.VAR:
-        load_var2 = "\nLDR R3,[R7,#" + str(variable_memory_adresses[condition_node_copy.condition.variable_name][0]) + "]"
+        load_var2 = "\nLDR R3,[R7,#" + str(variable_memory_adresses[condition_node_copy.condition.slot][0]) + "]"
     else:
         value, word_List_copy, value_type = compilerBase(condition_node_copy.condition, word_List_copy)
         if value_type == enums.token_types.STRING:
@@ -527,7 +516,7 @@ def compilerIf( node: support.IfNode, main_func_name : str, variable_memory_adre
             change_org_var = "\nLDR R3, " + value
         else:
             change_org_var = "\nMOV R3, " + value
-    restore_var = "\nSTR R3, [R7,#" + str(variable_memory_adresses_copy[main_func_name +node_copy.value.variable_name][0]) +"]"
+    restore_var = "\nSTR R3, [R7,#" + str(variable_memory_adresses_copy[node_copy.value.slot][0]) +"]"
     skip_true = "\nB "+ "_line_" + str(node_copy.line_nr+1 + func_offset[main_func_name])
 
     new_line = "\n" + main_func_name_copy + "_line_" + str(node_copy.line_nr) + "_true:"
@@ -538,16 +527,50 @@ def compilerIf( node: support.IfNode, main_func_name : str, variable_memory_adre
         else:
             change_org_var2 = "\nMOV R3, " + value
 
-    restore_var = "\nSTR R3, [R7,#" + str(variable_memory_adresses_copy[main_func_name +node_copy.value.variable_name][0]) +"]"
+    restore_var = "\nSTR R3, [R7,#" + str(variable_memory_adresses_copy[node_copy.value.slot][0]) +"]"
     
-    old_addres = variable_memory_adresses_copy[main_func_name + node_copy.value.variable_name][0]
-    variable_memory_adresses_copy[main_func_name + node_copy.value.variable_name] = [old_addres, 8, enums.token_types.STRING]
+    old_addres = variable_memory_adresses_copy[node_copy.value.slot][0]
+    variable_memory_adresses_copy[node_copy.value.slot] = [old_addres, 8, enums.token_types.STRING]
 
     asm_string = load_var1 + load_var2 + compare + action + change_org_var + restore_var + skip_true
     asm_string += new_line + change_org_var2 + restore_var
 
     return asm_string, variable_memory_adresses_copy, word_List_copy
 
+# compilerBranch :: peephole.BranchNode, str, dict, List[str], dict -> Tuple[str,dict,List[str]]
+def compilerBranch( node: peephole.BranchNode, main_func_name : str, variable_memory_adresses : dict, word_List : List[str], func_offset : dict ) -> Tuple[str,dict,List[str]]:
+    """compile a fused if statement and LINE jump, a compare and a branch straight to the line of each outcome
+
+    Args:
+        node (peephole.BranchNode): branchNode to compile
+        main_func_name (str): name of current code block
+        variable_memory_adresses (dict): dictionary containing variable memory stack adresses.
+        word_List (List[str]): List of al past Strings
+        func_offset (dict): dictionary of function offset
+
+    Returns:
+        Tuple[str,dict,List[str]]: assembly code, variable_memory_addresses, word_list
+    """
+    condition_node_copy = node.condition
+    word_List_copy = copy.copy(word_List)
+
+    load_var1 = "\nLDR R3,[R7,#" + str(variable_memory_adresses[condition_node_copy.value.slot][0]) + "]"
+    if condition_node_copy.condition.node_type == enums.node_types.VAR or condition_node_copy.condition.node_type == enums.node_types.INPUT:
+        load_var2 = "\nLDR R2,[R7,#" + str(variable_memory_adresses[condition_node_copy.condition.slot][0]) + "]"
+    else:
+        value, word_List_copy, value_type = compilerBase(condition_node_copy.condition, word_List_copy)
+        if value_type == enums.token_types.STRING:
+            load_var2 = "\nLDR R2, " + value
+        else:
+            load_var2 = "\nMOV R2, " + value
+    compare = "\nCMP R3,R2"
+    line_true = node.line.line_nr + node.jump_true + func_offset[main_func_name]
+    line_false = node.line.line_nr + node.jump_false + func_offset[main_func_name]
+    branch_true = "\n" + condition_branches[condition_node_copy.token_type] + " _line_" + str(line_true)
+    branch_false = "\nB _line_" + str(line_false)
+
+    return load_var1 + load_var2 + compare + branch_true + branch_false, copy.copy(variable_memory_adresses), word_List_copy
+
 # compilerFunctionCall :: support.FunctionCall, str, dict, dict, List[str] ->Tuple[str,dict,List[str]]
 def compilerFunctionCall( node: support.FunctionCall, main_func_name : str, found_funcs : dict, variable_memory_adresses : dict, word_List : List[str])->Tuple[str,dict,List[str]]:
     """compile function call
@@ -573,16 +596,16 @@ def compilerFunctionCall( node: support.FunctionCall, main_func_name : str, foun
         value, word_List_copy, value_type = compilerBase(node_copy.input, word_List_copy)
         give_input = "\nMOV R0, " + value
     else:
-        give_input = "\nLDR R0,[R7,#" + str(variable_memory_adresses_copy[main_func_name + node_copy.input.variable_name][0]) + "]"
+        give_input = "\nLDR R0,[R7,#" + str(variable_memory_adresses_copy[node_copy.input.slot][0]) + "]"
     link_to_function = "\nBL " + node_copy.value 
-    new_address = getNewStackSpotAddress( variable_memory_adresses_copy,  main_func_name + node_copy.output.variable_name )
+    new_address = getStackAddress(node_copy.output.slot)
     mov_into_r1 = "\nMOV R1, R0"
     save_var_func_result = "\nSTR R1, [R7,#" + str(new_address) + "]"
-    variable_memory_adresses_copy[main_func_name +node_copy.output.variable_name] = [new_address, 8, enums.token_types.INT]
+    variable_memory_adresses_copy[node_copy.output.slot] = [new_address, 8, enums.token_types.INT]
     return give_input+link_to_function+mov_into_r1+save_var_func_result, variable_memory_adresses_copy, word_List_copy
 
-# compileAlFunctions :: List[support.FunctionNode], str, dict, dict, List[str], str, List[int] -> Tuple[str, List[str], List[int]]
-def compileAlFunctions( found_func : List[support.FunctionNode], main_func_name : str, found_funcs : dict, word_List : List[str], asm_string: str = "", line_numbers : List[int] = []) -> Tuple[str, List[str], List[int]]:
+# compileAlFunctions :: List[support.FunctionNode], str, dict, List[str], symbol_table.SymbolTable, str, List[int] -> Tuple[str, List[str], List[int]]
+def compileAlFunctions( found_func : List[support.FunctionNode], main_func_name : str, found_funcs : dict, word_List : List[str], slot_table : symbol_table.SymbolTable, asm_string: str = "", line_numbers : List[int] = []) -> Tuple[str, List[str], List[int]]:
     """create assembly code all functions
 
     Args:
@@ -590,6 +613,7 @@ def compileAlFunctions( found_func : List[support.FunctionNode], main_func_name
         main_func_name (str): current code block name
         found_funcs (dict): dict of al found functions
         word_List (List[str]): list of al past strings
+        slot_table (symbol_table.SymbolTable): slots of al variables
         asm_string (str, optional): assembly code. Defaults to "".
         line_numbers (List[int], optional): list of al passed line numbers. Defaults to [].
 
@@ -608,13 +632,13 @@ def compileAlFunctions( found_func : List[support.FunctionNode], main_func_name
 
     head, *tail = found_func
    
-    add_string, word_List_copy, line_numbers_copy = compilerFunction(head, head.value, found_funcs_copy, word_List_copy, line_numbers_copy)
+    add_string, word_List_copy, line_numbers_copy = compilerFunction(head, head.value, found_funcs_copy, word_List_copy, line_numbers_copy, slot_table)
     asm_string_copy += add_string
 
-    return compileAlFunctions(tail, main_func_name_copy, found_funcs_copy, word_List_copy, asm_string_copy, line_numbers_copy)
+    return compileAlFunctions(tail, main_func_name_copy, found_funcs_copy, word_List_copy, slot_table, asm_string_copy, line_numbers_copy)
  
-# compilerFunction :: support.FunctionNode, str, dict, List[str], List[int], str -> Tuple[str, List[str], List[int]]
-def compilerFunction( node: support.FunctionNode, main_func_name : str, found_funcs: dict, word_List : List[str], line_numbers : List[int] ,asm_string: str = "") -> Tuple[str, List[str], List[int]]:
+# compilerFunction :: support.FunctionNode, str, dict, List[str], List[int], symbol_table.SymbolTable, str -> Tuple[str, List[str], List[int]]
+def compilerFunction( node: support.FunctionNode, main_func_name : str, found_funcs: dict, word_List : List[str], line_numbers : List[int], slot_table : symbol_table.SymbolTable, asm_string: str = "") -> Tuple[str, List[str], List[int]]:
     """compile a single function
 
     Args:
@@ -623,6 +647,7 @@ def compilerFunction( node: support.FunctionNode, main_func_name : str, found_fu
         found_funcs (dict): al found functions
         word_List (List[str]): list of al past strings
         line_numbers (List[int]): list of al past line numbers
+        slot_table (symbol_table.SymbolTable): slots of al variables
         asm_string (str, optional): assembly code. Defaults to "".
 
     Returns:
@@ -634,11 +659,11 @@ def compilerFunction( node: support.FunctionNode, main_func_name : str, found_fu
     found_funcs_copy = copy.copy(found_funcs)
     line_numbers_copy = copy.copy(line_numbers)
     
-    amount_of_bytes_to_reserve = getAmountOfVarsBytes(node_copy.commands)
+    amount_of_bytes_to_reserve = getAmountOfVarsBytes(slot_table.scope(node_copy.value))
     end_string = "\nMOV SP, R7"
     end_string += "\nADD SP, SP, #" + str(amount_of_bytes_to_reserve)
     end_string += "\nPOP {R7, PC}\n"
-    string, variable_memory_adresses_copy, word_List_copy, line_numbers_copy =  compile(node_copy.value, node_copy.commands, found_funcs_copy, word_List=word_List_copy, line_numbers=line_numbers_copy)
+    string, variable_memory_adresses_copy, word_List_copy, line_numbers_copy =  compile(node_copy.value, node_copy.commands, found_funcs_copy, word_List=word_List_copy, line_numbers=line_numbers_copy, slot_table=slot_table)
     string += end_string
 
     return string, word_List_copy, line_numbers_copy
@@ -659,9 +684,9 @@ def compilerFunctionInput(node: support.VariableNode, main_func_name : str, vari
     variable_memory_adresses_copy = copy.copy(variable_memory_adresses)
     word_List_copy = copy.copy(word_List)
 
-    new_address = getNewStackSpotAddress( variable_memory_adresses_copy,  main_func_name + node.variable_name)
+    new_address = getStackAddress(node.slot)
     store_input_value = "\nSTR R0, [R7,#" + str(new_address) + "]"
-    variable_memory_adresses_copy[main_func_name + node.variable_name] = [new_address, 8, enums.token_types.INT]
+    variable_memory_adresses_copy[node.slot] = [new_address, 8, enums.token_types.INT]
 
     return store_input_value, variable_memory_adresses_copy, word_List_copy
     
\ No newline at end of file
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 class token_types(Enum):
     FROM = "FROM"
@@ -41,4 +41,18 @@ class node_types(Enum):
     CONDITION = "CONDITION"
     FUNCTION = "FUNCTION"
     INPUT = "INPUT"
-    FUNCTION_CALL = "FUNCTION_CALL"
\ No newline at end of file
+    FUNCTION_CALL = "FUNCTION_CALL"
+    BRANCH = "BRANCH"
+
+class op_codes(IntEnum):
+    STORE_CONST = 0
+    MOVE = 1
+    ARITH = 2
+    SELECT = 3
+    JUMP = 4
+    JUMP_VAR = 5
+    CALL = 6
+    RETURN = 7
+    OUT = 8
+    ERROR = 9
+    HALT = 10
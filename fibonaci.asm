@@ -5,7 +5,7 @@
 
 fib:
 PUSH {R7,LR}
-SUB SP, SP, #56
+SUB SP, SP, #48
 ADD R7, SP, #0
 _line_101:
 STR R0, [R7,#0]
@@ -17,13 +17,8 @@ _line_104:
 LDR R3,[R7,#0]
 MOV R2, #1
 CMP R3,R2
-BLE fib_line_4_true
-MOV R3, #1
-STR R3, [R7,#0]
-B _line_105
-fib_line_4_true:
-MOV R3, #8
-STR R3, [R7,#0]
+BLE _line_113
+B _line_106
 _line_105:
 LDR R0 ,[R7, #0]
 ADD R0, R0, #5
@@ -63,7 +58,7 @@ STR R3,[R7,#40]
 _line_114:
 LDR R0, [R7,#40]
 MOV SP, R7
-ADD SP, SP, #56
+ADD SP, SP, #48
 POP {R7, PC}
 
 
@@ -0,0 +1,688 @@
+from typing import List, Union, Tuple
+import operator
+import time
+
+import enums
+import support
+import symbol_table
+import memo
+import vm
+import sinks
+import peephole
+import tracing
+import sampling
+
+class Frame(object):
+    """Frame class, the variables of one function activation
+
+    Every variable has a fixed slot in the list of values, given by the scope of its code block.
+    Statements update the frame in place, a function call gets a frame of its own,
+    so the variables of the caller are never copied.
+    """
+    __slots__ = ("scope", "values")
+
+    def __init__(self, scope : symbol_table.Scope):
+        """__init__ for Frame
+
+        Args:
+            scope (symbol_table.Scope): scope of the running code block, with its slots resolved
+        """
+        self.scope = scope
+        self.values = [None] * len(scope.slot_names)
+
+    def __str__(self) -> str:
+        return 'Frame({name}: {variables})'.format(
+            name = self.scope.name,
+            variables = self.snapshot()
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __contains__(self, variable_name : str) -> bool:
+        slot = self.scope.slots.get(variable_name)
+        return slot is not None and self.values[slot] is not None
+
+    # reset :: -> None
+    def reset(self) -> None:
+        self.values = [None] * len(self.scope.slot_names)
+
+    # snapshot :: -> dict
+    def snapshot(self) -> dict:
+        """snapshot function, the variables that have a value by name
+
+        Returns:
+            dict: copy of the variables, the same form as the variables the Visitor gives back
+        """
+        return {name : value for name, value in zip(self.scope.slot_names, self.values) if value is not None}
+
+# operators of math statements, same functions as Visitor.visitMath
+math_functions = {
+    enums.token_types.ADD : operator.add,
+    enums.token_types.SUB : operator.sub,
+    enums.token_types.MUL : operator.mul,
+    enums.token_types.DIV : support.divide,
+}
+
+# operators of conditions, same functions as Visitor.visitCondition
+condition_functions = {
+    enums.token_types.GREATER : operator.gt,
+    enums.token_types.SMALLER : operator.lt,
+    enums.token_types.EQUAL : operator.eq,
+    enums.token_types.EQUALGREATER : operator.ge,
+    enums.token_types.EQUALSMALLER : operator.le,
+    enums.token_types.NOTEQUAL : operator.ne,
+}
+
+# toOperand :: support.lit_types -> support.lit_types
+def toOperand(item : support.lit_types) -> support.lit_types:
+    """toOperand function, turns a visited value into an operand the way the Visitor does
+
+    Args:
+        item (support.lit_types): visited value
+
+    Returns:
+        support.lit_types: int when the text of the value is a whole number, the text otherwise
+    """
+    text = str(item)
+    if text.isnumeric():
+        return int(text)
+    if "-" in text:
+        just_number = text.lstrip("-")
+        if just_number.isnumeric():
+            return int("-" + just_number)
+    return text
+
+# isTailCall :: List[support.Node], int -> bool
+def isTailCall(node_list : List[support.Node], index : int) -> bool:
+    """isTailCall function, checks if the output of a call becomes the output of the function without anything else happening
+
+    Follows the statements after the call as long as they only copy the output of the call
+    to other variables or jump a fixed amount of lines, like the calls in bool_even and bool_odd.
+
+    Args:
+        node_list (List[support.Node]): statements of the function body
+        index (int): index of the function call
+
+    Returns:
+        bool: True when the call is the last thing the function does and its output is the OUTPUT
+    """
+    aliases = {node_list[index].output.variable_name}
+    program_counter = index + 1
+    program_length = len(node_list)
+    for _ in range(program_length):
+        if program_counter >= program_length:
+            return "OUTPUT" in aliases
+        node = node_list[program_counter]
+        if type(node) is not support.VariableNode:
+            return False
+        if node.token_type == enums.token_types.DECLARE:
+            program_counter += 1
+        elif node.token_type == enums.token_types.LINE:
+            jump = toOperand(node.value.value)
+            if node.value.token_type == enums.token_types.VAR or type(jump) is not int:
+                return False
+            program_counter = vm.jumpTarget(program_counter, jump, program_length)
+        elif (node.token_type == enums.token_types.VAR or node.token_type == enums.token_types.OUTPUT) and \
+                node.value.token_type == enums.token_types.VAR and node.value.variable_name in aliases:
+            aliases.add(node.variable_name)
+            program_counter += 1
+        else:
+            return False
+    return False
+
+# statements between two looks at the clock when a run has a deadline
+deadline_period = 1024
+
+class Interpreter(object):
+    """Interpreter class, runs a parsed tree with a mutable frame per function activation
+
+    Gives the same results as support.Visitor, but no statement copies the variables,
+    so the cost of a statement does not depend on how many variables are live.
+    Function calls push the caller on a call stack on the heap instead of recursing,
+    so deep guest recursion does not use up the Python stack.
+    """
+    def __init__(self, found_funcs : dict = {}, memo_size : int = 1024, max_depth : int = 100000, sink : sinks.Sink = None, hot_loop : int = 0,
+                 sampler : sampling.StackSampler = None, max_steps : int = None, deadline : float = None):
+        """__init__ for Interpreter
+
+        Args:
+            found_funcs (dict, optional): al found functions. Defaults to {}.
+            memo_size (int, optional): amount of results of pure function calls kept, 0 turns memoization off. Defaults to 1024.
+            max_depth (int, optional): amount of function calls that may wait for their callee, tail calls do not count. Defaults to 100000.
+            sink (sinks.Sink, optional): where OUT statements write to. Defaults to sinks.current() when the program runs.
+            hot_loop (int, optional): amount of backward jumps to a statement after which its loop is traced and compiled, 0 turns tracing off. Defaults to 0.
+            sampler (sampling.StackSampler, optional): counts the running chains of function calls. Defaults to None.
+            max_steps (int, optional): amount of statements a run may execute. Defaults to no limit.
+            deadline (float, optional): seconds a run may take. Defaults to no limit.
+        """
+        self.found_funcs = found_funcs
+        self.output = sink
+        self.sink = sink
+        self.max_depth = max_depth
+        self.scopes = {}
+        self.bodies = {}
+        self.tail_calls = set()
+        self.free_frames = {}
+        self.memo = memo.LRUCache(memo_size)
+        self.pure = set()
+        self.hot_loop = hot_loop
+        # backward jumps per (code block, statement) and the trace of every hot loop, False when it can not be traced
+        self.loop_counts = {}
+        self.traces = {}
+        self.sampler = sampler
+        self.max_steps = max_steps
+        self.deadline = deadline
+        # statements counted at the last tick, statements between two ticks and the time the run has to end
+        self.steps = 0
+        self.period = 0
+        self.next_sample = 0
+        self.end_time = None
+        self.dispatch = {
+            support.Node : self.evaluateNode,
+            support.VariableNode : self.evaluateVariable,
+            support.MathNode : self.evaluateMath,
+            support.ConditionNode : self.evaluateCondition,
+            support.IfNode : self.evaluateIf,
+        }
+
+    def __str__(self) -> str:
+        return 'Interpreter({functions})'.format(
+            functions = ", ".join(self.found_funcs)
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # run :: List[support.Node], str -> Union[support.Error, dict]
+    def run(self, node_list : List[support.Node], name : str = "main") -> Union[support.Error, dict]:
+        """run function, resolves the slots of al variables and runs the main code of a program
+
+        Args:
+            node_list (List[support.Node]): parsed tree
+            name (str, optional): name of the main code block. Defaults to "main".
+
+        Returns:
+            Union[support.Error, dict]: the first error or the variables after the last statement
+        """
+        table = symbol_table.resolveSlots(node_list, self.found_funcs, name)
+        self.scopes = table.scopes
+        # the Visitor runs a function as an INPUT assignment followed by the body, the frame gets the input
+        # before the body runs, so that first statement is kept as a no-op to keep the jumps the same
+        self.bodies = {function_name : peephole.fuseBranches([support.VariableNode("INPUT", None, function.line_nr, enums.token_types.DECLARE)] + function.commands, True)
+                       for function_name, function in self.found_funcs.items()}
+        self.tail_calls = {id(node) for body in self.bodies.values() for index, node in enumerate(body)
+                           if type(node) is support.FunctionCall and isTailCall(body, index)}
+        if self.memo.max_size > 0:
+            self.pure = memo.pureFunctions(self.found_funcs)
+        self.sink = sinks.current() if self.output is None else self.output
+        self.loop_counts = {}
+        self.traces = {}
+        frame = Frame(table.main)
+        if self.sampler is not None:
+            self.sampler.start(Interpreter.execute.__code__)
+        try:
+            error = self.execute(peephole.fuseBranches(node_list), frame)
+        finally:
+            if self.sampler is not None:
+                self.sampler.stop()
+        if error is not None:
+            return error
+        return frame.snapshot()
+
+    # execute :: List[support.Node], Frame -> Union[support.Error, None]
+    def execute(self, node_list : List[support.Node], frame : Frame) -> Union[support.Error, None]:
+        """execute function, runs a list of statements in a frame with a program counter, function calls included
+
+        A call pushes the running statements, program counter and frame on the call stack and
+        continues in the body of the function, the end of the body pops them again. A tail call
+        takes the place of the running function, so its frame is reused and the stack does not grow.
+
+        Args:
+            node_list (List[support.Node]): statements to run
+            frame (Frame): frame the statements update
+
+        Returns:
+            Union[support.Error, None]: the first error, None when al statements ran
+        """
+        dispatch = self.dispatch
+        tail_calls = self.tail_calls
+        pure = self.pure
+        hot_loop = self.hot_loop
+        # statements left until the next tick, below 0 when nothing has to be checked
+        countdown = self.startCounting()
+        stack = []
+        function = None
+        # memo keys of the calls that get the output of the running function
+        keys = []
+        program_counter = 0
+        program_length = len(node_list)
+        while True:
+            if program_counter >= program_length:
+                if not stack:
+                    return None
+                output = frame.values[frame.scope.output_slot]
+                if output is None:
+                    return support.Error("No output specified in function", function.line_nr)
+                for key in keys:
+                    self.memo.put(key, output)
+                self.releaseFrame(frame)
+                node_list, program_counter, frame, function, keys = stack.pop()
+                program_length = len(node_list)
+                frame.values[node_list[program_counter].output.slot] = output
+                program_counter += 1
+                continue
+
+            head = node_list[program_counter]
+            countdown -= 1
+            if not countdown:
+                countdown = self.tick(stack, function, head)
+                if type(countdown) is support.Error:
+                    return countdown
+            if head.token_type == enums.token_types.LINE:
+                start_line = self.evaluateVariable(head, frame)
+                if type(start_line) is support.Error:
+                    return start_line
+                if start_line >= 0:
+                    remaining = program_length - program_counter - 1
+                    if start_line > remaining:
+                        program_counter = program_length
+                    elif start_line == 0:
+                        program_counter = program_length - 1 if remaining > 0 else program_length
+                    else:
+                        program_counter += start_line
+                else:
+                    program_counter += start_line
+                    if program_counter < 0:
+                        program_counter = max(program_length + program_counter, 0)
+                    if hot_loop:
+                        jumped = self.hotLoop(node_list, program_counter, frame, countdown)
+                        if type(jumped) is support.Error:
+                            return jumped
+                        program_counter, countdown = jumped
+
+            elif type(head) is peephole.BranchNode:
+                result = self.evaluateCondition(head.condition, frame)
+                if type(result) is support.Error:
+                    return result
+                if frame.values[head.value.slot] is None:
+                    return support.Error("if statement on undeclared variable", head.line_nr)
+                target = head.target_true if result else head.target_false
+                if hot_loop and target < program_counter:
+                    jumped = self.hotLoop(node_list, target, frame, countdown)
+                    if type(jumped) is support.Error:
+                        return jumped
+                    target, countdown = jumped
+                program_counter = target
+
+            elif type(head) is support.FunctionCall:
+                callee = self.found_funcs.get(head.value)
+                if callee is None:
+                    return support.Error("function " + head.value + " not declared", head.line_nr)
+                input_value = self.read(head.input, frame)
+                if type(input_value) is support.Error:
+                    return input_value
+                key = None
+                if callee.value in pure:
+                    key = (callee.value, input_value)
+                    output = self.memo.get(key)
+                    if output is not None:
+                        frame.values[head.output.slot] = output
+                        program_counter += 1
+                        continue
+
+                if id(head) in tail_calls:
+                    self.releaseFrame(frame)
+                else:
+                    if len(stack) >= self.max_depth:
+                        return support.Error("function calls nested deeper than " + str(self.max_depth), head.line_nr)
+                    stack.append((node_list, program_counter, frame, function, keys))
+                    keys = []
+                if key is not None:
+                    keys.append(key)
+                scope = self.scopes[callee.value]
+                frame = self.acquireFrame(scope)
+                frame.values[scope.input_slot] = input_value
+                function = callee
+                node_list = self.bodies[callee.value]
+                program_counter = 0
+                program_length = len(node_list)
+
+            else:
+                pos_error = dispatch[type(head)](head, frame)
+                if type(pos_error) is support.Error:
+                    return pos_error
+                program_counter += 1
+
+    # startCounting :: -> int
+    def startCounting(self) -> int:
+        """startCounting function, resets the statement count for a run
+
+        Returns:
+            int: statements until the first tick, 0 when there is no budget, deadline or sampling by statements
+        """
+        self.steps = 0
+        self.period = 0
+        self.next_sample = 0
+        self.end_time = None if self.deadline is None else time.monotonic() + self.deadline
+        return self.nextPeriod()
+
+    # nextPeriod :: -> int
+    def nextPeriod(self) -> int:
+        periods = []
+        if self.max_steps is not None:
+            periods.append(self.max_steps + 1 - self.steps)
+        if self.end_time is not None:
+            periods.append(deadline_period)
+        if self.sampler is not None and self.sampler.every:
+            if self.next_sample <= self.steps:
+                self.next_sample = self.steps + self.sampler.every
+            periods.append(self.next_sample - self.steps)
+        self.period = min(periods) if periods else 0
+        return self.period
+
+    # tick :: list, support.FunctionNode, support.Node -> Union[support.Error, int]
+    def tick(self, stack : list, function : support.FunctionNode, head : support.Node) -> Union[support.Error, int]:
+        """tick function, counts the statements since the last tick, checks the budget and deadline and samples the call stack
+
+        Args:
+            stack (list): call stack of execute
+            function (support.FunctionNode): function that is running, None in the main code
+            head (support.Node): statement that is about to run
+
+        Returns:
+            Union[support.Error, int]: the error when the run has to stop, the statements until the next tick otherwise
+        """
+        self.steps += self.period
+        ran = self.steps - 1
+        where = "main code" if function is None else function.value
+        if self.max_steps is not None and self.steps > self.max_steps:
+            return support.Error("instruction budget of " + str(self.max_steps) + " statements used up in " + where, head.line_nr, steps=ran)
+        if self.end_time is not None and time.monotonic() > self.end_time:
+            return support.Error("deadline of " + str(self.deadline) + " seconds passed in " + where + " after " + str(ran) + " statements", head.line_nr, steps=ran)
+        if self.sampler is not None and self.sampler.every and self.steps >= self.next_sample:
+            self.sampler.sample(stack, function)
+        return self.nextPeriod()
+
+    # hotLoop :: List[support.Node], int, Frame, int -> Union[support.Error, Tuple[int, int]]
+    def hotLoop(self, node_list : List[support.Node], target : int, frame : Frame, countdown : int) -> Union[support.Error, Tuple[int, int]]:
+        """hotLoop function, counts a backward jump, records and compiles its loop once it is hot and runs the trace after that
+
+        The statements that are recorded or run by the trace are taken off the countdown of execute, a trace only
+        makes the passes that fit before the next tick, so budget, deadline and sampling see every statement.
+
+        Args:
+            node_list (List[support.Node]): statements of the running code block
+            target (int): index of the statement the jump lands on
+            frame (Frame): frame of the running code block
+            countdown (int): statements until the next tick of execute, below 0 when nothing has to be checked
+
+        Returns:
+            Union[support.Error, Tuple[int, int]]: index of the statement to continue with and the countdown after the statements that ran
+        """
+        # the statement that brings the countdown to 0 runs after the tick
+        limit = countdown - 1 if countdown > 0 else -1
+        key = (id(node_list), target)
+        trace = self.traces.get(key)
+        if trace is None:
+            count = self.loop_counts.get(key, 0) + 1
+            self.loop_counts[key] = count
+            if count < self.hot_loop or limit == 0:
+                return target, countdown
+            recorded = self.recordLoop(node_list, target, frame, limit)
+            if type(recorded) is support.Error:
+                return recorded
+            program_counter, path, ran = recorded
+            countdown -= ran
+            if path is not None:
+                trace = tracing.compileTrace(node_list, target, path)
+            elif ran == limit:
+                # cut short by the countdown, recorded again at the next jump
+                return program_counter, countdown
+            self.traces[key] = trace or False
+            if trace is None or program_counter != target:
+                return program_counter, countdown
+            limit = countdown - 1 if countdown > 0 else -1
+        elif trace is False:
+            return target, countdown
+        passes = limit // trace.length if limit >= 0 else -1
+        if passes == 0:
+            return target, countdown
+        program_counter, ran = trace.run(frame.values, self.sink.write, passes)
+        return program_counter, countdown - ran
+
+    # recordLoop :: List[support.Node], int, Frame, int -> Union[support.Error, Tuple[int, list, int]]
+    def recordLoop(self, node_list : List[support.Node], target : int, frame : Frame, limit : int = -1) -> Union[support.Error, Tuple[int, list, int]]:
+        """recordLoop function, runs the statements of a loop once and records the way it takes
+
+        Recording stops without a path at a function call, an ERR statement, the end of the
+        code block, a statement that runs twice before the loop is back at its start or after limit statements.
+
+        Args:
+            node_list (List[support.Node]): statements of the running code block
+            target (int): index of the first statement of the loop
+            frame (Frame): frame of the running code block
+            limit (int, optional): statements that may run, below 0 for no limit. Defaults to -1.
+
+        Returns:
+            Union[support.Error, Tuple[int, list, int]]: index of the statement to continue with, the (index, outcome)
+            of every statement that ran, None as path when the loop can not be traced, and the amount of statements that ran
+        """
+        path = []
+        visited = set()
+        program_counter = target
+        program_length = len(node_list)
+        while program_counter < program_length and program_counter not in visited and len(path) != limit:
+            head = node_list[program_counter]
+            if type(head) is support.FunctionCall or head.token_type == enums.token_types.ERR:
+                break
+            visited.add(program_counter)
+            if head.token_type == enums.token_types.LINE:
+                outcome = self.evaluateVariable(head, frame)
+                if type(outcome) is support.Error:
+                    return outcome
+                next_statement = vm.jumpTarget(program_counter, outcome, program_length)
+            elif type(head) is peephole.BranchNode:
+                outcome = self.evaluateCondition(head.condition, frame)
+                if type(outcome) is support.Error:
+                    return outcome
+                if frame.values[head.value.slot] is None:
+                    return support.Error("if statement on undeclared variable", head.line_nr)
+                next_statement = head.target_true if outcome else head.target_false
+            else:
+                outcome = self.dispatch[type(head)](head, frame)
+                if type(outcome) is support.Error:
+                    return outcome
+                outcome = None
+                next_statement = program_counter + 1
+            path.append((program_counter, outcome))
+            program_counter = next_statement
+            if program_counter == target:
+                return program_counter, path, len(path)
+        return program_counter, None, len(path)
+
+    # acquireFrame :: symbol_table.Scope -> Frame
+    def acquireFrame(self, scope : symbol_table.Scope) -> Frame:
+        free_frames = self.free_frames.get(scope.name)
+        if free_frames:
+            frame = free_frames.pop()
+            frame.reset()
+            return frame
+        return Frame(scope)
+
+    # releaseFrame :: Frame -> None
+    def releaseFrame(self, frame : Frame) -> None:
+        self.free_frames.setdefault(frame.scope.name, []).append(frame)
+
+    # evaluate :: support.Node, Frame -> Union[support.Error, support.lit_types]
+    def evaluate(self, node : support.Node, frame : Frame) -> Union[support.Error, support.lit_types]:
+        return self.dispatch[type(node)](node, frame)
+
+    # evaluateNode :: support.Node, Frame -> support.lit_types
+    def evaluateNode(self, node : support.Node, frame : Frame) -> support.lit_types:
+        return node.value
+
+    # read :: support.Node, Frame -> Union[support.Error, support.lit_types]
+    def read(self, node : support.Node, frame : Frame) -> Union[support.Error, support.lit_types]:
+        """read function, value of a variable or literal used by a statement
+
+        Args:
+            node (support.Node): variable or literal to read
+            frame (Frame): frame of the running code block
+
+        Returns:
+            Union[support.Error, support.lit_types]: the value, an error when the variable has none yet
+        """
+        if node.token_type == enums.token_types.VAR:
+            value = frame.values[node.slot]
+            if value is None:
+                return support.Error("Var " + node.variable_name + " has no value", node.line_nr)
+            return value
+        return node.value
+
+    # evaluateVariable :: support.VariableNode, Frame -> Union[support.Error, support.lit_types, support.Node]
+    def evaluateVariable(self, node : support.VariableNode, frame : Frame) -> Union[support.Error, support.lit_types, support.Node]:
+        """evaluateVariable function, runs an assignment, OUT, LINE, ERR or DECLARE statement
+
+        Args:
+            node (support.VariableNode): statement to run
+            frame (Frame): frame of the running code block
+
+        Returns:
+            Union[support.Error, support.lit_types, support.Node]: value of the statement, the line to jump for LINE
+        """
+        values = frame.values
+        token_type = node.token_type
+        value = node.value
+
+        if token_type == enums.token_types.VAR or token_type == enums.token_types.OUTPUT:
+            if value.value == "INPUT" or value.token_type == enums.token_types.INPUT:
+                input_value = values[frame.scope.input_slot]
+                values[node.slot] = input_value
+                return input_value
+
+            elif value.token_type == enums.token_types.VAR:
+                node_value = values[value.slot]
+                if node_value is None:
+                    return support.Error("Var " + value.variable_name + " has no value", node.line_nr)
+                values[node.slot] = node_value
+                return node_value
+            else: #literals, assigning one to an existing variable keeps its value
+                current = values[node.slot]
+                if current is not None:
+                    return current
+                values[node.slot] = value.value
+                return value.value
+
+        elif token_type == enums.token_types.OUT:
+            printable = self.read(value, frame)
+            if type(printable) is support.Error:
+                return printable
+            self.sink.write(printable)
+            return printable
+
+        elif token_type == enums.token_types.LINE:
+            line_number = self.read(value, frame)
+            if type(line_number) is int or type(line_number) is support.Error:
+                return line_number
+            text = str(line_number)
+            if not text.lstrip("-").isnumeric():
+                return support.Error("Line number to jump to not int", node.line_nr)
+            return int(text)
+
+        elif token_type == enums.token_types.ERR:
+            return support.Error(value, node.line_nr)
+
+        elif token_type == enums.token_types.DECLARE:
+            return node
+
+    # evaluateMath :: support.MathNode, Frame -> Union[support.Error, support.lit_types]
+    def evaluateMath(self, node : support.MathNode, frame : Frame) -> Union[support.Error, support.lit_types]:
+        """evaluateMath function, applies the operator to a variable and stores the result in it
+
+        Args:
+            node (support.MathNode): math statement to run
+            frame (Frame): frame of the running code block
+
+        Returns:
+            Union[support.Error, support.lit_types]: new value of the variable
+        """
+        function = math_functions.get(node.token_type)
+        if function is None:
+            return support.Error("unknown operator in Math statement", node.line_nr)
+        values = frame.values
+        lhs = values[node.value.slot]
+        if lhs is None:
+            return support.Error("Math statement on unknown variable", node.line_nr)
+        rhs = self.read(node.rhs, frame)
+        if type(lhs) is int and type(rhs) is int:
+            new_value = function(lhs, rhs)
+        else:
+            if type(rhs) is support.Error:
+                return rhs
+            try:
+                new_value = function(toOperand(lhs), toOperand(rhs))
+            except TypeError:
+                return support.Error("cant use operator on variables of different type", node.line_nr)
+        values[node.value.slot] = new_value
+        return new_value
+
+    # evaluateCondition :: support.ConditionNode, Frame -> Union[support.Error, bool, None]
+    def evaluateCondition(self, node : support.ConditionNode, frame : Frame) -> Union[support.Error, bool, None]:
+        """evaluateCondition function, compares the two sides of a condition
+
+        Args:
+            node (support.ConditionNode): condition to evaluate
+            frame (Frame): frame of the running code block
+
+        Returns:
+            Union[support.Error, bool, None]: outcome of the condition, None when the if statement does nothing
+        """
+        function = condition_functions.get(node.token_type)
+        if function is None:
+            return support.Error("unknown operator in condition statement", node.line_nr)
+        lhs = self.read(node.value, frame)
+        rhs = self.read(node.condition, frame)
+        if type(lhs) is int and type(rhs) is int:
+            return function(lhs, rhs)
+        for side in (lhs, rhs):
+            if type(side) is support.Error:
+                return side
+        lhs = toOperand(lhs)
+        rhs = toOperand(rhs)
+        if type(lhs) == str and type(rhs) == str:
+            if node.token_type == enums.token_types.EQUAL or node.token_type == enums.token_types.NOTEQUAL:
+                return function(lhs, rhs)
+            # the Visitor gives back the class here, which makes the if statement do nothing
+            return None
+        elif type(lhs) == int and type(rhs) == int:
+            return function(lhs, rhs)
+        # the Visitor takes the else branch when the types differ
+        return False
+
+    # evaluateIf :: support.IfNode, Frame -> Union[support.Error, support.lit_types, None]
+    def evaluateIf(self, node : support.IfNode, frame : Frame) -> Union[support.Error, support.lit_types, None]:
+        """evaluateIf function, gives a variable the value of the branch the condition picks
+
+        A variable as new value is copied when the if statement runs, later changes to it are not seen.
+
+        Args:
+            node (support.IfNode): if statement to run
+            frame (Frame): frame of the running code block
+
+        Returns:
+            Union[support.Error, support.lit_types, None]: new value of the variable, None when it is unchanged
+        """
+        result = self.evaluateCondition(node.condition, frame)
+        if result is None or type(result) is support.Error:
+            return result
+        new_value = node.new_value_true if result else node.new_value_false
+        if new_value is None:
+            return None
+        if frame.values[node.value.slot] is None:
+            return support.Error("if statement on undeclared variable", node.line_nr)
+        new_value = self.read(new_value, frame)
+        if type(new_value) is support.Error:
+            return new_value
+        frame.values[node.value.slot] = new_value
+        return new_value
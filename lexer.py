@@ -1,11 +1,27 @@
-from typing import List
+from typing import List, Iterable, Iterator, Union, Tuple
+import array
 import operator
+import mmap
+import os
+import re
+
 import enums
 
 class Token(object):
-    def __init__(self, value: str, token_type: enums.token_types):
+    __slots__ = ("value", "token_type", "line", "column")
+
+    def __init__(self, value: str, token_type: enums.token_types, line: int = None, column: int = None):
         self.value = value
         self.token_type = token_type
+        self.line = line
+        self.column = column
+
+    @property
+    def position(self) -> Union[Tuple[int, int], None]:
+        """(line, column) in the source file, None for tokens made without a source"""
+        if self.line is None:
+            return None
+        return self.line, self.column
 
     def __str__(self) -> str:
         return 'Token({value}, {token_type})'.format(
@@ -16,101 +32,366 @@ class Token(object):
     def __repr__(self) ->str:
         return self.__str__()
 
+class SpanToken(Token):
+    """Token that points at a byte span of a memory mapped source, its text is only decoded when value is used"""
+    __slots__ = ("source", "start", "end", "decoded")
+
+    def __init__(self, source: mmap.mmap, start: int, end: int, token_type: enums.token_types, line: int = None, column: int = None):
+        self.source = source
+        self.start = start
+        self.end = end
+        self.token_type = token_type
+        self.line = line
+        self.column = column
+        self.decoded = None
+
+    @property
+    def value(self) -> str:
+        if self.decoded is None:
+            text = self.source[self.start:self.end].decode("utf-8")
+            if self.token_type == enums.token_types.STRING:
+                text = " ".join(text.split())
+            self.decoded = text
+        return self.decoded
+
+# token types by their number in a TokenStream kind column
+stream_kinds = list(enums.token_types)
+stream_kind_ids = {token_type : kind_id for kind_id, token_type in enumerate(stream_kinds)}
+stream_from_kind = stream_kind_ids[enums.token_types.FROM]
+
+class TokenStream(object):
+    """TokenStream class, compact column store of tokens
+
+    Every token is a row in parallel arrays: its kind, its span in the source and the
+    id of its text in a table of interned symbols, so each distinct word is stored once.
+    Indexing gives back ordinary Tokens, so the stream can be used where a list of tokens is expected,
+    the parser takes a whole line at a time with tokens and lineEnd.
+    """
+    def __init__(self, tokens : Iterable[Token] = ()):
+        """__init__ for TokenStream
+
+        Args:
+            tokens (Iterable[Token], optional): tokens to store. Defaults to ().
+        """
+        self.kinds = array.array("B")
+        self.lines = array.array("I")
+        self.columns = array.array("I")
+        self.symbol_ids = array.array("I")
+        self.symbols = []
+        self.symbol_index = {}
+        self.extend(tokens)
+
+    # intern :: str -> int
+    def intern(self, text : str) -> int:
+        """intern function, gives the id of text in the symbol table, adding it when new
+
+        Args:
+            text (str): text to intern
+
+        Returns:
+            int: symbol id
+        """
+        symbol_id = self.symbol_index.get(text)
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            self.symbols.append(text)
+            self.symbol_index[text] = symbol_id
+        return symbol_id
+
+    # append :: Token -> None
+    def append(self, token : Token) -> None:
+        self.kinds.append(stream_kind_ids[token.token_type])
+        self.lines.append(token.line or 0)
+        self.columns.append(token.column or 0)
+        self.symbol_ids.append(self.intern(token.value))
+
+    # extend :: Iterable[Token] -> None
+    def extend(self, tokens : Iterable[Token]) -> None:
+        kinds, lines, columns, symbol_ids = self.kinds, self.lines, self.columns, self.symbol_ids
+        symbol_index = self.symbol_index
+        for token in tokens:
+            kinds.append(stream_kind_ids[token.token_type])
+            lines.append(token.line or 0)
+            columns.append(token.column or 0)
+            value = token.value
+            symbol_id = symbol_index.get(value)
+            symbol_ids.append(self.intern(value) if symbol_id is None else symbol_id)
+
+    # tokenType :: int -> enums.token_types
+    def tokenType(self, index : int) -> enums.token_types:
+        return stream_kinds[self.kinds[index]]
+
+    # symbol :: int -> str
+    def symbol(self, index : int) -> str:
+        return self.symbols[self.symbol_ids[index]]
+
+    # tokens :: int, int -> List[Token]
+    def tokens(self, start : int, end : int) -> List[Token]:
+        """tokens function, the Tokens of a range of rows, read from the columns in one pass
+
+        Args:
+            start (int): index of the first token
+            end (int): index after the last token
+
+        Returns:
+            List[Token]: the tokens, without a position when they were stored without one
+        """
+        values = map(self.symbols.__getitem__, self.symbol_ids[start:end])
+        token_types = map(stream_kinds.__getitem__, self.kinds[start:end])
+        lines = self.lines[start:end]
+        if 0 in lines:
+            return [Token(value, token_type, line or None, column if line else None)
+                    for value, token_type, line, column in zip(values, token_types, lines, self.columns[start:end])]
+        return list(map(Token, values, token_types, lines, self.columns[start:end]))
+
+    # lineEnd :: int -> int
+    def lineEnd(self, start : int) -> int:
+        """lineEnd function, index of the first FROM at or after start, found by searching the kind column
+
+        Args:
+            start (int): index to search from
+
+        Returns:
+            int: index of the FROM, the length of the stream when there is none
+        """
+        try:
+            return self.kinds.index(stream_from_kind, start)
+        except ValueError:
+            return len(self.kinds)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index : Union[int, slice]) -> Union[Token, List[Token]]:
+        if isinstance(index, slice):
+            start, end, step = index.indices(len(self))
+            if step == 1:
+                return self.tokens(start, end)
+            return [self[position] for position in range(start, end, step)]
+        if index < 0:
+            index += len(self)
+        line = self.lines[index]
+        if line == 0:
+            return Token(self.symbol(index), self.tokenType(index))
+        return Token(self.symbol(index), self.tokenType(index), line, self.columns[index])
+
+    def __iter__(self) -> Iterator[Token]:
+        return iter(self.tokens(0, len(self)))
+
+    def __str__(self) -> str:
+        return 'TokenStream({length} tokens, {symbols} symbols)'.format(
+            length = len(self),
+            symbols = len(self.symbols)
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+# words that map straight onto a token type
+word_table = {token_type.name : token_type for token_type in (
+    enums.token_types.FROM, enums.token_types.TO, enums.token_types.LINE, enums.token_types.OUT,
+    enums.token_types.OUTPUT, enums.token_types.DECLARE, enums.token_types.INPUT, enums.token_types.START,
+    enums.token_types.ERR, enums.token_types.END, enums.token_types.ELSE)}
+word_table.update({
+    "+" : enums.token_types.SUB,
+    "-" : enums.token_types.ADD,
+    "*" : enums.token_types.DIV,
+    "/" : enums.token_types.MUL,
+    ":" : enums.token_types.IF,
+    enums.token_types.SMALLER.value : enums.token_types.SMALLER,
+    enums.token_types.GREATER.value : enums.token_types.GREATER,
+    enums.token_types.EQUAL.value : enums.token_types.EQUAL,
+    enums.token_types.NOTEQUAL.value : enums.token_types.NOTEQUAL,
+    enums.token_types.EQUALSMALLER.value : enums.token_types.EQUALSMALLER,
+    enums.token_types.EQUALGREATER.value : enums.token_types.EQUALGREATER,
+})
+
+# a word is either a string literal, which may contain whitespace, or a run of non whitespace
+word_pattern = re.compile(r'[^\s"]*"[^"]*"\S*|\S+')
+int_pattern = re.compile(r'-*\d+')
+
+# same rules as word_pattern and lexTokenType, but on bytes with a named group per token type,
+# so a mapped source can be classified without slicing words out of the buffer
+mapped_pattern = re.compile(b"|".join(
+    [b"(?P<NEWLINE>\\n)"] +
+    [b"(?P<" + token_type.name.encode() + b">" + re.escape(word.encode()) + b")(?!\\S)"
+        for word, token_type in sorted(word_table.items(), key=lambda item: -len(item[0]))] +
+    [b"(?P<INT>-*[0-9]+)(?!\\S)", b'(?P<STRING>[^\\s"]*"[^"]*"\\S*|\\S*"\\S*)', b"(?P<VAR>\\S+)"]))
+
+# token type per group number of mapped_pattern, None for a newline
+mapped_types = [None] * (mapped_pattern.groups + 1)
+for name, index in mapped_pattern.groupindex.items():
+    if name != "NEWLINE":
+        mapped_types[index] = enums.token_types[name]
+
+# lexTokenType :: str -> Union[enums.token_types, None]
+def lexTokenType(word : str) -> Union[enums.token_types, None]:
+    """lexTokenType function, finds the token type of a single word
+
+    Args:
+        word (str): word to find the token type of
+
+    Returns:
+        Union[enums.token_types, None]: token type or None when the word is skipped
+    """
+    token_type = word_table.get(word)
+    if token_type is not None:
+        return token_type
+    if int_pattern.fullmatch(word):
+        return enums.token_types.INT
+    if "-" in word:
+        return None
+    if "\"" in word:
+        return enums.token_types.STRING
+    return enums.token_types.VAR
+
+# lexCreateToken :: str, int, int -> Union[Token, None]
+def lexCreateToken(word : str, line : int = None, column : int = None) -> Union[Token, None]:
+    """lexCreateToken function, turns a single word into a token
+
+    Args:
+        word (str): word to turn into a token
+        line (int, optional): line of the word in the source. Defaults to None.
+        column (int, optional): column of the word in the source. Defaults to None.
+
+    Returns:
+        Union[Token, None]: found token or None when the word is skipped
+    """
+    token_type = lexTokenType(word)
+    if token_type is None:
+        return None
+    if token_type == enums.token_types.STRING:
+        word = " ".join(word.split())
+    return Token(word, token_type, line, column)
+
 # lexCreateTokens :: List[str] -> List[Token]
 def lexCreateTokens(seperate_words : List[str]) -> List[Token]:
-    if len(seperate_words) == 0:
-        return []
-    head, *tail = seperate_words
-    temp_list = []
-    if head == enums.token_types.FROM.name:
-        temp_list += [Token(head, enums.token_types.FROM)]
-    elif head == enums.token_types.TO.name:
-        temp_list += [Token(head, enums.token_types.TO)]
-    elif head == enums.token_types.LINE.name:
-        temp_list += [Token(head, enums.token_types.LINE)]
-    elif head == enums.token_types.OUT.name:
-        temp_list += [Token(head, enums.token_types.OUT)]
-    elif head == enums.token_types.OUTPUT.name:
-        temp_list += [Token(head, enums.token_types.OUTPUT)]
-    elif head == enums.token_types.DECLARE.name:
-        temp_list += [Token(head, enums.token_types.DECLARE)]
-    elif head == enums.token_types.INPUT.name:
-        temp_list += [Token(head, enums.token_types.INPUT)]
-    elif head == enums.token_types.START.name:
-        temp_list += [Token(head, enums.token_types.START)]
-    elif head == enums.token_types.ERR.name:
-        temp_list += [Token(head, enums.token_types.ERR)]
-    elif head == enums.token_types.END.name:
-        temp_list += [Token(head, enums.token_types.END)]
-    elif head == enums.token_types.ELSE.name:
-        temp_list += [Token(head, enums.token_types.ELSE)]
-    elif head == "+":
-        temp_list += [Token(head, enums.token_types.SUB)]
-    elif head == "-":
-        temp_list += [Token(head, enums.token_types.ADD)]
-    elif head == "*":
-        temp_list += [Token(head, enums.token_types.DIV)]
-    elif head == "/":
-        temp_list += [Token(head, enums.token_types.MUL)]
-    elif head.isnumeric():
-        temp_list += [Token(head, enums.token_types.INT)]
-    elif "-" in head:
-        just_number = head.lstrip("-")
-        if just_number.isnumeric():
-            temp_list += [Token(head, enums.token_types.INT)]
-    elif head == ":":
-        temp_list += [Token(head, enums.token_types.IF)]
-    elif "\"" in head:
-        temp_list += [Token(head, enums.token_types.STRING)]
-    elif head == enums.token_types.SMALLER.value:
-        temp_list += [Token(head, enums.token_types.SMALLER)]
-    elif head == enums.token_types.GREATER.value:
-        temp_list += [Token(head, enums.token_types.GREATER)]
-    elif head == enums.token_types.EQUAL.value:
-        temp_list += [Token(head, enums.token_types.EQUAL)]
-    elif head == enums.token_types.NOTEQUAL.value:
-        temp_list += [Token(head, enums.token_types.NOTEQUAL)]
-    elif head == enums.token_types.EQUALSMALLER.value:
-        temp_list += [Token(head, enums.token_types.EQUALSMALLER)]
-    elif head == enums.token_types.EQUALGREATER.value:
-        temp_list += [Token(head, enums.token_types.EQUALGREATER)]
-    else:
-        temp_list += [Token(head, enums.token_types.VAR)]
-
-    return temp_list + lexCreateTokens(tail)
-
-# lexen :: str -> List[Token]
-def lexen(code_file_name : str) -> List[Token]:
-    code = open(code_file_name, "r")
-    code_text = code.read()
-    seperate_words = code_text.split()
-    seperate_words = findStrings(seperate_words)
-    tokens = lexCreateTokens(seperate_words)
-    return tokens
+    return [token for token in map(lexCreateToken, seperate_words) if token is not None]
 
-# findStrings :: List[str], str, str -> List[str]
-def findStrings(word_list : List[str], string :str="", state : str="START") -> List[str]:
-    if len(word_list) == 0:
-        return word_list
-    head, *tail = word_list
-    if state=="START":
-        if "\"" in head:
-            state = "BEGIN"
-            string = "" + head
-            if head.endswith("\""):
-                state = "START"
-                return [head] + findStrings(tail, string, state)
-            return [] + findStrings(tail, string, state)
-        else:
-            return [head] + findStrings(tail, string, state)
+# lexTokenize :: str, int -> Iterator[Token]
+def lexTokenize(code_text : str, line : int = 1) -> Iterator[Token]:
+    """lexTokenize function, lexes a piece of source text in a single pass
+
+    Args:
+        code_text (str): source text to lex
+        line (int, optional): line number of the first line of code_text. Defaults to 1.
+
+    Returns:
+        Iterator[Token]: generator yielding the found tokens with their line and column
+    """
+    line_start = 0
+    position = 0
+    for match in word_pattern.finditer(code_text):
+        start = match.start()
+        newlines = code_text.count("\n", position, start)
+        if newlines:
+            line += newlines
+            line_start = code_text.rfind("\n", position, start) + 1
+        position = start
+        token = lexCreateToken(match.group(), line, start - line_start + 1)
+        if token is not None:
+            yield token
+
+# lexStream :: str -> Iterator[Token]
+def lexStream(code_file_name : str) -> Iterator[Token]:
+    """lexStream function, lazily lexes a file one token at a time
 
-    elif state=="BEGIN":
-        if "\"" not in head:
-            string = string + " " + head
-            return findStrings(tail, string, state)
+    The file is read line by line, only a string literal that spans multiple lines
+    is buffered until its closing quote, so neither the source text nor the word
+    list is held in memory as a whole.
+
+    Args:
+        code_file_name (str): path of the file to lex
+
+    Returns:
+        Iterator[Token]: generator yielding the found tokens in order
+    """
+    with open(code_file_name, "r") as code:
+        chunk = ""
+        chunk_line = 1
+        for line_nr, line in enumerate(code, 1):
+            if not chunk:
+                chunk_line = line_nr
+            chunk += line
+            if chunk.count("\"") % 2 == 0:
+                yield from lexTokenize(chunk, chunk_line)
+                chunk = ""
+        if chunk:
+            yield from lexTokenize(chunk, chunk_line)
+
+# lexMapped :: str -> Iterator[Token]
+def lexMapped(code_file_name : str) -> Iterator[Token]:
+    """lexMapped function, lexes a memory mapped file without copying its text
+
+    The yielded tokens refer to byte spans of the mapping and keep it alive, the
+    file itself is closed as soon as it is mapped.
+
+    Args:
+        code_file_name (str): path of the file to lex
+
+    Returns:
+        Iterator[Token]: generator yielding SpanTokens in order
+    """
+    with open(code_file_name, "rb") as code:
+        if os.fstat(code.fileno()).st_size == 0:
+            return
+        source = mmap.mmap(code.fileno(), 0, access=mmap.ACCESS_READ)
+
+    line = 1
+    line_start = 0
+    for match in mapped_pattern.finditer(source):
+        token_type = mapped_types[match.lastindex]
+        start, end = match.span()
+        if token_type is None:
+            line += 1
+            line_start = end
+            continue
+        if token_type is enums.token_types.VAR or token_type is enums.token_types.STRING:
+            if source.find(b"-", start, end) != -1:
+                continue
+        yield SpanToken(source, start, end, token_type, line, start - line_start + 1)
+        if token_type is enums.token_types.STRING and source.find(b"\n", start, end) != -1:
+            line += source[start:end].count(b"\n")
+            line_start = source.rfind(b"\n", start, end) + 1
+
+# lexenCompact :: str, bool -> TokenStream
+def lexenCompact(code_file_name : str, mapped : bool = False) -> TokenStream:
+    if mapped:
+        return TokenStream(lexMapped(code_file_name))
+    return TokenStream(lexStream(code_file_name))
+
+# lexen :: str, bool -> List[Token]
+def lexen(code_file_name : str, mapped : bool = False) -> List[Token]:
+    if mapped:
+        return list(lexMapped(code_file_name))
+    return list(lexStream(code_file_name))
+
+# joinStrings :: Iterable[str], str, str -> Iterator[str]
+def joinStrings(word_list : Iterable[str], string :str="", state : str="START") -> Iterator[str]:
+    """joinStrings function, glues words between quotes back together into one string literal
+
+    Args:
+        word_list (Iterable[str]): words to scan
+        string (str, optional): string that is being build. Defaults to "".
+        state (str, optional): START outside of a string, BEGIN inside of one. Defaults to "START".
+
+    Returns:
+        Iterator[str]: generator yielding words and complete string literals
+    """
+    for word in word_list:
+        if state == "START":
+            if "\"" in word:
+                string = word
+                if not word.endswith("\""):
+                    state = "BEGIN"
+                    continue
+            yield word
         else:
-            state = "START"
-            string = string + " " + head
-            return [string] + findStrings(tail, string, state)
-    return findStrings(tail, string, state)
-    
+            string = string + " " + word
+            if "\"" in word:
+                state = "START"
+                yield string
+
+# findStrings :: List[str], str, str -> List[str]
+def findStrings(word_list : List[str], string :str="", state : str="START") -> List[str]:
+    return list(joinStrings(word_list, string, state))
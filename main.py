@@ -1,18 +1,103 @@
-import lexer
-import parser
-import enums
+import argparse
+import sys
+
 import support
+import parse_cache
+import interpreter
+import vm
+import closures
+import sinks
+import transpiler
+import profiler
+import sampling
+
+# backward jumps to a statement before the tracing engine compiles its loop
+hot_loop = 50
+
+# run :: List[support.Node], dict, str, sinks.Sink, sampling.StackSampler, int, float -> Union[support.Error, dict]
+def run(tree : list, found_funcs : dict, engine : str = "tree", sink : sinks.Sink = None, sampler : sampling.StackSampler = None,
+        max_steps : int = None, deadline : float = None):
+    """run function, runs a parsed program with one of the execution engines
+
+    Args:
+        tree (list): parsed main code
+        found_funcs (dict): al found functions
+        engine (str, optional): tree for the Visitor, frames for the Interpreter, tracing for the Interpreter that compiles hot loops, vm for the bytecode VirtualMachine, closures for the closure compiled program, python for the transpiled python source. Defaults to "tree".
+        sink (sinks.Sink, optional): where OUT statements write to, flushed when the program ends. Defaults to printing every value.
+        sampler (sampling.StackSampler, optional): samples the chains of function calls, frames and tracing only. Defaults to None.
+        max_steps (int, optional): amount of statements the program may run, frames and tracing only. Defaults to no limit.
+        deadline (float, optional): seconds the program may run, frames and tracing only. Defaults to no limit.
+
+    Returns:
+        Union[support.Error, dict]: the first error or the variables of the main code at the end
+    """
+    if sink is not None:
+        with sinks.redirect(sink):
+            return run(tree, found_funcs, engine, sampler=sampler, max_steps=max_steps, deadline=deadline)
+    if engine == "vm":
+        return vm.VirtualMachine().run(vm.Compiler().compile(tree, found_funcs))
+    if engine == "python":
+        return transpiler.run(tree, found_funcs)
+    if engine == "closures":
+        return closures.Compiler().compile(tree, found_funcs).run()
+    if engine == "frames":
+        return interpreter.Interpreter(found_funcs, sampler=sampler, max_steps=max_steps, deadline=deadline).run(tree)
+    if engine == "tracing":
+        return interpreter.Interpreter(found_funcs, hot_loop=hot_loop, sampler=sampler, max_steps=max_steps, deadline=deadline).run(tree)
+    visitor = support.Visitor()
+    return visitor.visitAl(tree, tree, found_funcs=found_funcs)
 
 def main():
-    lexed = lexer.lexen("code.txt")
-    parse = parser.Parser()
-    tree, found_funcs = parse.parse(lexed)
+    argument_parser = argparse.ArgumentParser(description="FROM HERE TO THERE interpreter")
+    argument_parser.add_argument("file", nargs="?", default="code.txt", help="program to run")
+    argument_parser.add_argument("--engine", choices=["tree", "frames", "tracing", "vm", "closures", "python"], default="tree", help="execution engine")
+    argument_parser.add_argument("--output", choices=["stdout", "buffered", "binary", "null"], default="stdout", help="where OUT statements write to")
+    argument_parser.add_argument("--profile", action="store_true", help="print the time spent per line and per function, tree engine only")
+    argument_parser.add_argument("--profile-json", metavar="FILE", help="write the time spent per line and per function to a json file, tree engine only")
+    argument_parser.add_argument("--sample", metavar="FILE", help="write collapsed call stacks for flamegraph tools to a file, frames and tracing engines only")
+    argument_parser.add_argument("--sample-every", type=int, metavar="N", help="sample the call stack every N statements instead of by time")
+    argument_parser.add_argument("--sample-interval", type=float, default=0.001, metavar="SECONDS", help="seconds between two samples")
+    argument_parser.add_argument("--sample-clock", choices=list(sampling.clocks), default="wall", help="clock --sample-interval counts, cpu time leaves out the time the program waits")
+    argument_parser.add_argument("--max-steps", type=int, metavar="N", help="stop the program with an error after N statements, frames and tracing engines only")
+    argument_parser.add_argument("--deadline", type=float, metavar="SECONDS", help="stop the program with an error after SECONDS, frames and tracing engines only")
+    argument_parser.add_argument("--parallel-parse", action="store_true", help="parse the function bodies in a process pool, done anyway for files from 1 MiB when there is more than one core")
+    argument_parser.add_argument("--mapped", action="store_true", help="lex the file from a memory map, done anyway for files from 4 MiB")
+    arguments = argument_parser.parse_args()
+    if (arguments.max_steps is not None or arguments.deadline is not None) and arguments.engine not in ("frames", "tracing"):
+        argument_parser.error("--max-steps and --deadline only work with --engine frames or tracing")
+    profiling = arguments.profile or arguments.profile_json is not None
+    if profiling and arguments.engine != "tree":
+        argument_parser.error("profiling only works with --engine tree")
+    sampler = None
+    if arguments.sample is not None:
+        if arguments.engine not in ("frames", "tracing"):
+            argument_parser.error("sampling only works with --engine frames or tracing")
+        sampler = sampling.StackSampler(arguments.sample_every, arguments.sample_interval, arguments.sample_clock)
+
+    cache = parse_cache.ParseCache()
+    tree, found_funcs = cache.parseFile(arguments.file, True if arguments.parallel_parse else None, True if arguments.mapped else None)
+    for warning in cache.diagnostics:
+        print(warning, file=sys.stderr)
 
     if len(tree) == 1 and type(tree[0]) == support.Error:
         print(tree[0])
     else:
-        visitor = support.Visitor()
-        tree = visitor.visitAl(tree, tree, found_funcs=found_funcs)
+        line_profiler = profiler.Profiler() if profiling else None
+        if line_profiler is not None:
+            line_profiler.install()
+        try:
+            tree = run(tree, found_funcs, arguments.engine, sinks.makeSink(arguments.output), sampler, arguments.max_steps, arguments.deadline)
+        finally:
+            if line_profiler is not None:
+                line_profiler.uninstall()
         if type(tree) is support.Error:
             print(tree)
-main()
\ No newline at end of file
+        if arguments.profile:
+            print(line_profiler.report())
+        if arguments.profile_json is not None:
+            line_profiler.writeJson(arguments.profile_json)
+        if sampler is not None:
+            sampler.writeCollapsed(arguments.sample)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+from typing import Union, Set, Hashable
+import collections
+
+import enums
+import support
+
+class LRUCache(object):
+    """LRUCache class, results of function calls with a bounded size, the least recently used entry goes first"""
+    def __init__(self, max_size : int = 1024):
+        """__init__ for LRUCache
+
+        Args:
+            max_size (int, optional): amount of results kept. Defaults to 1024.
+        """
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __str__(self) -> str:
+        return 'LRUCache({size}/{max_size}, hits={hits}, misses={misses}, evictions={evictions})'.format(
+            size = len(self.entries),
+            max_size = self.max_size,
+            hits = self.hits,
+            misses = self.misses,
+            evictions = self.evictions
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key : Hashable) -> bool:
+        return key in self.entries
+
+    # get :: Hashable -> Union[support.lit_types, None]
+    def get(self, key : Hashable) -> Union[support.lit_types, None]:
+        """get function, gives a stored result and marks it as most recently used
+
+        Args:
+            key (Hashable): (function name, input) of the call
+
+        Returns:
+            Union[support.lit_types, None]: the stored result, None when it is not stored
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    # put :: Hashable, support.lit_types -> None
+    def put(self, key : Hashable, value : support.lit_types) -> None:
+        """put function, stores a result, removes the least recently used one when the cache is full
+
+        Args:
+            key (Hashable): (function name, input) of the call
+            value (support.lit_types): output of the call
+        """
+        if self.max_size <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    # clear :: -> None
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # stats :: -> dict
+    def stats(self) -> dict:
+        return {"size" : len(self.entries), "max_size" : self.max_size, "hits" : self.hits, "misses" : self.misses, "evictions" : self.evictions}
+
+# calledFunctions :: support.FunctionNode -> Union[Set[str], None]
+def calledFunctions(function : support.FunctionNode) -> Union[Set[str], None]:
+    """calledFunctions function, names of the functions a body calls when the body itself has no side effects
+
+    Args:
+        function (support.FunctionNode): function to look at
+
+    Returns:
+        Union[Set[str], None]: called functions, None when the body has an OUT or ERR statement or a nested function
+    """
+    called = set()
+    for node in function.commands:
+        node_type = type(node)
+        if node_type is support.VariableNode and (node.token_type == enums.token_types.OUT or node.token_type == enums.token_types.ERR):
+            return None
+        elif node_type is support.FunctionNode:
+            return None
+        elif node_type is support.FunctionCall:
+            called.add(node.value)
+    return called
+
+# pureFunctions :: dict -> Set[str]
+def pureFunctions(found_funcs : dict) -> Set[str]:
+    """pureFunctions function, purity analysis over al functions of a program
+
+    A function is pure when its body has no OUT or ERR statement and it only calls pure
+    functions, its output then only depends on its input. Functions that call each other,
+    like bool_even and bool_odd, are pure together unless one of them is not.
+
+    Args:
+        found_funcs (dict): al found functions
+
+    Returns:
+        Set[str]: names of the pure functions
+    """
+    calls = {function_name : calledFunctions(function) for function_name, function in found_funcs.items()}
+    pure = {function_name for function_name, called in calls.items() if called is not None}
+    changed = True
+    while changed:
+        changed = False
+        for function_name in list(pure):
+            if not calls[function_name] <= pure:
+                pure.discard(function_name)
+                changed = True
+    return pure
@@ -0,0 +1,203 @@
+from typing import Union, Tuple, List
+import hashlib
+import inspect
+import mmap
+import os
+import pickle
+import tempfile
+
+import enums
+import support
+import lexer
+import parser
+
+# first bytes of every cache file, the number is the layout of the file itself
+cache_magic = b"FHTT-AST"
+cache_format = 2
+
+# sources from this size on are lexed from a memory map, see lexer.lexMapped
+mapped_size = 4 * 1024 * 1024
+
+# sources from this size on have their function bodies parsed in a process pool when there is more than one core
+parallel_size = 1024 * 1024
+
+# node classes that end up in a pickled tree, a change to one of them must invalidate the cache
+cached_classes = [support.Error, support.Diagnostic, support.Node, support.VariableNode, support.MathNode,
+                  support.ConditionNode, support.IfNode, support.FunctionNode, support.FunctionCall]
+
+# schemaFingerprint :: -> str
+def schemaFingerprint() -> str:
+    """schemaFingerprint function, hash of everything the layout of a parsed tree depends on
+
+    Returns:
+        str: hex digest over the node classes, the token and node enums and the parser version
+    """
+    digest = hashlib.sha256()
+    digest.update(str(parser.parser_version).encode())
+    for cls in cached_classes:
+        digest.update(cls.__qualname__.encode())
+        digest.update(inspect.getsource(cls.__init__).encode())
+    for enum in (enums.token_types, enums.node_types):
+        digest.update(repr([(member.name, member.value) for member in enum]).encode())
+    return digest.hexdigest()
+
+class ParseCache(object):
+    """ParseCache class, keeps parsed trees on disk keyed by the hash of their source"""
+    def __init__(self, directory : str = None, max_bytes : int = 64 * 1024 * 1024):
+        """__init__ for ParseCache
+
+        Args:
+            directory (str, optional): folder for the cache files. Defaults to $FHTT_PARSE_CACHE or ~/.cache/from_here_to_there.
+            max_bytes (int, optional): total size the cache files may take, the least recently used are removed beyond it. Defaults to 64 MiB.
+        """
+        if directory is None:
+            directory = os.environ.get("FHTT_PARSE_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "from_here_to_there"))
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.schema = schemaFingerprint()
+        self.hits = 0
+        self.misses = 0
+        # warnings of the last parsed file, from the parser or stored with the cached tree
+        self.diagnostics = []
+
+    def __str__(self) -> str:
+        return 'ParseCache({directory}, hits={hits}, misses={misses})'.format(
+            directory = self.directory,
+            hits = self.hits,
+            misses = self.misses
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # key :: Union[bytes, mmap.mmap] -> str
+    def key(self, source : Union[bytes, mmap.mmap]) -> str:
+        digest = hashlib.sha256(self.schema.encode())
+        digest.update(source)
+        return digest.hexdigest()
+
+    # path :: str -> str
+    def path(self, key : str) -> str:
+        return os.path.join(self.directory, key + ".ast")
+
+    # load :: str -> Union[Tuple[list, dict, List[support.Diagnostic]], None]
+    def load(self, key : str) -> Union[Tuple[list, dict, List[support.Diagnostic]], None]:
+        """load function, reads a parsed tree from the cache
+
+        Args:
+            key (str): key of the source
+
+        Returns:
+            Union[Tuple[list, dict, List[support.Diagnostic]], None]: (tree, found_funcs, diagnostics) or None when not cached or unreadable
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                header = cache_file.read(len(cache_magic) + 1 + len(key))
+                if header != cache_magic + bytes([cache_format]) + key.encode():
+                    raise ValueError("cache file header does not match")
+                result = pickle.load(cache_file)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            self.remove(path)
+            return None
+        return result
+
+    # store :: str, Tuple[list, dict, List[support.Diagnostic]] -> None
+    def store(self, key : str, result : Tuple[list, dict, List[support.Diagnostic]]) -> None:
+        """store function, writes a parsed tree to the cache and evicts old entries when over budget
+
+        Args:
+            key (str): key of the source
+            result (Tuple[list, dict, List[support.Diagnostic]]): (tree, found_funcs) returned by the parser and its warnings
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(handle, "wb") as cache_file:
+                cache_file.write(cache_magic + bytes([cache_format]) + key.encode())
+                pickle.dump(result, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.path(key))
+        except (OSError, pickle.PicklingError, RecursionError):
+            self.remove(temp_path)
+            return
+        self.evict()
+
+    # remove :: str -> None
+    def remove(self, path : str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # evict :: -> int
+    def evict(self) -> int:
+        """evict function, removes the least recently used cache files until the cache fits in max_bytes
+
+        Returns:
+            int: amount of removed files
+        """
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".ast")]
+            stats = [(entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries]
+        except OSError:
+            return 0
+        total = sum(size for _, size, _ in stats)
+        removed = 0
+        for _, size, path in sorted(stats):
+            if total <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    # parseFile :: str, bool, bool -> Tuple[list, dict]
+    def parseFile(self, code_file_name : str, parallel : bool = None, mapped : bool = None) -> Tuple[list, dict]:
+        """parseFile function, gives the parsed tree of a file, lexing and parsing only when it is not cached
+
+        The warnings of the parser end up in diagnostics.
+
+        Args:
+            code_file_name (str): path of the file to parse
+            parallel (bool, optional): parse the function bodies in a process pool with Parser.parseParallel.
+                Defaults to None, which does so for files from parallel_size on when there is more than one core.
+            mapped (bool, optional): lex the file from a memory map, without reading its text first.
+                Defaults to None, which does so for files from mapped_size on.
+
+        Returns:
+            Tuple[list, dict]: either list of errors or created AST and al found functions
+        """
+        with open(code_file_name, "rb") as code:
+            size = os.fstat(code.fileno()).st_size
+            if size == 0:
+                key = self.key(b"")
+            else:
+                # hashed straight from the page cache, the text is only read by the lexer
+                with mmap.mmap(code.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                    key = self.key(source)
+        result = self.load(key)
+        if result is not None:
+            self.hits += 1
+            tree, found_funcs, self.diagnostics = result
+            return tree, found_funcs
+        self.misses += 1
+        if parallel is None:
+            parallel = size >= parallel_size and (os.cpu_count() or 1) > 1
+        if mapped is None:
+            mapped = size >= mapped_size
+        tokens = lexer.lexenCompact(code_file_name, mapped)
+        file_parser = parser.Parser()
+        if parallel:
+            tree, found_funcs = file_parser.parseParallel(tokens)
+        else:
+            tree, found_funcs = file_parser.parse(tokens)
+        self.diagnostics = file_parser.diagnostics
+        if not (len(tree) > 0 and type(tree[0]) == support.Error):
+            self.store(key, (tree, found_funcs, self.diagnostics))
+        return tree, found_funcs
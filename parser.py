@@ -2,333 +2,443 @@ from typing import List, TypeVar, Union, Tuple
 import functools
 import operator
 import copy
+import concurrent.futures
 
 import enums
 import support
 import lexer
+import symbol_table
 
+# bump when the parser starts building different trees, invalidates cached parse results
+parser_version = 2
+
+# operators that can be used in an if statement
+condition_types = ( enums.token_types.EQUAL, enums.token_types.NOTEQUAL, enums.token_types.GREATER,
+                    enums.token_types.SMALLER, enums.token_types.EQUALGREATER, enums.token_types.EQUALSMALLER)
 
 class Parser(object):
     def __init__(self):
-        pass
+        self.symbol_table = symbol_table.SymbolTable()
+        # warnings of the last parse, the program still runs
+        self.diagnostics = []
 
     list_types = TypeVar(support.Node, support.VariableNode, support.MathNode, support.Error)
-    # parser :: List[lexer.Token], int, List[support.VariableNode], dict, List[list_types], enums.parser_states, int, List[support.Error] -> Tuple(List[list_types], dict)
-    def parse(  self, token_list : List[lexer.Token], line_nr : int = 1, found_vars : List[support.VariableNode]=[],
-                found_funcs : dict = {}, tree : List[list_types] = [], state :enums.parser_states=enums.parser_states.SINGLE, function_line_nr : int = 1, errors : List[support.Error]=[]) -> Tuple[List[list_types], dict]:
-        """main parser function
+    # parser :: Union[List[lexer.Token], lexer.TokenStream], int, List[support.VariableNode], dict, List[list_types], enums.parser_states, int, List[support.Error] -> Tuple(List[list_types], dict)
+    def parse(  self, token_list : Union[List[lexer.Token], lexer.TokenStream], line_nr : int = 1, found_vars : List[support.VariableNode]=None,
+                found_funcs : dict = None, tree : List[list_types] = None, state :enums.parser_states=enums.parser_states.SINGLE, function_line_nr : int = 1, errors : List[support.Error]=None) -> Tuple[List[list_types], dict]:
+        """main parser function, walks the tokens line by line and builds the AST in place
 
         Args:
-            token_list (List[lexer.Token]): list of tokens to parse
+            token_list (Union[List[lexer.Token], lexer.TokenStream]): list or compact stream of tokens to parse
             line_nr (int, optional): current line number. Defaults to 1.
-            found_vars (List[support.VariableNode], optional): Al found variables up until current recursion. Defaults to [].
-            found_funcs (dict, optional): Al found functions up until current recursion. Defaults to {}.
-            tree (List[list_types], optional): AST. Defaults to [].
+            found_vars (List[support.VariableNode], optional): Al found variables up until now. Defaults to None.
+            found_funcs (dict, optional): Al found functions up until now. Defaults to None.
+            tree (List[list_types], optional): AST to continue. Defaults to None.
             state (enums.parser_states, optional): current state. Defaults to enums.parser_states.SINGLE.
             function_line_nr (int, optional): current line number inside function. Defaults to 1.
-            errors (List[support.Error], optional): list of errors found in parserd line. Defaults to [].
+            errors (List[support.Error], optional): list of errors found in parserd line. Defaults to None.
 
         Returns:
             Tuple[List[list_types], dict]: return either list of errors or created AST and al found functions
         """        
+        found_funcs = {} if found_funcs is None else dict(found_funcs)
+        tree = [] if tree is None else list(tree)
+        errors = [] if errors is None else list(errors)
+
+        self.symbol_table = symbol_table.SymbolTable()
+        self.diagnostics = []
+        for var in found_vars or []:
+            self.symbol_table.main.define(var)
+        for function_name in found_funcs:
+            self.symbol_table.declareFunction(function_name, found_funcs[function_name].line_nr)
+
+        position = 0
+        while not errors and position < len(token_list):
+            found_line = self.readLine(token_list, position)
+            head = found_line[0]
+            position += len(found_line)
+            length_line = len(found_line)
+
+            # based on length of line start assigning
+            if head.token_type != enums.token_types.FROM or length_line < 3:
+                errors += [support.Error("invalid syntax", line_nr, head.position)]
+            elif length_line != 6 and found_line[2].token_type != enums.token_types.TO:
+                errors += [support.Error("invalid syntax", line_nr, head.position)]
+            elif length_line < 4 or length_line > 9:
+                errors += [support.Error("invalid syntax, wrong line length", line_nr, head.position)]
+
+            elif state == enums.parser_states.SINGLE:
+                new_state = self.parseLine(found_line, line_nr, self.symbol_table.main, found_funcs, tree, errors)
+                if new_state is None:
+                    errors += [support.Error("SO WRONG I DONT KNOW WHAT YOUR EVEN TRYING", line_nr, head.position)]
+                elif new_state == enums.parser_states.FUNCTION:
+                    state = new_state
+                    function_line_nr = 1
+                else:
+                    line_nr += 1
 
-        found_vars = copy.copy(found_vars)
-        found_funcs = copy.copy(found_funcs)
-        errors = copy.copy(errors)
-        tree = copy.copy(tree)
+            #start of function found: 
+            elif state == enums.parser_states.FUNCTION:
+                new_state = self.parseFunctionLine(found_line, tree[-1], line_nr, function_line_nr, found_funcs, tree, errors)
+                if new_state is None:
+                    errors += [support.Error("SO WRONG I DONT KNOW WHAT YOUR EVEN TRYING", line_nr, head.position)]
+                else:
+                    state = new_state
+                    function_line_nr += 1
 
         if len( errors ) > 0:
             return errors, found_funcs
+        self.diagnostics = self.symbol_table.checkShadowing()
+        return tree, found_funcs
 
-        if len( token_list ) == 0:
-            return tree, found_funcs
+    # findFunctionBlocks :: Union[List[lexer.Token], lexer.TokenStream] -> Tuple[List[Tuple[int, int]], List[tuple]]
+    def findFunctionBlocks(self, token_list : Union[List[lexer.Token], lexer.TokenStream]) -> Tuple[List[Tuple[int, int]], List[tuple]]:
+        """findFunctionBlocks function, cheap scan that splits the tokens into main code and function bodies
 
-        head, *tail = token_list
+        Only the DECLARE, START and END lines are looked at, nothing is parsed.
 
+        Args:
+            token_list (Union[List[lexer.Token], lexer.TokenStream]): tokens to scan
 
-        value = head.value
-        token_type = head.token_type
-        if token_type == enums.token_types.FROM:
-            found_line = [head] + self.getLine(tail)
-            
-            # based on length of line start assigning
-            length_line = len(found_line)
-            if len(found_line) != 6:
-                if found_line[0].token_type != enums.token_types.FROM or found_line[2].token_type != enums.token_types.TO:
-                    errors += [support.Error("invalid syntax", line_nr)]
-                    remaining_tail = tail[length_line-1:]
-                    return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-            if len(found_line) < 4 or len(found_line) > 9:
-                errors += [support.Error("invalid syntax, wrong line length", line_nr)]
-                remaining_tail = tail[length_line-1:]
-                return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-
-            if state == enums.parser_states.SINGLE:
-                if length_line == 4:
-                    
-                    #check for GOTO
-                    if found_line[3].token_type == enums.token_types.LINE:
-                        check_var = self.findAndReturnVar(found_vars, found_line[1].value)
-                        if check_var is not False:
-                            var = support.VariableNode(found_line[3].value, check_var, line_nr, enums.token_types.LINE)
-                        else:
-                            if found_line[1].token_type == enums.token_types.INT:
-                                var = support.VariableNode(found_line[3].value, support.Node(found_line[1].value, line_nr, enums.token_types.INT), line_nr, enums.token_types.LINE)
-                        tree += [var]
-                        remaining_tail = tail[length_line-1:]
-                        return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-                    #check for Error
-                    if found_line[3].token_type == enums.token_types.ERR:
-                        var = support.VariableNode(found_line[3].value, found_line[1].value, line_nr, enums.token_types.ERR)
-                        tree += [var]
-                        remaining_tail = tail[length_line-1:]
-                        return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-
-                    #check for function decleration 
-                    elif found_line[3].token_type == enums.token_types.DECLARE:
-                        check_var = self.findAndReturnVar(found_vars, found_line[1].value)
-                        if check_var == False:
-                            var = support.VariableNode(found_line[3].value, None, line_nr, enums.token_types.DECLARE)
-                            tree += [var]
-                            found_funcs[found_line[1].value] = support.FunctionNode(found_line[1].value, line_nr, [], [], enums.token_types.FUNCTION)
-                            remaining_tail = tail[length_line-1:]
-                            return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-                        else:
-                            errors += [support.Error("function name already taken", line_nr)]
-                            remaining_tail = tail[length_line-1:]
-                            return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-                    
-                    #check for function start
-                    elif found_line[1].token_type == enums.token_types.START:
-                        if found_line[3].value in found_funcs:
-                            function = found_funcs[found_line[3].value]
-                            tree += [function]
-                            state = enums.parser_states.FUNCTION
-                            remaining_tail = tail[length_line-1:]
-                            return self.parse(remaining_tail, line_nr, found_vars, found_funcs, tree, state, errors=errors)
-                        else:
-                            errors += [support.Error("function not declared", line_nr)]
-                            remaining_tail = tail[length_line-1:]
-                            return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-
-                    #check for variable assignement
-                    elif found_line[3].token_type == enums.token_types.VAR or found_line[3].token_type == enums.token_types.OUT:
-                        var, errors = self.getVarNode(found_line, found_vars, line_nr)
-                        if not errors:
-                            if found_line[3].token_type == enums.token_types.OUT:
-                                var.token_type = enums.token_types.OUT
-                            if var.token_type != enums.token_types.OUT:
-                                found_vars += [var]
+        Returns:
+            Tuple[List[Tuple[int, int]], List[tuple]]: (start, end) index ranges of the main code and per function body
+                (name, line_nr, body start, body end, (name, line_nr) of the functions declared before the body, whether the body has an END line)
+        """
+        main_ranges = []
+        blocks = []
+        declared = []
+        line_nr = 1
+        main_start = 0
+        function_start = None
+        position = 0
+        while position < len(token_list):
+            found_line = self.readLine(token_list, position)
+            line_start = position
+            position += len(found_line)
+            if len(found_line) != 4:
+                if function_start is None:
+                    line_nr += 1
+                continue
+            if function_start is None:
+                if found_line[3].token_type == enums.token_types.DECLARE:
+                    declared.append((found_line[1].value, line_nr))
+                elif found_line[1].token_type == enums.token_types.START and found_line[3].value in dict(declared):
+                    main_ranges.append((main_start, line_start))
+                    function_start = position
+                    function = (found_line[3].value, line_nr, tuple(declared))
+                    continue
+                line_nr += 1
+            elif found_line[1].token_type == enums.token_types.END:
+                blocks.append(function[:2] + (function_start, position) + function[2:] + (True,))
+                function_start = None
+                main_start = position
+        if function_start is None:
+            main_ranges.append((main_start, len(token_list)))
+        else:
+            blocks.append(function[:2] + (function_start, len(token_list)) + function[2:] + (False,))
+        return main_ranges, blocks
+
+    # parseParallel :: Union[List[lexer.Token], lexer.TokenStream], int -> Tuple[List[list_types], dict]
+    def parseParallel(self, token_list : Union[List[lexer.Token], lexer.TokenStream], processes : int = None) -> Tuple[List[list_types], dict]:
+        """parseParallel function, parses the function bodies in a process pool and the main code in this process
+
+        Function bodies only know their own variables and the names of the functions declared before them,
+        so they can be parsed independently and merged into found_funcs afterwards.
+
+        Args:
+            token_list (Union[List[lexer.Token], lexer.TokenStream]): list or compact stream of tokens to parse
+            processes (int, optional): amount of worker processes. Defaults to the amount of cores.
+
+        Returns:
+            Tuple[List[list_types], dict]: same as parse, either list of errors or created AST and al found functions
+        """
+        main_ranges, blocks = self.findFunctionBlocks(token_list)
+        if len(blocks) < 2:
+            return self.parse(token_list)
+
+        jobs = [(name, line_nr, declared, lexer.TokenStream(token_list[start:end])) for name, line_nr, start, end, declared, ended in blocks]
+        with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+            futures = [executor.submit(parseFunctionBlock, *job) for job in jobs]
+            main_tokens = [token for start, end in main_ranges for token in token_list[start:end]]
+            tree, found_funcs = self.parse(main_tokens)
+            results = [future.result() for future in futures]
+
+        errors = [] if len(tree) == 0 or type(tree[0]) != support.Error else tree[:1]
+        for block, (function, function_errors, scope) in zip(blocks, results):
+            errors += function_errors[:1]
+            if function is not None:
+                end_name = block[0] if not block[5] else token_list[block[3] - 1].value
+                found_funcs[end_name] = function
+                self.symbol_table.scopes[scope.name] = scope
+                if not block[5]:
+                    tree.append(function)
+        if errors:
+            errors.sort(key=lambda error: error.position or (0, 0))
+            return errors[:1], found_funcs
+        self.diagnostics = self.symbol_table.checkShadowing()
+        return tree, found_funcs
+
+    # parseLine :: List[lexer.Token], int, symbol_table.Scope, dict, List[list_types], List[support.Error] -> Union[enums.parser_states, None]
+    def parseLine(self, found_line : List[lexer.Token], line_nr : int, scope : symbol_table.Scope, found_funcs : dict,
+                    tree : List[list_types], errors : List[support.Error]) -> Union[enums.parser_states, None]:
+        """parseLine function, parses a single line of the main code block into the tree
+
+        Args:
+            found_line (List[lexer.Token]): line to parse
+            line_nr (int): current line number
+            scope (symbol_table.Scope): scope of the main code, new variables are added
+            found_funcs (dict): al found functions, new ones are added
+            tree (List[list_types]): AST, new nodes are added
+            errors (List[support.Error]): list of errors, new ones are added
+
+        Returns:
+            Union[enums.parser_states, None]: state for the next line, None when the line is not understood
+        """
+        head = found_line[0]
+        length_line = len(found_line)
+        if length_line == 4:
+
+            #check for GOTO
+            if found_line[3].token_type == enums.token_types.LINE:
+                check_var = self.findAndReturnVar(scope, found_line[1].value)
+                if check_var is not False:
+                    var = support.VariableNode(found_line[3].value, check_var, line_nr, enums.token_types.LINE)
+                elif found_line[1].token_type == enums.token_types.INT:
+                    var = support.VariableNode(found_line[3].value, support.Node(support.literalValue(found_line[1].value), line_nr, enums.token_types.INT), line_nr, enums.token_types.LINE)
+                else:
+                    errors += [support.Error("var not declared", line_nr, found_line[1].position)]
+                    return enums.parser_states.SINGLE
+                tree += [var]
+                return enums.parser_states.SINGLE
+
+            #check for Error
+            elif found_line[3].token_type == enums.token_types.ERR:
+                var = support.VariableNode(found_line[3].value, found_line[1].value, line_nr, enums.token_types.ERR)
+                tree += [var]
+                return enums.parser_states.SINGLE
+
+            #check for function decleration 
+            elif found_line[3].token_type == enums.token_types.DECLARE:
+                check_var = self.findAndReturnVar(scope, found_line[1].value)
+                if check_var == False:
+                    var = support.VariableNode(found_line[3].value, None, line_nr, enums.token_types.DECLARE)
+                    tree += [var]
+                    found_funcs[found_line[1].value] = support.FunctionNode(found_line[1].value, line_nr, [], [], enums.token_types.FUNCTION)
+                    self.symbol_table.declareFunction(found_line[1].value, line_nr)
+                else:
+                    errors += [support.Error("function name already taken", line_nr, head.position)]
+                return enums.parser_states.SINGLE
+
+            #check for function start
+            elif found_line[1].token_type == enums.token_types.START:
+                if found_line[3].value in found_funcs:
+                    tree += [found_funcs[found_line[3].value]]
+                    return enums.parser_states.FUNCTION
+                errors += [support.Error("function not declared", line_nr, head.position)]
+                return enums.parser_states.SINGLE
+
+            #check for variable assignement
+            elif found_line[3].token_type == enums.token_types.VAR or found_line[3].token_type == enums.token_types.OUT:
+                var, var_errors = self.getVarNode(found_line, scope, line_nr)
+                errors += var_errors
+                if not var_errors:
+                    if found_line[3].token_type == enums.token_types.OUT:
+                        var.token_type = enums.token_types.OUT
+                    if var.token_type != enums.token_types.OUT:
+                        scope.define(var)
+                    tree += [var]
+                return enums.parser_states.SINGLE
+
+        elif length_line == 6:
+
+            #check for function call
+            if found_line[1].value in found_funcs:
+                func, output_node = self.getFunctionCall(found_line, scope, line_nr, errors)
+                if func is not None:
+                    tree += [func]
+                    scope.define(output_node)
+                return enums.parser_states.SINGLE
+
+            # check for math
+            elif found_line[1].token_type == enums.token_types.VAR and found_line[3].token_type == enums.token_types.VAR:
+                if (found_line[4].token_type is enums.token_types.ADD or
+                    found_line[4].token_type is enums.token_types.MUL or
+                    found_line[4].token_type is enums.token_types.SUB or
+                    found_line[4].token_type is enums.token_types.DIV):
+
+                        var, var_errors = self.getMathNode(found_line, scope, line_nr)
+                        errors += var_errors
+                        if not var_errors:
                             tree += [var]
-                        remaining_tail = tail[length_line-1:]
-                        return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-
-
-                elif length_line == 6:
-                    
-                    #check for function call
-                    if found_line[1].value in found_funcs:
-                        func_search = found_funcs[found_line[1].value]
-                        if func_search is not False:
-                            func = support.FunctionCall(found_line[1].value, line_nr, None, None, enums.token_types.VAR)
-                            if found_line[3].token_type == enums.token_types.INT or found_line[3].token_type == enums.token_types.STRING :
-                                input_node = support.Node(found_line[3].value, line_nr, found_line[3].token_type)
-                                func.input = input_node
-                            elif found_line[3].token_type == enums.token_types.VAR:
-                                temp = self.findAndReturnVar(found_vars, found_line[3].value)
-                                if temp is not False:
-                                    func.input = input_node
-                                else:
-                                    errors += [support.Error("var not declared", line_nr)]
-                                    remaining_tail = tail[length_line-1:]
-                                    return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-                            
-                            output_node = support.VariableNode(found_line[5].value, support.Node(None, line_nr, None), line_nr, enums.token_types.VAR)
-                            func.output = output_node
-
-                            tree += [func]
-                            found_vars += [output_node]
-                            remaining_tail = tail[length_line-1:]
-                            return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-                        else:
-                            errors += [support.Error("function does not exist", line_nr)]
-                            remaining_tail = tail[length_line-1:]
-                            return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-
-                    # check for math
-                    elif found_line[1].token_type == enums.token_types.VAR and found_line[3].token_type == enums.token_types.VAR:
-                        if (found_line[4].token_type is enums.token_types.ADD or
-                            found_line[4].token_type is enums.token_types.MUL or
-                            found_line[4].token_type is enums.token_types.SUB or
-                            found_line[4].token_type is enums.token_types.DIV):
-
-                                var, errors = self.getMathNode(found_line, found_vars, line_nr)
-                                if not errors:
-                                    tree += [var]
-                                remaining_tail = tail[length_line-1:]
-                                return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-
-                elif length_line == 7 or length_line == 9:
-                    
-                    #check for if
-                    if found_line[1].token_type == enums.token_types.VAR and found_line[5].token_type == enums.token_types.IF:
-                        if (found_line[3].token_type == enums.token_types.EQUAL or
-                            found_line[3].token_type == enums.token_types.NOTEQUAL or
-                            found_line[3].token_type == enums.token_types.GREATER or
-                            found_line[3].token_type == enums.token_types.SMALLER or
-                            found_line[3].token_type == enums.token_types.EQUALGREATER or
-                            found_line[3].token_type == enums.token_types.EQUALSMALLER):
-                                    var, errors = self.getIfNode(found_line, found_vars, line_nr)
-                                    if not errors:
-                                        tree += [var]
-                                    remaining_tail = tail[length_line-1:]
-                                    return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors)
-            #start of function found: 
-            elif state == enums.parser_states.FUNCTION:
-                node = copy.copy(tree[-1])
-                new_node = copy.copy(node)
-                if node.node_type == enums.node_types.FUNCTION:
-                    if length_line == 4:
-
-                        # check for input assignement
-                        if found_line[1].token_type == enums.token_types.INPUT:
-                            temp = self.findAndReturnVar(node.variables, found_line[3])
-                            if temp == False:
-                                temp_var = support.VariableNode(found_line[3].value, support.Node(found_line[1].value, function_line_nr, enums.token_types.INPUT), function_line_nr, enums.token_types.VAR, enums.node_types.INPUT)
-                            else:
-                                temp_var = support.VariableNode(found_line[3].value, temp, function_line_nr, enums.token_types.VAR, enums.node_types.INPUT)
-                            new_node.commands += [temp_var]
-                            new_node.variables += [temp_var]
-                            remaining_tail = tail[length_line-1:]
-                            return self.parse(remaining_tail, line_nr, found_vars, found_funcs,tree, state, function_line_nr+1, errors=errors)
-
-
-                        # check for output assignment
-                        elif found_line[3].token_type == enums.token_types.OUTPUT:
-                            if found_line[1].token_type == enums.token_types.VAR:
-                                temp = self.findAndReturnVar(new_node.variables, found_line[1].value)
-                                if temp != False:
-                                    temp_var = support.VariableNode(found_line[3].value, temp, function_line_nr, found_line[3].token_type)
-                                else:
-                                    errors += [support.Error("var not declared, in function", function_line_nr)]
-                                    remaining_tail = tail[length_line-1:]
-                                    return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors) 
-                            else:
-                                temp_var = support.VariableNode(found_line[3].value, support.Node(found_line[1].value, function_line_nr, found_line[1].token_type), function_line_nr, found_line[3].token_type)
-                            new_node.commands += [temp_var]
-                            remaining_tail = tail[length_line-1:]
-                            return self.parse(remaining_tail, line_nr, found_vars, found_funcs,tree, state, function_line_nr+1, errors=errors)
-                        
-                        #check for function end
-                        elif found_line[1].token_type == enums.token_types.END:
-                            state = enums.parser_states.SINGLE
-                            remaining_tail = tail[length_line-1:]
-                            tree.pop(-1)
-                            found_funcs[found_line[3].value] = new_node
-                            remaining_tail = tail[length_line-1:]
-                            return self.parse(remaining_tail, line_nr, found_vars, found_funcs,tree, state, function_line_nr+1, errors=errors)
-
-                        #check for GOTO
-                        elif found_line[3].token_type == enums.token_types.LINE:
-                            check_var = self.findAndReturnVar(new_node.variables, found_line[1].value)
-                            if check_var is not False:
-                                var = support.VariableNode(found_line[3].value, check_var, function_line_nr, enums.token_types.LINE)
-                            else:
-                                if found_line[1].token_type == enums.token_types.INT:
-                                    var = support.VariableNode(found_line[3].value, support.Node(found_line[1].value, function_line_nr, enums.token_types.INT), function_line_nr, enums.token_types.LINE)
-                            new_node.commands += [var]
-                            remaining_tail = tail[length_line-1:]
-                            return self.parse(remaining_tail, line_nr, found_vars, found_funcs, tree, state, function_line_nr+1, errors=errors)
-
-                        #check for Error
-                        elif found_line[3].token_type == enums.token_types.ERR:
-                            var = support.VariableNode(found_line[3].value, found_line[1].value, line_nr, enums.token_types.ERR)
-                            new_node.commands += [var]
-                            remaining_tail = tail[length_line-1:]
-                            return self.parse(remaining_tail, line_nr, found_vars, found_funcs, tree, state, function_line_nr+1, errors=errors)
-
-                        # check for variable assignement
-                        elif found_line[3].token_type == enums.token_types.VAR or found_line[3].token_type == enums.token_types.OUT:
-                            var, errors = self.getVarNode(found_line, new_node.variables, function_line_nr)
-
-                            if found_line[3].token_type == enums.token_types.OUT:
-                                var.token_type = enums.token_types.OUT
-                            if var.token_type != enums.token_types.OUT:
-                                new_node.variables += [var]
-                            new_node.commands += [var]
-                            remaining_tail = tail[length_line-1:]
-                            return self.parse(remaining_tail, line_nr, found_vars, found_funcs,tree, state, function_line_nr+1, errors=errors)
-
-                    elif length_line == 6:
-
-                        #check for function call
-                        if found_line[1].value in found_funcs:
-                            func_search = found_funcs[found_line[1].value]
-                            if func_search is not False:
-                                func = support.FunctionCall(found_line[1].value, function_line_nr, None, None, enums.token_types.VAR)
-                                if found_line[3].token_type == enums.token_types.INT or found_line[3].token_type == enums.token_types.STRING :
-                                    input_node = support.Node(found_line[3].value, function_line_nr, found_line[3].token_type)
-                                    func.input = input_node
-                                elif found_line[3].token_type == enums.token_types.VAR:
-                                    temp = self.findAndReturnVar(new_node.variables, found_line[3].value)
-                                    if temp is not False:
-                                        func.input = temp
-                                    else:
-                                        errors += [support.Error("var not declared", function_line_nr)]
-                                        remaining_tail = tail[length_line-1:]
-                                        return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-                                output_node = support.VariableNode(found_line[5].value, support.Node(None, function_line_nr, None), function_line_nr, enums.token_types.VAR)
-                                func.output = output_node
-                                
-                                new_node.commands += [func]
-                                new_node.variables += [output_node]
-                                remaining_tail = tail[length_line-1:]
-                                return self.parse(remaining_tail, line_nr, found_vars, found_funcs, tree, state, function_line_nr+1, errors=errors)
-                            else:
-                                errors += [(support.Error("function does not exist", function_line_nr))]
-                                remaining_tail = tail[length_line-1:]
-                                return self.parse(remaining_tail, line_nr, found_vars, found_funcs, tree, state, function_line_nr+1, errors=errors)
-
-                        # check for math
-                        if found_line[1].token_type == enums.token_types.VAR and found_line[3].token_type == enums.token_types.VAR:
-                            if (found_line[4].token_type is enums.token_types.ADD or
-                                found_line[4].token_type is enums.token_types.MUL or
-                                found_line[4].token_type is enums.token_types.SUB or
-                                found_line[4].token_type is enums.token_types.DIV):
-
-                                    var, errors = self.getMathNode(found_line, new_node.variables, function_line_nr)
-                                    if not errors:
-                                        node.commands +=[var]
-                                    remaining_tail = tail[length_line-1:]
-                                    return self.parse(remaining_tail, line_nr, found_vars, found_funcs,tree, state, function_line_nr+1, errors=errors)
-                    
-                    elif length_line == 7 or length_line == 9:
-
-                        #check for if
-                        if found_line[1].token_type == enums.token_types.VAR and found_line[5].token_type == enums.token_types.IF:
-                            if (found_line[3].token_type == enums.token_types.EQUAL or
-                                found_line[3].token_type == enums.token_types.NOTEQUAL or
-                                found_line[3].token_type == enums.token_types.GREATER or
-                                found_line[3].token_type == enums.token_types.SMALLER or
-                                found_line[3].token_type == enums.token_types.EQUALGREATER or
-                                found_line[3].token_type == enums.token_types.EQUALSMALLER):
-                                        var, errors = self.getIfNode(found_line, new_node.variables, function_line_nr)
-                                        if not errors:
-                                            node.commands += [var]
-                                        remaining_tail = tail[length_line-1:]
-                                        return self.parse(remaining_tail, line_nr, found_vars, found_funcs,tree, state, function_line_nr+1, errors=errors)
-            
-            errors += [support.Error("SO WRONG I DONT KNOW WHAT YOUR EVEN TRYING", line_nr)]
-            remaining_tail = tail[length_line-1:]
-            return self.parse(remaining_tail, line_nr+1, found_vars, found_funcs, tree, state, errors=errors)
-    
-    # getVarNode :: List[lexer.Token], List[support.VariableNode], int -> Tuple(support.VariableNode, support.Error)
-    def getVarNode(self, found_line : List[lexer.Token], found_vars : List[support.VariableNode], line_nr : int) -> Tuple[ support.VariableNode, support.Error]:
+                        return enums.parser_states.SINGLE
+
+        elif length_line == 7 or length_line == 9:
+
+            #check for if
+            if found_line[1].token_type == enums.token_types.VAR and found_line[5].token_type == enums.token_types.IF:
+                if found_line[3].token_type in condition_types:
+                    var, var_errors = self.getIfNode(found_line, scope, line_nr)
+                    errors += var_errors
+                    if not var_errors:
+                        tree += [var]
+                    return enums.parser_states.SINGLE
+        return None
+
+    # parseFunctionLine :: List[lexer.Token], support.FunctionNode, int, int, dict, List[list_types], List[support.Error] -> Union[enums.parser_states, None]
+    def parseFunctionLine(self, found_line : List[lexer.Token], function : support.FunctionNode, line_nr : int, function_line_nr : int,
+                            found_funcs : dict, tree : List[list_types], errors : List[support.Error]) -> Union[enums.parser_states, None]:
+        """parseFunctionLine function, parses a single line of a function body into that function
+
+        Args:
+            found_line (List[lexer.Token]): line to parse
+            function (support.FunctionNode): function whose body is being parsed
+            line_nr (int): current line number
+            function_line_nr (int): current line number inside the function
+            found_funcs (dict): al found functions
+            tree (List[list_types]): AST, the function is removed from it at the end of its body
+            errors (List[support.Error]): list of errors, new ones are added
+
+        Returns:
+            Union[enums.parser_states, None]: state for the next line, None when the line is not understood
+        """
+        length_line = len(found_line)
+        scope = self.symbol_table.openScope(function.value)
+        if length_line == 4:
+
+            # check for input assignement
+            if found_line[1].token_type == enums.token_types.INPUT:
+                temp_var = support.VariableNode(found_line[3].value, support.Node(found_line[1].value, function_line_nr, enums.token_types.INPUT), function_line_nr, enums.token_types.VAR, enums.node_types.INPUT)
+                function.commands += [temp_var]
+                function.variables += [temp_var]
+                scope.define(temp_var)
+                return enums.parser_states.FUNCTION
+
+            # check for output assignment
+            elif found_line[3].token_type == enums.token_types.OUTPUT:
+                if found_line[1].token_type == enums.token_types.VAR:
+                    temp = self.findAndReturnVar(scope, found_line[1].value)
+                    if temp == False:
+                        errors += [support.Error("var not declared, in function", function_line_nr, found_line[1].position)]
+                        return enums.parser_states.FUNCTION
+                    temp_var = support.VariableNode(found_line[3].value, temp, function_line_nr, found_line[3].token_type)
+                elif found_line[1].token_type == enums.token_types.INT:
+                    temp_var = support.VariableNode(found_line[3].value, support.Node(support.literalValue(found_line[1].value), function_line_nr, found_line[1].token_type), function_line_nr, found_line[3].token_type)
+                else:
+                    temp_var = support.VariableNode(found_line[3].value, support.Node(found_line[1].value, function_line_nr, found_line[1].token_type), function_line_nr, found_line[3].token_type)
+                function.commands += [temp_var]
+                return enums.parser_states.FUNCTION
+
+            #check for function end
+            elif found_line[1].token_type == enums.token_types.END:
+                tree.pop(-1)
+                found_funcs[found_line[3].value] = function
+                return enums.parser_states.SINGLE
+
+            #check for GOTO
+            elif found_line[3].token_type == enums.token_types.LINE:
+                check_var = self.findAndReturnVar(scope, found_line[1].value)
+                if check_var is not False:
+                    var = support.VariableNode(found_line[3].value, check_var, function_line_nr, enums.token_types.LINE)
+                elif found_line[1].token_type == enums.token_types.INT:
+                    var = support.VariableNode(found_line[3].value, support.Node(support.literalValue(found_line[1].value), function_line_nr, enums.token_types.INT), function_line_nr, enums.token_types.LINE)
+                else:
+                    errors += [support.Error("var not declared, in function", function_line_nr, found_line[1].position)]
+                    return enums.parser_states.FUNCTION
+                function.commands += [var]
+                return enums.parser_states.FUNCTION
+
+            #check for Error
+            elif found_line[3].token_type == enums.token_types.ERR:
+                var = support.VariableNode(found_line[3].value, found_line[1].value, line_nr, enums.token_types.ERR)
+                function.commands += [var]
+                return enums.parser_states.FUNCTION
+
+            # check for variable assignement
+            elif found_line[3].token_type == enums.token_types.VAR or found_line[3].token_type == enums.token_types.OUT:
+                var, var_errors = self.getVarNode(found_line, scope, function_line_nr)
+                errors += var_errors
+                if not var_errors:
+                    if found_line[3].token_type == enums.token_types.OUT:
+                        var.token_type = enums.token_types.OUT
+                    if var.token_type != enums.token_types.OUT:
+                        function.variables += [var]
+                        scope.define(var)
+                    function.commands += [var]
+                return enums.parser_states.FUNCTION
+
+        elif length_line == 6:
+
+            #check for function call
+            if found_line[1].value in found_funcs:
+                func, output_node = self.getFunctionCall(found_line, scope, function_line_nr, errors)
+                if func is not None:
+                    function.commands += [func]
+                    function.variables += [output_node]
+                    scope.define(output_node)
+                return enums.parser_states.FUNCTION
+
+            # check for math
+            elif found_line[1].token_type == enums.token_types.VAR and found_line[3].token_type == enums.token_types.VAR:
+                if (found_line[4].token_type is enums.token_types.ADD or
+                    found_line[4].token_type is enums.token_types.MUL or
+                    found_line[4].token_type is enums.token_types.SUB or
+                    found_line[4].token_type is enums.token_types.DIV):
+
+                        var, var_errors = self.getMathNode(found_line, scope, function_line_nr)
+                        errors += var_errors
+                        if not var_errors:
+                            function.commands += [var]
+                        return enums.parser_states.FUNCTION
+
+        elif length_line == 7 or length_line == 9:
+
+            #check for if
+            if found_line[1].token_type == enums.token_types.VAR and found_line[5].token_type == enums.token_types.IF:
+                if found_line[3].token_type in condition_types:
+                    var, var_errors = self.getIfNode(found_line, scope, function_line_nr)
+                    errors += var_errors
+                    if not var_errors:
+                        function.commands += [var]
+                    return enums.parser_states.FUNCTION
+        return None
+
+    # getFunctionCall :: List[lexer.Token], Union[List[support.VariableNode], symbol_table.Scope], int, List[support.Error] -> Tuple[support.FunctionCall, support.VariableNode]
+    def getFunctionCall(self, found_line : List[lexer.Token], found_vars : Union[List[support.VariableNode], symbol_table.Scope], line_nr : int,
+                        errors : List[support.Error]) -> Tuple[support.FunctionCall, support.VariableNode]:
+        """getFunctionCall function, creates function call node and the variable node holding its result
+
+        Args:
+            found_line (List[lexer.Token]): line to turn into function call
+            found_vars (Union[List[VariableNode], symbol_table.Scope]): already defined variables
+            line_nr (int): current line number
+            errors (List[support.Error]): list of errors, new ones are added
+
+        Returns:
+            Tuple[support.FunctionCall, support.VariableNode]: made nodes, or None's when an error is found
+        """
+        func = support.FunctionCall(found_line[1].value, line_nr, None, None, enums.token_types.VAR)
+        if found_line[3].token_type == enums.token_types.INT:
+            func.input = support.Node(support.literalValue(found_line[3].value), line_nr, found_line[3].token_type)
+        elif found_line[3].token_type == enums.token_types.STRING:
+            func.input = support.Node(found_line[3].value, line_nr, found_line[3].token_type)
+        elif found_line[3].token_type == enums.token_types.VAR:
+            temp = self.findAndReturnVar(found_vars, found_line[3].value)
+            if temp is False:
+                errors += [support.Error("var not declared", line_nr, found_line[3].position)]
+                return None, None
+            func.input = temp
+
+        output_node = support.VariableNode(found_line[5].value, support.Node(None, line_nr, None), line_nr, enums.token_types.VAR)
+        func.output = output_node
+        return func, output_node
+
+    # getVarNode :: List[lexer.Token], Union[List[support.VariableNode], symbol_table.Scope], int -> Tuple(support.VariableNode, support.Error)
+    def getVarNode(self, found_line : List[lexer.Token], found_vars : Union[List[support.VariableNode], symbol_table.Scope], line_nr : int) -> Tuple[ support.VariableNode, support.Error]:
         """getVarNode function, creates variable node
 
         Args:
             found_line (List[lexer.Token]): line to turn into variable node
-            found_vars (List[VariableNode]): already defined variables
+            found_vars (Union[List[VariableNode], symbol_table.Scope]): already defined variables
             line_nr (int): current line number
 
         Returns:
@@ -345,10 +455,10 @@ class Parser(object):
                 if check_exist_x is not False:
                     var = support.VariableNode(found_line[3].value, check_exist_x, line_nr, enums.token_types.VAR)
                 else:
-                    errors += [support.Error("Var x does not exist", line_nr)]
+                    errors += [support.Error("Var x does not exist", line_nr, found_line[1].position)]
                     return None, errors
             elif found_line[1].token_type == enums.token_types.INT:
-                var = support.VariableNode(found_line[3].value, support.Node(found_line[1].value, line_nr, enums.token_types.INT), line_nr, enums.token_types.VAR)
+                var = support.VariableNode(found_line[3].value, support.Node(support.literalValue(found_line[1].value), line_nr, enums.token_types.INT), line_nr, enums.token_types.VAR)
             elif found_line[1].token_type == enums.token_types.STRING:
                 var = support.VariableNode(found_line[3].value, support.Node(found_line[1].value, line_nr, enums.token_types.STRING), line_nr, enums.token_types.VAR)
         else:
@@ -361,10 +471,10 @@ class Parser(object):
                     check_exist_y.line_nr = line_nr
                     var = check_exist_y
                 else:
-                    errors += [support.Error("Var x does not exist", line_nr)]
+                    errors += [support.Error("Var x does not exist", line_nr, found_line[1].position)]
                     return None, errors
             elif found_line[1].token_type == enums.token_types.INT:
-                check_exist_y.value = support.Node(found_line[1].value, line_nr, enums.token_types.INT)
+                check_exist_y.value = support.Node(support.literalValue(found_line[1].value), line_nr, enums.token_types.INT)
                 check_exist_y.line_nr = line_nr
                 var = check_exist_y
             elif found_line[1].token_type == enums.token_types.STRING:
@@ -373,13 +483,13 @@ class Parser(object):
                 var = check_exist_y
         return var, errors
 
-    # getMathNode :: List[lexer.Token], List[support.VariableNode], int -> Tuple(support.MathNode, support.Error)
-    def getMathNode(self, found_line : List[lexer.Token], found_vars : List[support.VariableNode], line_nr : int) -> Tuple[support.MathNode, support.Error]:
+    # getMathNode :: List[lexer.Token], Union[List[support.VariableNode], symbol_table.Scope], int -> Tuple(support.MathNode, support.Error)
+    def getMathNode(self, found_line : List[lexer.Token], found_vars : Union[List[support.VariableNode], symbol_table.Scope], line_nr : int) -> Tuple[support.MathNode, support.Error]:
         """getMathNode function, creates math node 
 
         Args:
             found_line (List[lexer.Token]): line to turn into math node
-            found_vars (List[VariableNode]): already defined variables
+            found_vars (Union[List[VariableNode], symbol_table.Scope]): already defined variables
             line_nr (int): current line number
 
         Returns:
@@ -389,9 +499,9 @@ class Parser(object):
         if found_line[1].value == found_line[3].value:
             if (found_line[5].token_type is enums.token_types.INT):
                 var = self.findAndReturnVar(found_vars, found_line[1].value)
-                nmbr = support.Node(found_line[5].value, line_nr, found_line[5].token_type, enums.node_types.BASE)
+                nmbr = support.Node(support.literalValue(found_line[5].value), line_nr, found_line[5].token_type, enums.node_types.BASE)
                 if var == False:
-                    errors += [support.Error("unknown var", line_nr)]
+                    errors += [support.Error("unknown var", line_nr, found_line[1].position)]
                     return None, errors
                 else:
                     math = support.MathNode(var, nmbr, line_nr, found_line[4].token_type)
@@ -400,19 +510,21 @@ class Parser(object):
                 var1 = self.findAndReturnVar(found_vars, found_line[1].value)
                 var2 = self.findAndReturnVar(found_vars, found_line[5].value)
                 if var1 == False or var2 == False:
-                    errors += [support.Error("unknown var", line_nr)]
+                    errors += [support.Error("unknown var", line_nr, found_line[1].position)]
                     return None, errors
                 if var1 is not False and var2 is not False:
                     math = support.MathNode(var1, var2, line_nr, found_line[4].token_type)
                     return math, errors
+        errors += [support.Error("invalid math statement", line_nr, found_line[0].position)]
+        return None, errors
 
-    # getIfNode :: List[lexer.Token], List[support.VariableNode], int -> Tuple(support.IfNode, support.Error)
-    def getIfNode(self, found_line : List[lexer.Token], found_vars : List[support.VariableNode], line_nr : int) -> Tuple[support.IfNode, support.Error]:
+    # getIfNode :: List[lexer.Token], Union[List[support.VariableNode], symbol_table.Scope], int -> Tuple(support.IfNode, support.Error)
+    def getIfNode(self, found_line : List[lexer.Token], found_vars : Union[List[support.VariableNode], symbol_table.Scope], line_nr : int) -> Tuple[support.IfNode, support.Error]:
         """getIfNode function, creates if node 
 
         Args:
             found_line (List[lexer.Token]): line to turn into if node
-            found_vars (List[VariableNode]): already defined variables
+            found_vars (Union[List[VariableNode], symbol_table.Scope]): already defined variables
             line_nr (int): current line number
 
         Returns:
@@ -421,85 +533,126 @@ class Parser(object):
         errors = []
         check_exist_value = self.findAndReturnVar(found_vars, found_line[1].value)
         if check_exist_value == False:
-            errors += [support.Error("Variable to if on does not exist", line_nr)]
+            errors += [support.Error("Variable to if on does not exist", line_nr, found_line[1].position)]
             return None, errors
         else:
             if found_line[4].token_type == enums.token_types.VAR:
                 check_exist_condition = self.findAndReturnVar(found_vars, found_line[4].value)
                 if check_exist_condition is False:
-                    errors += [support.Error("condition does not exist", line_nr)]
+                    errors += [support.Error("condition does not exist", line_nr, found_line[4].position)]
                     return None, errors
                 else:
                     condition = support.ConditionNode(check_exist_value, check_exist_condition, line_nr, found_line[3].token_type)
             elif found_line[4].token_type == enums.token_types.INT:
-                condition = support.ConditionNode(check_exist_value, support.Node(found_line[4].value, line_nr, enums.token_types.INT), line_nr, found_line[3].token_type)
+                condition = support.ConditionNode(check_exist_value, support.Node(support.literalValue(found_line[4].value), line_nr, enums.token_types.INT), line_nr, found_line[3].token_type)
             elif found_line[4].token_type == enums.token_types.STRING:
                 condition = support.ConditionNode(check_exist_value, support.Node(found_line[4].value, line_nr, enums.token_types.STRING), line_nr, found_line[3].token_type)
 
             if found_line[6].token_type == enums.token_types.VAR:
                 check_exist_new_value = self.findAndReturnVar(found_vars, found_line[6].value)
                 if check_exist_new_value is False:
-                    errors += [support.Error("new value does not exist", line_nr)]
+                    errors += [support.Error("new value does not exist", line_nr, found_line[6].position)]
                     return None, errors
                 else:
                     new_value = check_exist_new_value
             elif found_line[6].token_type == enums.token_types.INT:
-                new_value = support.Node(found_line[6].value, line_nr, enums.token_types.INT)
+                new_value = support.Node(support.literalValue(found_line[6].value), line_nr, enums.token_types.INT)
             elif found_line[6].token_type == enums.token_types.STRING:
                 new_value = support.Node(found_line[6].value, line_nr, enums.token_types.STRING)
 
+            new_value_false = None
             if len(found_line) == 9:
                 if found_line[7].token_type == enums.token_types.ELSE:
                     if found_line[8].token_type == enums.token_types.VAR:
                         check_exist_new_value_false = self.findAndReturnVar(found_vars, found_line[8].value)
                         if check_exist_new_value_false is False:
-                            errors += [support.Error("new value does not exist", line_nr)]
+                            errors += [support.Error("new value does not exist", line_nr, found_line[8].position)]
                             return None, errors
                         else:
                             new_value_false = check_exist_new_value_false
                     elif found_line[8].token_type == enums.token_types.INT:
-                        new_value_false = support.Node(found_line[8].value, line_nr, enums.token_types.INT)
+                        new_value_false = support.Node(support.literalValue(found_line[8].value), line_nr, enums.token_types.INT)
                     elif found_line[8].token_type == enums.token_types.STRING:
                         new_value_false = support.Node(found_line[8].value, line_nr, enums.token_types.STRING)
             
             var = support.IfNode(check_exist_value, condition, new_value, new_value_false, line_nr, enums.token_types.IF)
         return var, errors
 
-    # getLine :: List[lexer.Token], List[lexer.Token] -> List[lexer.Token]
-    def getLine(self, tokens : List[lexer.Token], line : List[lexer.Token]=[]) -> List[lexer.Token]:
+    # readLine :: Union[List[lexer.Token], lexer.TokenStream], int -> List[lexer.Token]
+    def readLine(self, tokens : Union[List[lexer.Token], lexer.TokenStream], start : int) -> List[lexer.Token]:
+        """readLine function, the token at start and the rest of its line
+
+        Args:
+            tokens (Union[List[lexer.Token], lexer.TokenStream]): all found tokens
+            start (int): index of the first token of the line
+
+        Returns:
+            List[lexer.Token]: found line, the first token and al tokens after it up until the next FROM
+        """
+        if type(tokens) is lexer.TokenStream:
+            return tokens.tokens(start, tokens.lineEnd(start + 1))
+        return [tokens[start]] + self.getLine(tokens, start + 1)
+
+    # getLine :: List[lexer.Token], int -> List[lexer.Token]
+    def getLine(self, tokens : Union[List[lexer.Token], lexer.TokenStream], start : int = 0) -> List[lexer.Token]:
         """getLine function, find a line from list of tokens
 
         Args:
-            tokens (List[lexer.Token]): all found tokens
-            line (List[lexer.Token], optional): line of tokens that is found. Defaults to [].
+            tokens (Union[List[lexer.Token], lexer.TokenStream]): all found tokens
+            start (int, optional): index of the first token of the line. Defaults to 0.
 
         Returns:
-            List[lexer.Token]: found line
+            List[lexer.Token]: found line, al tokens up until the next FROM
         """        
-        
-        if len(tokens) == 0:
-            return []
-        head, *tail = tokens 
-        if head.token_type != enums.token_types.FROM:
-            return [head] + self.getLine(tail)
-        return []
-
-    # findAndReturnVar :: List[support.VariableNode], str -> Union(support.VariableNode, bool)
-    def findAndReturnVar(self,  search_area : List[support.VariableNode], value_to_find : str ) -> Union[support.VariableNode, bool]:
-        """findAndReturnVar function, find a variable in list by name
+        if type(tokens) is lexer.TokenStream:
+            return tokens.tokens(start, tokens.lineEnd(start))
+        line = []
+        for index in range(start, len(tokens)):
+            token = tokens[index]
+            if token.token_type == enums.token_types.FROM:
+                break
+            line.append(token)
+        return line
+
+    # findAndReturnVar :: Union[List[support.VariableNode], symbol_table.Scope], str -> Union(support.VariableNode, bool)
+    def findAndReturnVar(self,  search_area : Union[List[support.VariableNode], symbol_table.Scope], value_to_find : str ) -> Union[support.VariableNode, bool]:
+        """findAndReturnVar function, find a variable by name
 
         Args:
-            search_area (List[VariableNode]): list of variable nodes
+            search_area (Union[List[VariableNode], symbol_table.Scope]): scope or list of variable nodes
             value_to_find (str): variable name to find
 
         Returns:
-            Union[VariableNode, bool]: copy of found variable or False
+            Union[VariableNode, bool]: copy of the first definition of the variable or False
         """        
-        if not search_area:
-            return False
-        head, *tail = search_area
-        if head.variable_name == value_to_find:
-            return copy.copy(head)
-        return self.findAndReturnVar( tail, value_to_find)
-
-
+        if isinstance(search_area, symbol_table.Scope):
+            found = search_area.lookup(value_to_find)
+            if found is None:
+                return False
+            return found
+        for variable in search_area:
+            if variable.variable_name == value_to_find:
+                return copy.copy(variable)
+        return False
+
+# parseFunctionBlock :: str, int, Tuple[Tuple[str, int]], lexer.TokenStream -> Tuple[Union[support.FunctionNode, None], List[support.Error], symbol_table.Scope]
+def parseFunctionBlock(function_name : str, line_nr : int, declared : Tuple[Tuple[str, int]], body : lexer.TokenStream) -> Tuple[Union[support.FunctionNode, None], List[support.Error], symbol_table.Scope]:
+    """parseFunctionBlock function, parses one function body on its own, used as process pool job by Parser.parseParallel
+
+    Args:
+        function_name (str): name of the function
+        line_nr (int): line number of the main code at the start of the body
+        declared (Tuple[Tuple[str, int]]): name and declaration line number of the functions declared before the body
+        body (lexer.TokenStream): tokens of the body, including the END line
+
+    Returns:
+        Tuple[Union[support.FunctionNode, None], List[support.Error], symbol_table.Scope]: parsed function or None, errors and the scope of the body
+    """
+    found_funcs = {name : support.FunctionNode(name, declare_line_nr, [], [], enums.token_types.FUNCTION) for name, declare_line_nr in declared}
+    function = found_funcs[function_name]
+    block_parser = Parser()
+    tree, found_funcs = block_parser.parse(body, line_nr, found_funcs=found_funcs, tree=[function], state=enums.parser_states.FUNCTION)
+    scope = block_parser.symbol_table.openScope(function_name)
+    if len(tree) > 0 and type(tree[0]) == support.Error:
+        return None, tree, scope
+    return function, [], scope
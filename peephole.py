@@ -0,0 +1,223 @@
+from typing import List, Set, Union
+
+import enums
+import support
+import vm
+
+class BranchNode(support.Node):
+    """BranchNode class, inherits from Node, an if statement and the LINE jump on its variable after it as one conditional jump
+
+    Made by fuseBranches, the LINE statement stays in the code block after it, so al other
+    jumps land on the same statements as before.
+    """
+    def __init__(self, node : support.IfNode, line : support.VariableNode, target_true : int, target_false : int):
+        """__init__ for BranchNode
+
+        Args:
+            node (support.IfNode): the fused if statement
+            line (support.VariableNode): the LINE statement after it
+            target_true (int): index of the statement the jump lands on when the condition holds
+            target_false (int): index of the statement the jump lands on when it does not
+        """
+        super().__init__(node.value, node.line_nr, enums.token_types.IF, enums.node_types.BRANCH)
+        self.condition = node.condition
+        self.line = line
+        self.target_true = target_true
+        self.target_false = target_false
+        self.jump_true = node.new_value_true.value
+        self.jump_false = node.new_value_false.value
+
+    def __str__(self) -> str:
+        return '[{line_nr}] BranchNode(condition: {condition}, -> {jump_true} OR {jump_false})'.format(
+            line_nr = self.line_nr,
+            condition = self.condition.__repr__(),
+            jump_true = self.jump_true,
+            jump_false = self.jump_false
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+# operandName :: support.Node -> Union[str, None]
+def operandName(node : support.Node) -> Union[str, None]:
+    """operandName function, name of the variable an operand reads
+
+    Args:
+        node (support.Node): operand of a statement
+
+    Returns:
+        Union[str, None]: name of the variable, None for a literal
+    """
+    if isinstance(node, support.VariableNode):
+        return node.variable_name
+    if node is not None and node.token_type == enums.token_types.INPUT:
+        return "INPUT"
+    return None
+
+# readVariables :: support.Node -> Set[str]
+def readVariables(node : support.Node) -> Set[str]:
+    """readVariables function, names of the variables a statement reads
+
+    Args:
+        node (support.Node): statement of a code block
+
+    Returns:
+        Set[str]: names of the read variables
+    """
+    if type(node) is support.MathNode:
+        operands = [node.value, node.rhs]
+    elif type(node) is support.IfNode:
+        operands = [node.value, node.condition.value, node.condition.condition, node.new_value_true, node.new_value_false]
+    elif type(node) is support.FunctionCall:
+        operands = [node.input]
+    elif node.token_type == enums.token_types.DECLARE or node.token_type == enums.token_types.ERR:
+        operands = []
+    else:
+        operands = [node.value]
+    return {name for name in map(operandName, operands) if name is not None}
+
+# killedVariables :: support.Node -> Set[str]
+def killedVariables(node : support.Node) -> Set[str]:
+    """killedVariables function, names of the variables a statement always overwrites
+
+    Giving a literal to a variable that has a value does nothing, so only a copy of another variable
+    and the output of a function call count.
+
+    Args:
+        node (support.Node): statement of a code block
+
+    Returns:
+        Set[str]: names of the overwritten variables
+    """
+    if type(node) is support.FunctionCall:
+        return {node.output.variable_name}
+    if type(node) is support.VariableNode and node.token_type in (enums.token_types.VAR, enums.token_types.INPUT, enums.token_types.OUTPUT) \
+            and operandName(node.value) is not None:
+        return {node.variable_name}
+    return set()
+
+# branchJumps :: List[support.Node], int -> Union[List[int], None]
+def branchJumps(node_list : List[support.Node], index : int) -> Union[List[int], None]:
+    """branchJumps function, the jumps of an if statement followed by a LINE jump on its variable
+
+    Only an if statement with a literal int in both branches qualifies, on a condition that always
+    picks a branch: comparing text with < or > leaves the variable unchanged.
+
+    Args:
+        node_list (List[support.Node]): statements of the code block
+        index (int): index of the LINE statement
+
+    Returns:
+        Union[List[int], None]: jump of the true and the false branch, None when the statements are no such pair
+    """
+    line = node_list[index]
+    node = node_list[index - 1] if index > 0 else None
+    if type(node) is not support.IfNode or operandName(line.value) != node.value.variable_name:
+        return None
+    new_values = [node.new_value_true, node.new_value_false]
+    if any(type(new_value) is not support.Node or type(new_value.value) is not int for new_value in new_values):
+        return None
+    condition = node.condition
+    if condition.token_type not in (enums.token_types.EQUAL, enums.token_types.NOTEQUAL) and \
+            type(condition.value.value) is not int and type(condition.condition.value) is not int:
+        return None
+    return [new_value.value for new_value in new_values]
+
+# successors :: List[support.Node] -> Union[List[List[int]], None]
+def successors(node_list : List[support.Node]) -> Union[List[List[int]], None]:
+    """successors function, the statements that can run after every statement of a code block
+
+    Args:
+        node_list (List[support.Node]): statements of the code block
+
+    Returns:
+        Union[List[List[int]], None]: indexes of the next statements per statement, the length of the block
+        for its end, None when a LINE jump goes to a place only known while running
+    """
+    program_length = len(node_list)
+    following = []
+    for index, node in enumerate(node_list):
+        if node.token_type == enums.token_types.ERR:
+            following.append([])
+        elif node.token_type == enums.token_types.LINE:
+            if node.value.token_type == enums.token_types.INT and type(node.value.value) is int:
+                jumps = [node.value.value]
+            else:
+                jumps = branchJumps(node_list, index)
+            if jumps is None:
+                return None
+            following.append([vm.jumpTarget(index, jump, program_length) for jump in jumps])
+        else:
+            following.append([index + 1])
+    # a LINE jump on a variable that is reached from anywhere but its if statement jumps by an unknown value
+    for index, next_statements in enumerate(following):
+        for next_statement in next_statements:
+            if next_statement < program_length and node_list[next_statement].token_type == enums.token_types.LINE \
+                    and operandName(node_list[next_statement].value) is not None and next_statement != index + 1:
+                return None
+    return following
+
+# liveVariables :: List[support.Node], List[List[int]], Set[str] -> List[Set[str]]
+def liveVariables(node_list : List[support.Node], following : List[List[int]], live_at_end : Set[str]) -> List[Set[str]]:
+    """liveVariables function, the variables whose value can still be read when a statement starts
+
+    Args:
+        node_list (List[support.Node]): statements of the code block
+        following (List[List[int]]): next statements per statement, from successors
+        live_at_end (Set[str]): variables read after the code block ends
+
+    Returns:
+        List[Set[str]]: live variables per statement, with the ones at the end as last entry
+    """
+    reads = [readVariables(node) for node in node_list]
+    kills = [killedVariables(node) for node in node_list]
+    live = [set() for _ in node_list] + [live_at_end]
+    changed = True
+    while changed:
+        changed = False
+        for index in reversed(range(len(node_list))):
+            live_after = set().union(*(live[next_statement] for next_statement in following[index]))
+            live_before = reads[index] | (live_after - kills[index])
+            if live_before != live[index]:
+                live[index] = live_before
+                changed = True
+    return live
+
+# fuseBranches :: List[support.Node], bool -> List[support.Node]
+def fuseBranches(node_list : List[support.Node], function : bool = False) -> List[support.Node]:
+    """fuseBranches function, replaces every if statement followed by a LINE jump on its variable by a BranchNode
+
+    A pair is only fused when no statement can read the variable after the jump, the
+    branch value it would get is never seen then. The main code ends with al its
+    variables read, a function with only its OUTPUT read.
+
+    Args:
+        node_list (List[support.Node]): statements of the code block
+        function (bool, optional): True when the statements are a function body. Defaults to False.
+
+    Returns:
+        List[support.Node]: statements of the code block with the fused pairs, the same amount as before
+    """
+    following = successors(node_list)
+    if following is None:
+        return node_list
+    if function:
+        live_at_end = {"OUTPUT"}
+    else:
+        live_at_end = set().union(*map(readVariables, node_list), *map(killedVariables, node_list))
+    live = liveVariables(node_list, following, live_at_end)
+    program_length = len(node_list)
+    fused = list(node_list)
+    for index, node in enumerate(node_list):
+        if node.token_type != enums.token_types.LINE:
+            continue
+        jumps = branchJumps(node_list, index)
+        if jumps is None:
+            continue
+        targets = following[index]
+        if any(target >= program_length or node_list[target].line_nr != node.line_nr + jump for target, jump in zip(targets, jumps)):
+            continue
+        if any(operandName(node.value) in live[target] for target in targets):
+            continue
+        fused[index - 1] = BranchNode(node_list[index - 1], node, *targets)
+    return fused
@@ -0,0 +1,190 @@
+from typing import Tuple, Callable
+import collections
+import json
+import time
+
+import support
+
+# classes of the statements Visitor.visitAl runs, their visit methods are swapped while profiling
+statement_classes = [support.VariableNode, support.MathNode, support.IfNode, support.FunctionCall]
+
+class Profiler(object):
+    """Profiler class, execution count and wall time per line and per function of the tree engine
+
+    install swaps the visit methods that Visitor.visitAl dispatches to for timed ones and
+    uninstall puts the originals back, so a Visitor without a profiler runs the same code as
+    before. Operands are visited through the same methods, only the outermost visit of a
+    statement counts and the INPUT assignment of a call only counts in the time of the
+    function. Time of a line or function that is already running, in a recursive call, is
+    only counted once.
+    """
+    def __init__(self):
+        # (function, line_nr) -> [count, seconds]
+        self.lines = {}
+        # function -> [calls, seconds]
+        self.functions = {}
+        self.originals = {}
+        self.stack = ["main"]
+        self.active = collections.Counter()
+        self.in_statement = False
+
+    def __str__(self) -> str:
+        return 'Profiler({lines} lines, {functions} functions{installed})'.format(
+            lines = len(self.lines),
+            functions = len(self.functions),
+            installed = ", installed" if self.originals else ""
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, exception_type, exception, traceback) -> None:
+        self.uninstall()
+
+    # install :: -> None
+    def install(self) -> None:
+        if self.originals:
+            return
+        for node_class in statement_classes:
+            self.originals[node_class] = node_class.__dict__["visit"]
+            node_class.visit = self.statementVisit(node_class.__dict__["visit"])
+        self.originals[support.FunctionNode] = support.FunctionNode.__dict__["visit"]
+        support.FunctionNode.visit = self.functionVisit(support.FunctionNode.__dict__["visit"])
+
+    # uninstall :: -> None
+    def uninstall(self) -> None:
+        for node_class, visit in self.originals.items():
+            node_class.visit = visit
+        self.originals = {}
+
+    # record :: dict, Tuple, float -> None
+    def record(self, table : dict, key : Tuple, elapsed : float) -> None:
+        self.active[key] -= 1
+        entry = table.get(key)
+        if entry is None:
+            entry = table[key] = [0, 0.0]
+        entry[0] += 1
+        if self.active[key] == 0:
+            entry[1] += elapsed
+
+    # statementVisit :: Callable -> Callable
+    def statementVisit(self, visit : Callable) -> Callable:
+        """statementVisit function, visit method that times the statement it runs
+
+        Args:
+            visit (Callable): original visit method of the statement class
+
+        Returns:
+            Callable: timed visit method
+        """
+        profiler = self
+        def timedVisit(node : support.Node, variables : dict, found_funcs : dict = {}):
+            # the INPUT assignment Visitor.visitFunction puts before the body has the line of the first statement
+            if profiler.in_statement or (type(node) is support.VariableNode and node.variable_name == "INPUT"):
+                return visit(node, variables, found_funcs)
+            key = (profiler.stack[-1], node.line_nr)
+            profiler.active[key] += 1
+            profiler.in_statement = True
+            start = time.perf_counter()
+            try:
+                return visit(node, variables, found_funcs)
+            finally:
+                elapsed = time.perf_counter() - start
+                profiler.in_statement = False
+                profiler.record(profiler.lines, key, elapsed)
+        return timedVisit
+
+    # functionVisit :: Callable -> Callable
+    def functionVisit(self, visit : Callable) -> Callable:
+        """functionVisit function, visit method of FunctionNode that counts the call and times the body
+
+        The statements of the body are profiled as lines of the function.
+
+        Args:
+            visit (Callable): original visit method of FunctionNode
+
+        Returns:
+            Callable: timed visit method
+        """
+        profiler = self
+        def timedVisit(node : support.FunctionNode, input : support.Node, variables : dict, found_funcs : dict = {}):
+            in_statement = profiler.in_statement
+            key = node.value
+            profiler.in_statement = False
+            profiler.stack.append(key)
+            profiler.active[key] += 1
+            start = time.perf_counter()
+            try:
+                return visit(node, input, variables, found_funcs)
+            finally:
+                elapsed = time.perf_counter() - start
+                profiler.stack.pop()
+                profiler.in_statement = in_statement
+                profiler.record(profiler.functions, key, elapsed)
+        return timedVisit
+
+    # clear :: -> None
+    def clear(self) -> None:
+        self.lines = {}
+        self.functions = {}
+        self.active.clear()
+
+    # dump :: -> dict
+    def dump(self) -> dict:
+        """dump function, the measurements as plain data, sorted from most to least time
+
+        Returns:
+            dict: lines with function, line, count and seconds, functions with function, calls and seconds
+        """
+        lines = sorted(self.lines.items(), key=lambda item: item[1][1], reverse=True)
+        functions = sorted(self.functions.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            "lines" : [{"function" : function, "line" : line_nr, "count" : count, "seconds" : seconds}
+                       for (function, line_nr), (count, seconds) in lines],
+            "functions" : [{"function" : function, "calls" : calls, "seconds" : seconds}
+                           for function, (calls, seconds) in functions],
+        }
+
+    # writeJson :: str -> None
+    def writeJson(self, file_name : str) -> None:
+        with open(file_name, "w") as json_file:
+            json.dump(self.dump(), json_file, indent=2)
+
+    # report :: int -> str
+    def report(self, limit : int = 20) -> str:
+        """report function, text table of the hottest lines and al functions
+
+        Args:
+            limit (int, optional): amount of lines in the table, 0 for al of them. Defaults to 20.
+
+        Returns:
+            str: the report
+        """
+        data = self.dump()
+        # the lines of the main code add up to the time of the whole program
+        total = sum(entry["seconds"] for entry in data["lines"] if entry["function"] == "main")
+        lines = data["lines"][:limit] if limit else data["lines"]
+        report = ['{function:20} {line:>5} {count:>10} {seconds:>12} {per_run:>10} {share:>7}'.format(
+            function = "function", line = "line", count = "count", seconds = "seconds", per_run = "us/run", share = "%")]
+        for entry in lines:
+            report.append('{function:20} {line:5} {count:10} {seconds:12.6f} {per_run:10.2f} {share:6.1f}%'.format(
+                function = entry["function"],
+                line = entry["line"],
+                count = entry["count"],
+                seconds = entry["seconds"],
+                per_run = entry["seconds"] / entry["count"] * 1000000,
+                share = entry["seconds"] / total * 100 if total else 0.0
+            ))
+        report.append("")
+        report.append('{function:20} {calls:>10} {seconds:>12}'.format(function = "function", calls = "calls", seconds = "seconds"))
+        for entry in data["functions"]:
+            report.append('{function:20} {calls:10} {seconds:12.6f}'.format(
+                function = entry["function"],
+                calls = entry["calls"],
+                seconds = entry["seconds"]
+            ))
+        return "\n".join(report)
@@ -0,0 +1,41 @@
+import hashlib
+
+import enums
+import memo
+
+# python function and operator of every math and condition token, the function is used when the values are not both ints
+math_operators = {
+    enums.token_types.ADD : ("add", "+"),
+    enums.token_types.SUB : ("sub", "-"),
+    enums.token_types.MUL : ("mul", "*"),
+    enums.token_types.DIV : ("divide", None),
+}
+
+condition_operators = {
+    enums.token_types.GREATER : ("gt", ">"),
+    enums.token_types.SMALLER : ("lt", "<"),
+    enums.token_types.EQUAL : ("eq", "=="),
+    enums.token_types.EQUALGREATER : ("ge", ">="),
+    enums.token_types.EQUALSMALLER : ("le", "<="),
+    enums.token_types.NOTEQUAL : ("ne", "!="),
+}
+
+# code objects of generated sources by the hash of the source
+code_cache = memo.LRUCache(256)
+
+# compileSource :: str -> CodeType
+def compileSource(source : str):
+    """compileSource function, python code object of a generated source, compiled once per distinct source
+
+    Args:
+        source (str): generated python source
+
+    Returns:
+        CodeType: code object that defines the functions of the program
+    """
+    key = hashlib.sha256(source.encode()).hexdigest()
+    code = code_cache.get(key)
+    if code is None:
+        code = compile(source, "<fhtt " + key[:12] + ">", "exec")
+        code_cache.put(key, code)
+    return code
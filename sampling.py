@@ -0,0 +1,104 @@
+from typing import List
+import collections
+import signal
+
+import support
+
+# timer and signal per clock a sampler can sample by, wall time counts the time the program waits too
+clocks = {
+    "wall" : ("ITIMER_REAL", "SIGALRM"),
+    "cpu" : ("ITIMER_PROF", "SIGPROF"),
+}
+
+class StackSampler(object):
+    """StackSampler class, counts how often every chain of guest function calls is running
+
+    The Interpreter hands it its call stack every so many statements, or a timer interrupts
+    the Interpreter every so many seconds of wall clock or cpu time. The counts come out as
+    collapsed stacks, one "main;fib;fib 1234" line per chain, the input format of flamegraph.pl
+    and the tools that read the same format.
+    """
+    def __init__(self, every : int = None, interval : float = None, clock : str = "wall"):
+        """__init__ for StackSampler
+
+        Args:
+            every (int, optional): statements between two samples. Defaults to None.
+            interval (float, optional): seconds between two samples, used when every is not given. Defaults to 0.001.
+            clock (str, optional): "wall" or "cpu", the time the interval counts. Defaults to "wall".
+        """
+        self.every = every
+        self.interval = 0.001 if every is None and interval is None else interval
+        self.clock = clock
+        self.samples = collections.Counter()
+        self.code = None
+        self.previous_handler = None
+
+    def __str__(self) -> str:
+        return 'StackSampler({amount} samples, {every})'.format(
+            amount = sum(self.samples.values()),
+            every = str(self.every) + " statements" if self.every else str(self.interval) + " seconds of " + self.clock + " time"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # sample :: list, support.FunctionNode -> None
+    def sample(self, stack : list, function : support.FunctionNode) -> None:
+        """sample function, counts the chain of calls that is running
+
+        Args:
+            stack (list): call stack of Interpreter.execute, the function of every waiting caller is its fourth item
+            function (support.FunctionNode): function that is running, None in the main code
+        """
+        names = ["main"]
+        names += [entry[3].value for entry in stack if entry[3] is not None]
+        if function is not None:
+            names.append(function.value)
+        self.samples[tuple(names)] += 1
+
+    # start :: CodeType -> None
+    def start(self, code) -> None:
+        """start function, starts the timer of the clock when the sampler samples by time
+
+        Args:
+            code (CodeType): code of Interpreter.execute, the timer reads the call stack from its locals
+        """
+        if self.every or not self.interval or not hasattr(signal, "setitimer"):
+            return
+        timer, signal_name = clocks[self.clock]
+        self.code = code
+        self.previous_handler = signal.signal(getattr(signal, signal_name), self.interrupt)
+        signal.setitimer(getattr(signal, timer), self.interval, self.interval)
+
+    # stop :: -> None
+    def stop(self) -> None:
+        if self.code is None:
+            return
+        timer, signal_name = clocks[self.clock]
+        signal.setitimer(getattr(signal, timer), 0)
+        signal.signal(getattr(signal, signal_name), self.previous_handler)
+        self.code = None
+
+    # interrupt :: int, FrameType -> None
+    def interrupt(self, signal_number : int, frame) -> None:
+        while frame is not None and frame.f_code is not self.code:
+            frame = frame.f_back
+        if frame is None:
+            return
+        variables = frame.f_locals
+        self.sample(variables["stack"], variables["function"])
+
+    # collapsed :: -> List[str]
+    def collapsed(self) -> List[str]:
+        """collapsed function, the samples as collapsed stack lines
+
+        Returns:
+            List[str]: "main;fib;fib 1234" per chain of calls, sorted by the chain
+        """
+        return [";".join(names) + " " + str(count) for names, count in sorted(self.samples.items())]
+
+    # writeCollapsed :: str -> None
+    def writeCollapsed(self, file_name : str) -> None:
+        with open(file_name, "w") as collapsed_file:
+            for line in self.collapsed():
+                collapsed_file.write(line + "\n")
@@ -0,0 +1,164 @@
+from typing import List, Union, BinaryIO, TextIO
+import contextlib
+import struct
+import sys
+
+class Sink(object):
+    """Sink class, where the values of OUT statements go, prints them by default"""
+    def __init__(self):
+        self.written = 0
+
+    def __str__(self) -> str:
+        return '{name}({written} values)'.format(
+            name = type(self).__name__,
+            written = self.written
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # write :: Union[int, str] -> None
+    def write(self, value : Union[int, str]) -> None:
+        self.written += 1
+        print(value)
+
+    # flush :: -> None
+    def flush(self) -> None:
+        pass
+
+class BufferedSink(Sink):
+    """BufferedSink class, collects the printed lines and writes them to the stream in large blocks"""
+    def __init__(self, stream : TextIO = None, buffer_size : int = 64 * 1024):
+        """__init__ for BufferedSink
+
+        Args:
+            stream (TextIO, optional): stream to write to. Defaults to sys.stdout at the time the sink is made.
+            buffer_size (int, optional): amount of characters collected before they are written. Defaults to 64 KiB.
+        """
+        super().__init__()
+        self.stream = sys.stdout if stream is None else stream
+        self.buffer_size = buffer_size
+        self.lines = []
+        self.size = 0
+
+    # write :: Union[int, str] -> None
+    def write(self, value : Union[int, str]) -> None:
+        line = str(value) + "\n"
+        self.lines.append(line)
+        self.size += len(line)
+        self.written += 1
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    # flush :: -> None
+    def flush(self) -> None:
+        if self.lines:
+            self.stream.write("".join(self.lines))
+            self.lines = []
+            self.size = 0
+        self.stream.flush()
+
+class ListSink(Sink):
+    """ListSink class, keeps the values in memory, for running a program from other code"""
+    def __init__(self):
+        super().__init__()
+        self.values = []
+
+    # write :: Union[int, str] -> None
+    def write(self, value : Union[int, str]) -> None:
+        self.values.append(value)
+        self.written += 1
+
+    # lines :: -> List[str]
+    def lines(self) -> List[str]:
+        return [str(value) for value in self.values]
+
+class BinarySink(Sink):
+    """BinarySink class, writes every value as its utf-8 text after a 4 byte big endian length"""
+    def __init__(self, stream : BinaryIO = None):
+        """__init__ for BinarySink
+
+        Args:
+            stream (BinaryIO, optional): binary stream to write to. Defaults to the buffer of sys.stdout at the time the sink is made.
+        """
+        super().__init__()
+        self.stream = sys.stdout.buffer if stream is None else stream
+
+    # write :: Union[int, str] -> None
+    def write(self, value : Union[int, str]) -> None:
+        data = str(value).encode("utf-8")
+        self.stream.write(struct.pack(">I", len(data)) + data)
+        self.written += 1
+
+    # flush :: -> None
+    def flush(self) -> None:
+        self.stream.flush()
+
+class NullSink(Sink):
+    """NullSink class, throws the values away and only counts them, for benchmarking"""
+    # write :: Union[int, str] -> None
+    def write(self, value : Union[int, str]) -> None:
+        self.written += 1
+
+# readBinary :: BinaryIO -> List[str]
+def readBinary(stream : BinaryIO) -> List[str]:
+    """readBinary function, reads back the values written by a BinarySink
+
+    Args:
+        stream (BinaryIO): stream to read from
+
+    Returns:
+        List[str]: text of the values in the order they were written
+    """
+    values = []
+    while True:
+        header = stream.read(4)
+        if len(header) < 4:
+            return values
+        values.append(stream.read(struct.unpack(">I", header)[0]).decode("utf-8"))
+
+# sinks OUT statements write to, the last one is used
+active_sinks = []
+
+# current :: -> Sink
+def current() -> Sink:
+    if active_sinks:
+        return active_sinks[-1]
+    return default_sink
+
+# redirect :: Sink -> contextlib.AbstractContextManager
+@contextlib.contextmanager
+def redirect(sink : Sink):
+    """redirect function, sends the values of OUT statements to a sink while the with block runs, then flushes it
+
+    Args:
+        sink (Sink): sink to use
+    """
+    active_sinks.append(sink)
+    try:
+        yield sink
+    finally:
+        active_sinks.pop()
+        sink.flush()
+
+# makeSink :: str -> Sink
+def makeSink(name : str) -> Sink:
+    """makeSink function, sink by the name used on the command line
+
+    Args:
+        name (str): stdout, buffered, binary, list or null
+
+    Returns:
+        Sink: new sink
+    """
+    return sink_types[name]()
+
+sink_types = {
+    "stdout" : Sink,
+    "buffered" : BufferedSink,
+    "binary" : BinarySink,
+    "list" : ListSink,
+    "null" : NullSink,
+}
+
+default_sink = Sink()
@@ -4,20 +4,32 @@ import operator
 import copy
 
 import enums
+import sinks
 
 class Error(object):
     """Error class, inherits from object class"""    
-    def __init__(self, message, line_nr):
+    def __init__(self, message, line_nr, position=None, steps=None):
         """__init__ for Error
 
         Args:
             message (str): Message to display with error
             line_nr (int): line number on which the error occurs
+            position (Tuple[int, int], optional): (line, column) in the source file. Defaults to None.
+            steps (int, optional): amount of statements that ran, for a run that used up its budget or deadline. Defaults to None.
         """        
         self.message = message
         self.line_nr = line_nr
+        self.position = position
+        self.steps = steps
 
     def __str__(self) -> str:   
+        if self.position is not None:
+            return 'ERROR:{line_nr}: {message} (line {line}, column {column})'.format(
+                message = self.message,
+                line_nr = self.line_nr,
+                line = self.position[0],
+                column = self.position[1]
+            )
         return 'ERROR:{line_nr}: {message}'.format(
             message = self.message,
             line_nr = self.line_nr
@@ -26,6 +38,14 @@ class Error(object):
     def __repr__(self) -> str:    
         return self.__str__()
 
+class Diagnostic(Error):
+    """Diagnostic class, inherits from Error, a warning that does not stop the program"""
+    def __str__(self) -> str:
+        return 'WARNING:{line_nr}: {message}'.format(
+            message = self.message,
+            line_nr = self.line_nr
+        )
+
 # base node / literal node
 lit_types = TypeVar('lit_types', int, str)
 class Node(object):
@@ -71,6 +91,7 @@ class VariableNode(Node):
         """        
         super().__init__(value, line_nr, token_type, node_type)
         self.variable_name = variable_name
+        self.slot = None # index in the frame of its code block, set by symbol_table.resolveSlots
 
     def __str__(self) -> str:
         return '[{line_nr}] {variable_name}={value}'.format(
@@ -252,6 +273,24 @@ class FunctionCall(Node):
         visitor = Visitor()
         return visitor.visitFunctionCall(self, variables, found_funcs)
 
+# literalValue :: lit_types -> lit_types
+def literalValue(value : lit_types) -> lit_types:
+    """literalValue function, native value of an int literal, so the conversion is done once when it is parsed
+
+    Args:
+        value (lit_types): text of the literal
+
+    Returns:
+        lit_types: int when the text is written as an int, the text itself otherwise so it prints the same
+    """
+    try:
+        number = int(str(value))
+    except ValueError:
+        return value
+    if str(number) == str(value):
+        return number
+    return value
+
 def smart_divide(func : Callable[[int,int], int]):
     def inner_divide(lhs,rhs):
         if lhs == 0:
@@ -272,44 +311,58 @@ class Visitor(object):
     node_types = TypeVar(Node, VariableNode, MathNode, ConditionNode, IfNode)
     # visitAl :: List[Node], List[Node], dict, dict -> Union(Error,dict)
     def visitAl(self, node_list : List[Node], node_list_copy : List[Node], variables : dict={}, found_funcs : dict = {}) -> Union[Error,dict]:
+        """visitAl function, runs a list of statements with a program counter over the full list
+
+        A LINE statement moves the program counter relative to itself, so jumps cost the same
+        however long the program is and loops can run any number of times.
 
-        if len(node_list) == 0:
-            return variables
-        head, *tail = node_list
+        Args:
+            node_list (List[Node]): statements to run, a tail of node_list_copy
+            node_list_copy (List[Node]): full list of statements, backwards jumps can land before node_list
+            variables (dict, optional): variables at the start. Defaults to {}.
+            found_funcs (dict, optional): al found functions. Defaults to {}.
+
+        Returns:
+            Union[Error,dict]: the first error or the variables after the last statement
+        """
+        program_counter = len(node_list_copy) - len(node_list)
+        program_length = len(node_list_copy)
         variables_copy = copy.copy(variables)
 
-        if head.token_type == enums.token_types.LINE:
-            start_line, variables_copy = head.visit(variables_copy, found_funcs)
-            if type(start_line) is Error:
-                return start_line
-            if start_line is Node:
-                start_line, variables_copy = start_line.visit(variables_copy, found_funcs)
-            start_line = str(start_line)
-            if not start_line.isnumeric():
-                just_number = start_line.lstrip("-")
-                if just_number.isnumeric():
-                    start_line = int(start_line)
+        while program_counter < program_length:
+            head = node_list_copy[program_counter]
+            if head.token_type == enums.token_types.LINE:
+                start_line, variables_copy = head.visit(variables_copy, found_funcs)
+                if type(start_line) is Error:
+                    return start_line
+                start_line = str(start_line)
+                if not start_line.isnumeric():
+                    just_number = start_line.lstrip("-")
+                    if not just_number.isnumeric():
+                        error = Error("Line number to jump to not int", head.line_nr)
+                        return error
+                start_line = int(start_line)
+                if start_line >= 0:
+                    remaining = program_length - program_counter - 1
+                    if start_line > remaining:
+                        program_counter = program_length
+                    elif start_line == 0:
+                        # a jump of 0 lines only runs the last statement
+                        program_counter = program_length - 1 if remaining > 0 else program_length
+                    else:
+                        program_counter += start_line
                 else:
-                    error = Error("Line number to jump to not int", head.line_nr)
-                    return error
-            if int(start_line) >= 0:
-                if int(start_line) <= len(tail):
-                    start_line = int(start_line) - 1
-                    tail = copy.copy(tail[int(start_line):])
-                elif int(start_line)-1 == 0:
-                    tail = copy.copy(tail[1:])
-                else:
-                    tail= []
-                return self.visitAl(tail, node_list_copy, variables_copy, found_funcs)
+                    # same landing place as slicing the full list from the jump target
+                    program_counter += start_line
+                    if program_counter < 0:
+                        program_counter = max(program_length + program_counter, 0)
             else:
-                current_index = len(node_list_copy)-len(node_list)
-                tail = node_list_copy[current_index + start_line:]
-        else:
-            pos_error, variables_copy = head.visit(variables_copy, found_funcs)
-            if type(pos_error) is Error:
-                return pos_error
-        return self.visitAl(tail, node_list_copy, variables_copy, found_funcs)
-        
+                pos_error, variables_copy = head.visit(variables_copy, found_funcs)
+                if type(pos_error) is Error:
+                    return pos_error
+                program_counter += 1
+        return variables_copy
+
     # visitNode :: Node, dict, dict -> Tuple[Union[Error,lit_types], dict]
     def visitNode(self, node : Node, variables: dict , found_funcs : dict = {} ) -> Tuple[Union[Error,lit_types], dict]:
         copy_node = copy.copy(node)
@@ -356,7 +409,7 @@ class Visitor(object):
                 printable, variables_copy = copy_node.value.visit(variables_copy, found_funcs)
                 if type(printable) is Error:
                     return printable, variables_copy
-            print(printable)
+            sinks.current().write(printable)
             return printable, variables_copy
 
         elif copy_node.token_type == enums.token_types.LINE:
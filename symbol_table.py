@@ -0,0 +1,227 @@
+from typing import List, Union, Iterator
+import copy
+
+import enums
+import support
+
+class Scope(object):
+    """Scope class, the variables of a single code block: the main code or one function body"""
+    def __init__(self, name : str):
+        """__init__ for Scope
+
+        Args:
+            name (str): name of the code block, the function name for function bodies
+        """
+        self.name = name
+        self.symbols = {}
+        self.slots = {}
+        self.slot_names = []
+        self.input_slot = None
+        self.output_slot = None
+
+    def __str__(self) -> str:
+        return 'Scope({name}: {symbols})'.format(
+            name = self.name,
+            symbols = ", ".join(self.symbols)
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __contains__(self, variable_name : str) -> bool:
+        return variable_name in self.symbols
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.symbols)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    # define :: support.VariableNode -> None
+    def define(self, node : support.VariableNode) -> None:
+        """define function, adds a variable to the scope
+
+        Only the first definition of a name is kept, later assignments resolve to it as well.
+
+        Args:
+            node (support.VariableNode): node that assigns the variable
+        """
+        if node.variable_name not in self.symbols:
+            self.symbols[node.variable_name] = node
+
+    # lookup :: str -> Union[support.VariableNode, None]
+    def lookup(self, variable_name : str) -> Union[support.VariableNode, None]:
+        """lookup function, find a variable by name
+
+        Args:
+            variable_name (str): name of the variable
+
+        Returns:
+            Union[support.VariableNode, None]: copy of the defining node, None when not defined
+        """
+        node = self.symbols.get(variable_name)
+        if node is None:
+            return None
+        return copy.copy(node)
+
+    # slot :: str -> int
+    def slot(self, variable_name : str) -> int:
+        """slot function, gives the fixed slot of a variable, handing out the next one when it has none
+
+        Args:
+            variable_name (str): name of the variable
+
+        Returns:
+            int: index of the variable in a frame of this code block
+        """
+        slot = self.slots.get(variable_name)
+        if slot is None:
+            slot = len(self.slot_names)
+            self.slots[variable_name] = slot
+            self.slot_names.append(variable_name)
+        return slot
+
+class SymbolTable(object):
+    """SymbolTable class, al scopes of a program, one for the main code and one per function body"""
+    def __init__(self, main_name : str = "main"):
+        """__init__ for SymbolTable
+
+        Args:
+            main_name (str, optional): name of the main code block. Defaults to "main".
+        """
+        self.main = Scope(main_name)
+        self.scopes = {main_name : self.main}
+        self.functions = {}
+        self.diagnostics = []
+
+    def __str__(self) -> str:
+        return 'SymbolTable({scopes})'.format(
+            scopes = list(self.scopes.values())
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # declareFunction :: str, int -> None
+    def declareFunction(self, function_name : str, line_nr : int) -> None:
+        self.functions[function_name] = line_nr
+
+    # openScope :: str -> Scope
+    def openScope(self, function_name : str) -> Scope:
+        """openScope function, gives the scope of a function body, making it when needed
+
+        Args:
+            function_name (str): name of the function
+
+        Returns:
+            Scope: scope of the function body
+        """
+        scope = self.scopes.get(function_name)
+        if scope is None:
+            scope = Scope(function_name)
+            self.scopes[function_name] = scope
+        return scope
+
+    # scope :: str -> Union[Scope, None]
+    def scope(self, name : str) -> Union[Scope, None]:
+        return self.scopes.get(name)
+
+    # resolve :: str, str -> Union[support.VariableNode, None]
+    def resolve(self, scope_name : str, variable_name : str) -> Union[support.VariableNode, None]:
+        scope = self.scopes.get(scope_name)
+        if scope is None:
+            return None
+        return scope.lookup(variable_name)
+
+    # checkShadowing :: -> List[support.Diagnostic]
+    def checkShadowing(self) -> List[support.Diagnostic]:
+        """checkShadowing function, warns about variables that have the name of a function, calls to that name go to the function
+
+        Returns:
+            List[support.Diagnostic]: found warnings, also added to diagnostics
+        """
+        warnings = []
+        for scope in self.scopes.values():
+            for variable_name, node in scope.symbols.items():
+                if variable_name in self.functions:
+                    warnings.append(support.Diagnostic("variable " + variable_name + " in " + scope.name + " shadows function " + variable_name, node.line_nr))
+        self.diagnostics += warnings
+        return warnings
+
+# resolveNode :: Scope, support.Node -> None
+def resolveNode(scope : Scope, node : support.Node) -> None:
+    """resolveNode function, sets the slot of every variable a statement refers to, nested definitions included
+
+    Args:
+        scope (Scope): scope of the code block the statement is in
+        node (support.Node): statement to resolve
+    """
+    stack = [node]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        if node is None or id(node) in seen:
+            continue
+        seen.add(id(node))
+        node_type = type(node)
+        if node_type is support.VariableNode:
+            if node.token_type == enums.token_types.VAR or node.token_type == enums.token_types.OUTPUT:
+                node.slot = scope.slot(node.variable_name)
+            if isinstance(node.value, support.Node):
+                stack.append(node.value)
+        elif node_type is support.MathNode:
+            stack += [node.value, node.rhs]
+        elif node_type is support.ConditionNode:
+            stack += [node.value, node.condition]
+        elif node_type is support.IfNode:
+            stack += [node.value, node.condition, node.new_value_true, node.new_value_false]
+        elif node_type is support.FunctionCall:
+            stack += [node.input, node.output]
+
+# resolveBlock :: Scope, List[support.Node], bool -> Scope
+def resolveBlock(scope : Scope, node_list : List[support.Node], function : bool = False) -> Scope:
+    """resolveBlock function, gives every variable of a code block a fixed slot
+
+    Variables get their slot in the order they are first stored to, the same order the
+    compiler used to hand out stack spots, INPUT and OUTPUT of a function come last.
+
+    Args:
+        scope (Scope): scope of the code block
+        node_list (List[support.Node]): statements of the code block
+        function (bool, optional): True for a function body. Defaults to False.
+
+    Returns:
+        Scope: the given scope
+    """
+    for node in node_list:
+        if type(node) is support.VariableNode and node.token_type == enums.token_types.VAR:
+            scope.slot(node.variable_name)
+        elif type(node) is support.FunctionCall:
+            scope.slot(node.output.variable_name)
+    for node in node_list:
+        resolveNode(scope, node)
+    if function:
+        scope.input_slot = scope.slot("INPUT")
+        scope.output_slot = scope.slot("OUTPUT")
+    return scope
+
+# resolveSlots :: List[support.Node], dict, str -> SymbolTable
+def resolveSlots(tree : List[support.Node], found_funcs : dict, main_name : str = "main") -> SymbolTable:
+    """resolveSlots function, resolution pass that gives the variables of the main code and each function a fixed slot
+
+    The slot is also set on every VariableNode, so running code indexes a frame instead of looking a name up.
+
+    Args:
+        tree (List[support.Node]): parsed main code
+        found_funcs (dict): al found functions
+        main_name (str, optional): name of the main code block. Defaults to "main".
+
+    Returns:
+        SymbolTable: table with a scope per code block, Scope.slots maps names to slots
+    """
+    table = SymbolTable(main_name)
+    resolveBlock(table.main, tree)
+    for function_name, function in found_funcs.items():
+        table.declareFunction(function_name, function.line_nr)
+        resolveBlock(table.openScope(function_name), function.commands, True)
+    return table
@@ -6,7 +6,7 @@
 
 bool_odd:
 PUSH {R7,LR}
-SUB SP, SP, #48
+SUB SP, SP, #40
 ADD R7, SP, #0
 _line_101:
 STR R0, [R7,#0]
@@ -17,13 +17,8 @@ _line_103:
 LDR R3,[R7,#0]
 MOV R2, #0
 CMP R3,R2
-BEQ bool_odd_line_3_true
-MOV R3, #1
-STR R3, [R7,#0]
-B _line_104
-bool_odd_line_3_true:
-MOV R3, #6
-STR R3, [R7,#0]
+BEQ _line_110
+B _line_105
 _line_104:
 LDR R0 ,[R7, #0]
 ADD R0, R0, #4
@@ -52,13 +47,13 @@ STR R3,[R7,#32]
 _line_111:
 LDR R0, [R7,#32]
 MOV SP, R7
-ADD SP, SP, #48
+ADD SP, SP, #40
 POP {R7, PC}
 
 
 bool_even:
 PUSH {R7,LR}
-SUB SP, SP, #48
+SUB SP, SP, #40
 ADD R7, SP, #0
 _line_201:
 STR R0, [R7,#0]
@@ -69,13 +64,8 @@ _line_203:
 LDR R3,[R7,#0]
 MOV R2, #0
 CMP R3,R2
-BEQ bool_even_line_3_true
-MOV R3, #1
-STR R3, [R7,#0]
-B _line_204
-bool_even_line_3_true:
-MOV R3, #6
-STR R3, [R7,#0]
+BEQ _line_210
+B _line_205
 _line_204:
 LDR R0 ,[R7, #0]
 ADD R0, R0, #4
@@ -104,7 +94,7 @@ STR R3,[R7,#32]
 _line_211:
 LDR R0, [R7,#32]
 MOV SP, R7
-ADD SP, SP, #48
+ADD SP, SP, #40
 POP {R7, PC}
 
 
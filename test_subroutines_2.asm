@@ -19,13 +19,8 @@ _line_104:
 LDR R3,[R7,#16]
 MOV R2, #1
 CMP R3,R2
-BGE sommig_line_4_true
-MOV R3, #4
-STR R3, [R7,#16]
-B _line_105
-sommig_line_4_true:
-MOV R3, #1
-STR R3, [R7,#16]
+BGE _line_106
+B _line_109
 _line_105:
 LDR R0 ,[R7, #16]
 ADD R0, R0, #5
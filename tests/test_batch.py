@@ -0,0 +1,45 @@
+import os
+
+import batch
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_unreadable_file_does_not_stop_the_batch(tmp_path, monkeypatch):
+    monkeypatch.setenv("FHTT_PARSE_CACHE", str(tmp_path / "cache"))
+    file_names = [os.path.join(package_dir, "fibonaci.txt"), str(tmp_path / "missing.txt"), os.path.join(package_dir, "test_subroutines_2.txt")]
+    results = list(batch.runFiles(file_names, "vm", workers=1))
+    assert [result.source for result in results] == file_names
+    assert results[0].error is None and results[2].error is None
+    assert "cant read" in results[1].error.message
+
+def test_unreadable_file_of_inputs(tmp_path, monkeypatch):
+    monkeypatch.setenv("FHTT_PARSE_CACHE", str(tmp_path / "cache"))
+    results = list(batch.runInputs(str(tmp_path / "missing.txt"), "fib", [1, 2], workers=1))
+    assert len(results) == 1 and "cant read" in results[0].error.message
+
+def test_results_in_order(tmp_path, monkeypatch):
+    monkeypatch.setenv("FHTT_PARSE_CACHE", str(tmp_path / "cache"))
+    file_names = []
+    for index in range(8):
+        file_name = tmp_path / ("program_" + str(index) + ".txt")
+        file_name.write_text("FROM " + str(index) + " TO x\nFROM x TO OUT\n")
+        file_names.append(str(file_name))
+    results = list(batch.runFiles(file_names, "vm", workers=3))
+    assert [result.source for result in results] == file_names
+    assert [(result.lines, result.value) for result in results] == [([str(index)], {"x" : index}) for index in range(8)]
+
+def test_inputs(tmp_path, monkeypatch):
+    monkeypatch.setenv("FHTT_PARSE_CACHE", str(tmp_path / "cache"))
+    results = list(batch.runInputs(os.path.join(package_dir, "fibonaci.txt"), "fib", range(0, 10), workers=2, chunk_size=3))
+    assert [result.source for result in results] == ["fib(" + str(input) + ")" for input in range(0, 10)]
+    assert [result.value for result in results] == [1, 1, 2, 3, 5, 8, 13, 21, 34, 55]
+    assert all(result.error is None for result in results)
+
+def test_timeout_does_not_stop_the_batch(tmp_path, monkeypatch):
+    monkeypatch.setenv("FHTT_PARSE_CACHE", str(tmp_path / "cache"))
+    endless = tmp_path / "endless.txt"
+    # the jump 0 lands on the last statement, that jumps back to it
+    endless.write_text("FROM 1 TO i\nFROM 0 TO LINE\nFROM -1 TO LINE\n")
+    results = list(batch.runFiles([str(endless), os.path.join(package_dir, "fibonaci.txt")], "vm", workers=1, timeout=0.3))
+    assert results[0].error.message == "timed out after 0.3 seconds"
+    assert (results[1].error, results[1].value) == (None, {})
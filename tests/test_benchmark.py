@@ -0,0 +1,11 @@
+import os
+
+import benchmark
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_memo_stats():
+    tree, found_funcs = benchmark.loadExample(os.path.join(package_dir, "fibonaci.txt"), "fib", 15)
+    for engine in ("frames", "tracing"):
+        # every fib(n) from 0 up to 15 is computed once, the second call of the same n is a hit
+        assert benchmark.memoStats(tree, found_funcs, engine) == {"size" : 16, "max_size" : 1024, "hits" : 13, "misses" : 16, "evictions" : 0}
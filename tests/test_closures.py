@@ -0,0 +1,25 @@
+import os
+
+import benchmark
+import closures
+import sinks
+import support
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# loadProgram :: str, str, int, int -> closures.Program
+def loadProgram(file_name, function_name, input, max_depth = 100000):
+    tree, found_funcs = benchmark.loadExample(os.path.join(package_dir, file_name), function_name, input)
+    program = closures.Compiler().compile(tree, found_funcs)
+    program.max_depth = max_depth
+    return program
+
+def test_deep_recursion():
+    program = loadProgram("test_subroutines_1.txt", "bool_even", 5000)
+    assert program.run(sinks.ListSink()) == {"benchmark_result" : 1}
+
+def test_max_depth():
+    program = loadProgram("test_subroutines_1.txt", "bool_even", 5000, max_depth = 100)
+    result = program.run(sinks.ListSink())
+    assert type(result) is support.Error
+    assert "nested deeper than 100" in result.message
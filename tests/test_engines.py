@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+import benchmark
+import lexer
+import main
+import parser
+import sinks
+import support
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+engines = ["frames", "tracing", "vm", "closures", "python"]
+
+# small programs on the quirks every engine has to copy from the Visitor
+edge_programs = {
+    "swapped operators" : "FROM 7 TO x\nFROM x TO x + 2\nFROM x TO OUT\nFROM x TO x - 3\nFROM x TO OUT\nFROM x TO x * 2\nFROM x TO OUT\nFROM x TO x / 5\nFROM x TO OUT\n",
+    "literal keeps value" : "FROM 1 TO x\nFROM 2 TO x\nFROM x TO OUT\nFROM x TO y\nFROM 5 TO y\nFROM y TO OUT\n",
+    "strings" : 'FROM "hello world  x" TO a\nFROM a TO OUT\nFROM "single" TO OUT\nFROM -3 TO c\nFROM c TO OUT\n',
+    "text compare" : 'FROM "abc" TO s\nFROM "xyz" TO t\nFROM s TO > t : 1 ELSE 2\nFROM s TO OUT\nFROM s TO == "abc" : "yes" ELSE "no"\nFROM s TO OUT\n',
+    "text math" : 'FROM "abc" TO s\nFROM 7 TO d\nFROM d TO d * 2\nFROM d TO OUT\nFROM s TO s - d\nFROM s TO OUT\n',
+    "jump 0" : "FROM 1 TO OUT\nFROM 0 TO LINE\nFROM 2 TO OUT\nFROM 3 TO OUT\n",
+    "jump 0 at the end" : "FROM 0 TO LINE\n",
+    "jump 1" : "FROM 1 TO OUT\nFROM 1 TO LINE\nFROM 2 TO OUT\n",
+    "jump past the end" : "FROM 1 TO OUT\nFROM 7 TO LINE\nFROM 2 TO OUT\n",
+    "negative jump" : "FROM 1 TO a\nFROM a TO OUT\nFROM a TO == 1 : 2 ELSE 9\nFROM a TO == 2 : -2 ELSE 9\nFROM a TO LINE\nFROM 5 TO OUT\n",
+    "jump on a variable" : "FROM 3 TO j\nFROM 0 TO i\nFROM i TO OUT\nFROM i TO i - 1\nFROM j TO LINE\nFROM 5 TO OUT\nFROM i TO OUT\nFROM i TO OUT\n",
+    "jump on text" : 'FROM "abc" TO s\nFROM s TO LINE\nFROM 1 TO OUT\n',
+    "truth machine" : "FROM 0 TO n\nFROM n TO == 0 : 3 ELSE 1\nFROM n TO LINE\nFROM 1 TO OUT\nFROM -1 TO LINE\nFROM 0 TO OUT\n",
+    "hot loop" : "FROM 0 TO i\nFROM i TO i - 1\nFROM i TO c\nFROM c TO < 200 : 1 ELSE 2\nFROM c TO LINE\nFROM -4 TO LINE\nFROM i TO OUT\n",
+    "hot loop with text" : 'FROM 0 TO i\nFROM "a" TO s\nFROM i TO i - 1\nFROM i TO OUT\nFROM s TO OUT\nFROM i TO c\nFROM c TO < 60 : 1 ELSE 2\n'
+                           'FROM c TO LINE\nFROM -6 TO LINE\nFROM "b" TO s\nFROM i TO c\nFROM c TO < 120 : -10 ELSE 1\nFROM c TO LINE\nFROM s TO OUT\n',
+    "function without output" : "FROM f TO DECLARE\nFROM START TO f\nFROM INPUT TO x\nFROM END TO f\nFROM f : 1 TO r\n",
+    "error statement" : "FROM 1 TO OUT\nFROM stop TO ERR\nFROM 2 TO OUT\n",
+    "function named main" : "FROM main TO DECLARE\nFROM START TO main\nFROM INPUT TO x\nFROM x TO x - 1\nFROM x TO OUTPUT\nFROM END TO main\n"
+                            "FROM 5 TO x\nFROM main : x TO r\nFROM r TO OUT\nFROM x TO OUT\n",
+}
+
+# an if statement with a variable as new value: the Visitor stores the node that defined that variable, so it
+# later reads the literal the variable was first given, the other engines copy the value it has at the if statement
+visitor_differences = {
+    "variable as new value" : 'FROM "abc" TO s\nFROM "xyz" TO t\nFROM s TO == "abc" : t ELSE s\nFROM s TO OUT\n',
+    "variable as new value in a jump" : "FROM 0 TO n\nFROM n TO == 0 : 3 ELSE n\nFROM n TO == 1 : 1 ELSE n\nFROM n TO LINE\nFROM 1 TO OUT\nFROM -1 TO LINE\nFROM 0 TO OUT\n",
+}
+
+# calls to the example programs, small enough for the recursion of the Visitor
+example_calls = [
+    ("fibonaci.txt", "fib", 10),
+    ("test_subroutines_1.txt", "bool_even", 13),
+    ("test_subroutines_1.txt", "bool_odd", 8),
+    ("test_subroutines_2.txt", "sommig", 20),
+]
+
+# loadProgram :: str -> Tuple[list, dict]
+def loadProgram(name):
+    if name in edge_programs or name in visitor_differences:
+        return parser.Parser().parse(list(lexer.lexTokenize(edge_programs.get(name) or visitor_differences[name])))
+    file_name, function_name, input = name
+    return benchmark.loadExample(os.path.join(package_dir, file_name), function_name, input)
+
+# runEngine :: str, str -> Tuple[Union[str, dict], List[str]]
+def runEngine(name, engine):
+    tree, found_funcs = loadProgram(name)
+    assert not (len(tree) > 0 and type(tree[0]) == support.Error), tree
+    sink = sinks.ListSink()
+    result = main.run(tree, found_funcs, engine, sink)
+    if type(result) is dict:
+        # the Visitor keeps literal nodes as values, the other engines plain values
+        result = {variable_name : value.value if isinstance(value, support.Node) else value for variable_name, value in result.items()}
+    elif isinstance(result, support.Error):
+        result = result.message
+    return result, sink.lines()
+
+@pytest.mark.parametrize("engine", engines)
+@pytest.mark.parametrize("name", list(edge_programs) + example_calls +
+                         [pytest.param(name, marks=pytest.mark.xfail(strict=True, reason="the Visitor keeps the defining node of a variable new value"))
+                          for name in visitor_differences], ids=str)
+def test_engine_agrees_with_visitor(name, engine):
+    assert runEngine(name, engine) == runEngine(name, "tree")
@@ -0,0 +1,15 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# every module must import in a fresh interpreter, without a module that imports it first
+@pytest.mark.parametrize("module_name", [
+    "compiler_base", "vm", "closures", "peephole", "interpreter", "tracing", "transpiler", "pycode", "main", "batch",
+])
+def test_standalone_import(module_name):
+    result = subprocess.run([sys.executable, "-c", "import " + module_name], cwd=package_dir, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,75 @@
+import pytest
+
+import interpreter
+import lexer
+import parser
+import sinks
+import support
+
+# a loop of 5 statements that runs 2000 times after the first statement, then writes i
+counting_loop = "FROM 0 TO i\nFROM i TO i - 1\nFROM i TO c\nFROM c TO < 2000 : 1 ELSE 2\nFROM c TO LINE\nFROM -4 TO LINE\nFROM i TO OUT\n"
+# the jump 0 lands on the last statement, that jumps back to it
+endless_loop = "FROM 1 TO OUT\nFROM 0 TO LINE\nFROM -1 TO LINE\n"
+
+# runProgram :: str, int, ... -> Tuple[interpreter.Interpreter, Union[support.Error, dict], List[str]]
+def runProgram(code, hot_loop = 0, **limits):
+    tree, found_funcs = parser.Parser().parse(list(lexer.lexTokenize(code)))
+    sink = sinks.ListSink()
+    machine = interpreter.Interpreter(found_funcs, sink=sink, hot_loop=hot_loop, **limits)
+    return machine, machine.run(tree), sink.lines()
+
+@pytest.mark.parametrize("max_steps", [1, 2, 3, 6, 7, 100, 101, 4567, 9999])
+def test_budget_fires_at_the_step(max_steps):
+    machine, result, lines = runProgram(counting_loop, max_steps=max_steps)
+    assert type(result) is support.Error
+    assert result.message == "instruction budget of " + str(max_steps) + " statements used up in main code"
+    assert result.steps == max_steps
+    # the first statement and 5 per pass, the error gives the line of the statement that was about to run
+    assert result.line_nr == 2 + (max_steps - 1) % 5
+    assert lines == []
+
+def test_budget_not_used_up():
+    # 1 + 5 * 2000 statements, the last pass leaves the loop at its fourth statement, and the OUT
+    steps = 1 + 5 * 1999 + 4 + 1
+    assert runProgram(counting_loop, max_steps=steps)[1:] == ({"i" : 2000, "c" : 2}, ["2000"])
+    result = runProgram(counting_loop, max_steps=steps - 1)[1]
+    assert type(result) is support.Error
+    assert (result.steps, result.line_nr) == (steps - 1, 7)
+
+@pytest.mark.parametrize("max_steps", [1, 7, 249, 250, 251, 252, 253, 254, 255, 4567, 9999])
+def test_budget_with_tracing(max_steps):
+    frames = runProgram(counting_loop, max_steps=max_steps)[1]
+    machine, tracing, lines = runProgram(counting_loop, hot_loop=50, max_steps=max_steps)
+    assert (tracing.message, tracing.line_nr, tracing.steps) == (frames.message, frames.line_nr, frames.steps)
+    if max_steps > 1000:
+        assert any(machine.traces.values())
+
+def test_budget_in_function():
+    code = "FROM f TO DECLARE\nFROM START TO f\nFROM INPUT TO x\nFROM x TO x - 1\nFROM x TO OUTPUT\nFROM END TO f\nFROM f : 1 TO r\nFROM r TO OUT\n"
+    result = runProgram(code, max_steps=4)[1]
+    assert type(result) is support.Error
+    assert result.message == "instruction budget of 4 statements used up in f"
+    # the declaration, the call and the INPUT of f ran, the lines of a function body count from its START
+    assert (result.steps, result.line_nr) == (4, 2)
+
+@pytest.mark.parametrize("hot_loop", [0, 50])
+def test_deadline_on_endless_loop(hot_loop):
+    machine, result, lines = runProgram(endless_loop, hot_loop=hot_loop, deadline=0.05)
+    assert type(result) is support.Error
+    assert result.message.startswith("deadline of 0.05 seconds passed in main code after ")
+    assert result.line_nr in (2, 3)
+    assert result.steps > 0
+    assert lines == ["1"]
+
+@pytest.mark.parametrize("hot_loop", [0, 50])
+def test_budget_on_endless_loop(hot_loop):
+    # after the OUT the lines 2 and 3 take turns
+    result = runProgram(endless_loop, hot_loop=hot_loop, max_steps=100000)[1]
+    assert (result.steps, result.line_nr) == (100000, 3)
+
+def test_jump_past_assignment():
+    # the jump skips the assignment of y, reading it then gives an error instead of a crash
+    for code in ("FROM 1 TO x\nFROM 2 TO LINE\nFROM 5 TO y\nFROM x TO x + y\n", "FROM 2 TO LINE\nFROM 5 TO y\nFROM y TO w\n"):
+        result = runProgram(code)[1]
+        assert type(result) is support.Error
+        assert result.message == "Var y has no value"
@@ -0,0 +1,33 @@
+import os
+
+import lexer
+import parser
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+example_files = [os.path.join(package_dir, file_name) for file_name in ("fibonaci.txt", "test_subroutines_1.txt", "test_subroutines_2.txt")]
+
+# tokenRows :: Iterable[lexer.Token] -> list
+def tokenRows(tokens):
+    return [(token.value, token.token_type, token.position) for token in tokens]
+
+def test_token_stream_gives_the_same_tokens():
+    for file_name in example_files:
+        tokens = lexer.lexen(file_name)
+        stream = lexer.lexenCompact(file_name)
+        assert tokenRows(stream) == tokenRows(tokens)
+        assert tokenRows(stream[3:11]) == tokenRows(tokens[3:11])
+        assert tokenRows([stream[-1]]) == tokenRows([tokens[-1]])
+
+def test_parser_reads_lines_from_token_stream():
+    for file_name in example_files:
+        tree, found_funcs = parser.Parser().parse(lexer.lexen(file_name))
+        stream_tree, stream_found_funcs = parser.Parser().parse(lexer.lexenCompact(file_name))
+        assert str(stream_tree) == str(tree)
+        assert str(stream_found_funcs) == str(found_funcs)
+
+def test_mapped_lexing_gives_the_same_tokens(tmp_path):
+    code_file = tmp_path / "strings.txt"
+    code_file.write_text('FROM "hello   big\n world" TO x\nFROM -5 TO y\nFROM a-b TO z\nFROM x TO OUT\n\n  FROM  y TO <= 3 : x ELSE "q"\n')
+    for file_name in example_files + [str(code_file)]:
+        assert tokenRows(lexer.lexen(file_name, mapped=True)) == tokenRows(lexer.lexen(file_name))
+        assert tokenRows(lexer.lexenCompact(file_name, mapped=True)) == tokenRows(lexer.lexenCompact(file_name))
@@ -0,0 +1,104 @@
+import os
+
+import lexer
+import parse_cache
+import parser
+import support
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+shadowing_program = """FROM double TO DECLARE
+
+FROM START TO double
+FROM INPUT TO x
+FROM x TO x - x
+FROM x TO OUTPUT
+FROM END TO double
+
+FROM 3 TO double
+FROM double : double TO result
+FROM result TO OUT
+"""
+
+def test_parser_keeps_shadowing_warnings():
+    program_parser = parser.Parser()
+    tree, found_funcs = program_parser.parse(list(lexer.lexTokenize(shadowing_program)))
+    assert "double" in found_funcs
+    assert [type(warning) for warning in program_parser.diagnostics] == [support.Diagnostic]
+    assert "shadows function double" in program_parser.diagnostics[0].message
+
+def test_cached_parse_keeps_shadowing_warnings(tmp_path):
+    code_file = tmp_path / "shadow.txt"
+    code_file.write_text(shadowing_program)
+    cache = parse_cache.ParseCache(str(tmp_path / "cache"))
+    cache.parseFile(str(code_file))
+    warnings = [str(warning) for warning in cache.diagnostics]
+    assert cache.misses == 1 and len(warnings) == 1
+
+    cache = parse_cache.ParseCache(str(tmp_path / "cache"))
+    cache.parseFile(str(code_file))
+    assert cache.hits == 1
+    assert [str(warning) for warning in cache.diagnostics] == warnings
+
+def test_parallel_parse_gives_the_same_tree(tmp_path):
+    file_name = os.path.join(package_dir, "test_subroutines_1.txt")
+    tree, found_funcs = parse_cache.ParseCache(str(tmp_path / "serial")).parseFile(file_name, parallel=False)
+    parallel_tree, parallel_found_funcs = parse_cache.ParseCache(str(tmp_path / "parallel")).parseFile(file_name, parallel=True)
+    assert str(parallel_tree) == str(tree)
+    assert str(parallel_found_funcs) == str(found_funcs)
+
+def test_mapped_parse_gives_the_same_tree(tmp_path):
+    file_name = os.path.join(package_dir, "fibonaci.txt")
+    tree, found_funcs = parse_cache.ParseCache(str(tmp_path / "stream")).parseFile(file_name, mapped=False)
+    mapped_tree, mapped_found_funcs = parse_cache.ParseCache(str(tmp_path / "mapped")).parseFile(file_name, mapped=True)
+    assert str(mapped_tree) == str(tree)
+    assert str(mapped_found_funcs) == str(found_funcs)
+
+def test_empty_file(tmp_path):
+    code_file = tmp_path / "empty.txt"
+    code_file.write_text("")
+    tree, found_funcs = parse_cache.ParseCache(str(tmp_path / "cache")).parseFile(str(code_file))
+    assert tree == [] and found_funcs == {}
+
+def test_evict_oldest(tmp_path):
+    cache = parse_cache.ParseCache(str(tmp_path / "cache"))
+    for index in range(4):
+        code_file = tmp_path / ("program_" + str(index) + ".txt")
+        code_file.write_text("FROM " + str(index) + " TO x\nFROM x TO OUT\n")
+        cache.parseFile(str(code_file))
+    paths = sorted(entry.path for entry in os.scandir(cache.directory))
+    assert len(paths) == 4 and all(path.endswith(".ast") for path in paths)
+    for age, path in enumerate(paths):
+        os.utime(path, (1000000 + age, 1000000 + age))
+    sizes = [os.path.getsize(path) for path in paths]
+    # room for the two newest files only
+    cache.max_bytes = sizes[2] + sizes[3]
+    assert cache.evict() == 2
+    assert sorted(entry.path for entry in os.scandir(cache.directory)) == paths[2:]
+    assert cache.evict() == 0
+
+def test_parser_version_invalidates(tmp_path, monkeypatch):
+    file_name = os.path.join(package_dir, "fibonaci.txt")
+    cache = parse_cache.ParseCache(str(tmp_path / "cache"))
+    tree, found_funcs = cache.parseFile(file_name)
+    monkeypatch.setattr(parser, "parser_version", str(parser.parser_version) + "-changed")
+    cache = parse_cache.ParseCache(str(tmp_path / "cache"))
+    new_tree, new_found_funcs = cache.parseFile(file_name)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert str(new_tree) == str(tree) and str(new_found_funcs) == str(found_funcs)
+    cache.parseFile(file_name)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_corrupt_header_reparses(tmp_path):
+    file_name = os.path.join(package_dir, "fibonaci.txt")
+    cache = parse_cache.ParseCache(str(tmp_path / "cache"))
+    tree, found_funcs = cache.parseFile(file_name)
+    [path] = [entry.path for entry in os.scandir(cache.directory)]
+    with open(path, "r+b") as cache_file:
+        cache_file.write(b"XXXX")
+    cache = parse_cache.ParseCache(str(tmp_path / "cache"))
+    new_tree, new_found_funcs = cache.parseFile(file_name)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert str(new_tree) == str(tree) and str(new_found_funcs) == str(found_funcs)
+    with open(path, "rb") as cache_file:
+        assert cache_file.read(len(parse_cache.cache_magic)) == parse_cache.cache_magic
@@ -0,0 +1,102 @@
+import enums
+import lexer
+import main
+import parser
+import peephole
+import sinks
+import support
+
+# functionBody :: str, str -> List[support.Node]
+def functionBody(source, function_name):
+    tree, found_funcs = parser.Parser().parse(list(lexer.lexTokenize(source)))
+    function = found_funcs[function_name]
+    # the same body the Interpreter and the compiler fuse, the INPUT assignment first
+    return [support.VariableNode("INPUT", None, function.line_nr, enums.token_types.DECLARE)] + function.commands
+
+# runEngines :: str -> list
+def runEngines(source):
+    outcomes = []
+    for engine in ("tree", "frames"):
+        tree, found_funcs = parser.Parser().parse(list(lexer.lexTokenize(source)))
+        sink = sinks.ListSink()
+        result = main.run(tree, found_funcs, engine, sink)
+        if type(result) is dict:
+            # the Visitor keeps literal nodes as values, the other engines plain values
+            result = {name : value.value if isinstance(value, support.Node) else value for name, value in result.items()}
+        outcomes.append((str(result), sink.lines()))
+    return outcomes
+
+# program :: str, str, str -> str
+def program(jumps, last_statement, calls = "FROM f : 1 TO a\nFROM a TO OUT\nFROM f : 7 TO b\nFROM b TO OUT\n"):
+    return """FROM f TO DECLARE
+FROM START TO f
+FROM INPUT TO x
+FROM x TO c
+FROM c TO == 1 : {jumps}
+FROM c TO LINE
+FROM x TO x - 10
+{last_statement}
+FROM END TO f
+""".format(jumps = jumps, last_statement = last_statement) + calls
+
+def test_dead_variable_is_fused():
+    source = program("2 ELSE 1", "FROM x TO OUTPUT")
+    fused = peephole.fuseBranches(functionBody(source, "f"), True)
+    assert type(fused[3]) is peephole.BranchNode
+    assert (fused[3].target_true, fused[3].target_false) == (6, 5)
+    assert type(fused[4]) is support.VariableNode
+    tree_outcome, frames_outcome = runEngines(source)
+    assert frames_outcome == tree_outcome
+    assert tree_outcome[1] == ["1", "17"]
+
+def test_variable_read_after_the_jump_keeps_the_if_statement():
+    source = program("2 ELSE 1", "FROM c TO OUTPUT")
+    body = functionBody(source, "f")
+    fused = peephole.fuseBranches(body, True)
+    assert type(fused[3]) is support.IfNode
+    assert fused == body
+    tree_outcome, frames_outcome = runEngines(source)
+    assert frames_outcome == tree_outcome
+    assert tree_outcome[1] == ["2", "1"]
+
+def test_main_code_reads_al_variables_at_the_end():
+    source = "FROM 1 TO c\nFROM c TO == 1 : 2 ELSE 1\nFROM c TO LINE\nFROM 3 TO OUT\nFROM 4 TO OUT\n"
+    tree, found_funcs = parser.Parser().parse(list(lexer.lexTokenize(source)))
+    assert peephole.fuseBranches(tree) == tree
+
+def test_jump_zero_is_not_fused():
+    # a jump of 0 lands on the last statement of the block, not on the line itself
+    source = program("0 ELSE 1", "FROM x TO OUTPUT")
+    body = functionBody(source, "f")
+    assert peephole.fuseBranches(body, True) == body
+    tree_outcome, frames_outcome = runEngines(source)
+    assert frames_outcome == tree_outcome
+
+def test_negative_jump_that_wraps_is_not_fused():
+    # -5 goes past the start of the block and wraps around to its last statement
+    source = program("-5 ELSE 1", "FROM x TO OUTPUT")
+    body = functionBody(source, "f")
+    assert peephole.fuseBranches(body, True) == body
+    tree_outcome, frames_outcome = runEngines(source)
+    assert frames_outcome == tree_outcome
+    assert tree_outcome[1] == ["1", "17"]
+
+def test_negative_jump_inside_the_block_is_fused():
+    source = """FROM f TO DECLARE
+FROM START TO f
+FROM INPUT TO x
+FROM x TO x + 1
+FROM x TO c
+FROM c TO > 0 : -3 ELSE 1
+FROM c TO LINE
+FROM x TO OUTPUT
+FROM END TO f
+FROM f : 5 TO a
+FROM a TO OUT
+"""
+    fused = peephole.fuseBranches(functionBody(source, "f"), True)
+    assert type(fused[4]) is peephole.BranchNode
+    assert (fused[4].target_true, fused[4].target_false) == (2, 6)
+    tree_outcome, frames_outcome = runEngines(source)
+    assert frames_outcome == tree_outcome
+    assert tree_outcome[1] == ["0"]
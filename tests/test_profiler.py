@@ -0,0 +1,32 @@
+import os
+
+import benchmark
+import main
+import profiler
+import sinks
+import support
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_fib_counts():
+    tree, found_funcs = benchmark.loadExample(os.path.join(package_dir, "fibonaci.txt"), "fib", 10)
+    originals = {node_class : node_class.__dict__["visit"] for node_class in profiler.statement_classes + [support.FunctionNode]}
+    line_profiler = profiler.Profiler()
+    line_profiler.install()
+    try:
+        result = main.run(tree, found_funcs, "tree", sinks.ListSink())
+    finally:
+        line_profiler.uninstall()
+    assert {node_class : node_class.__dict__["visit"] for node_class in originals} == originals
+    assert result["benchmark_result"].value == 89
+
+    data = line_profiler.dump()
+    # fib(10) makes 177 calls, 88 of them with an input above 1 make two calls of their own
+    assert [(entry["function"], entry["calls"]) for entry in data["functions"]] == [("fib", 177)]
+    counts = {(entry["function"], entry["line"]) : entry["count"] for entry in data["lines"]}
+    # the first five statements and the OUTPUT run in every call, line 13 in the 89 calls with an input of 0 or 1
+    expected = {("fib", line_nr) : 177 for line_nr in (1, 2, 3, 4, 5, 14)}
+    expected.update({("fib", line_nr) : 88 for line_nr in range(6, 13)})
+    expected[("fib", 13)] = 89
+    expected.update({("main", line_nr) : 1 for line_nr in (1, 2, 3)})
+    assert counts == expected
@@ -0,0 +1,45 @@
+import os
+import re
+import signal
+
+import pytest
+
+import benchmark
+import interpreter
+import sampling
+import sinks
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+collapsed_line = re.compile(r"^main(;fib)* \d+$")
+
+# runFib :: int, sampling.StackSampler, ... -> Union[support.Error, dict]
+def runFib(input, sampler, **limits):
+    tree, found_funcs = benchmark.loadExample(os.path.join(package_dir, "fibonaci.txt"), "fib", input)
+    return interpreter.Interpreter(found_funcs, sink=sinks.ListSink(), sampler=sampler, memo_size=0, **limits).run(tree)
+
+def test_sample_every():
+    # sampling every statement counts al statements, the budget agrees on that amount
+    counter = sampling.StackSampler(1)
+    runFib(10, counter)
+    steps = sum(counter.samples.values())
+    assert max(len(names) for names in counter.samples) == 1 + 10
+    assert type(runFib(10, None, max_steps=steps)) is dict
+    assert runFib(10, None, max_steps=steps - 1).steps == steps - 1
+    for every in (2, 7, 100):
+        sampler = sampling.StackSampler(every)
+        runFib(10, sampler)
+        lines = sampler.collapsed()
+        assert all(collapsed_line.match(line) for line in lines)
+        assert sum(int(line.split(" ")[1]) for line in lines) == steps // every
+
+@pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="needs signal.setitimer")
+@pytest.mark.parametrize("clock", list(sampling.clocks))
+def test_sample_interval(clock):
+    timer, signal_name = sampling.clocks[clock]
+    handler = signal.getsignal(getattr(signal, signal_name))
+    sampler = sampling.StackSampler(interval=0.0005, clock=clock)
+    runFib(16, sampler)
+    assert all(collapsed_line.match(line) for line in sampler.collapsed())
+    assert signal.getsignal(getattr(signal, signal_name)) is handler
+    assert signal.getitimer(getattr(signal, timer)) == (0.0, 0.0)
@@ -0,0 +1,47 @@
+import io
+
+import pytest
+
+import lexer
+import main
+import parser
+import sinks
+
+def test_binary_round_trip():
+    stream = io.BytesIO()
+    sink = sinks.BinarySink(stream)
+    values = [0, -12, 2 ** 70, "héllo wörld", "日本語", "", "a b  c"]
+    for value in values:
+        sink.write(value)
+    sink.flush()
+    assert sink.written == len(values)
+    stream.seek(0)
+    assert sinks.readBinary(stream) == [str(value) for value in values]
+
+def test_buffered_flush_on_exit():
+    stream = io.StringIO()
+    sink = sinks.BufferedSink(stream)
+    tree, found_funcs = parser.Parser().parse(list(lexer.lexTokenize('FROM 1 TO OUT\nFROM "twee" TO OUT\nFROM 3 TO OUT\n')))
+    with sinks.redirect(sink):
+        main.run(tree, found_funcs, "vm")
+        assert stream.getvalue() == ""
+    assert stream.getvalue() == "1\n\"twee\"\n3\n"
+    assert sink.written == 3 and sinks.current() is sinks.default_sink
+
+def test_buffered_flush_on_error():
+    stream = io.StringIO()
+    with pytest.raises(RuntimeError):
+        with sinks.redirect(sinks.BufferedSink(stream)) as sink:
+            sink.write(1)
+            raise RuntimeError()
+    assert stream.getvalue() == "1\n"
+
+def test_buffered_flush_when_full():
+    stream = io.StringIO()
+    sink = sinks.BufferedSink(stream, buffer_size=8)
+    for value in range(5):
+        sink.write(value)
+    # the fourth line fills the 8 characters
+    assert stream.getvalue() == "0\n1\n2\n3\n"
+    sink.flush()
+    assert stream.getvalue() == "0\n1\n2\n3\n4\n"
@@ -0,0 +1,68 @@
+import os
+
+import benchmark
+import lexer
+import parser
+import sinks
+import support
+import transpiler
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# runExample :: str, str, int, int -> Union[support.Error, dict]
+def runExample(file_name, function_name, input, max_depth = 100000):
+    tree, found_funcs = benchmark.loadExample(os.path.join(package_dir, file_name), function_name, input)
+    return transpiler.run(tree, found_funcs, sinks.ListSink(), max_depth)
+
+def test_deep_recursion():
+    assert runExample("test_subroutines_1.txt", "bool_even", 5000) == {"benchmark_result" : 1}
+    assert runExample("test_subroutines_1.txt", "bool_odd", 5001) == {"benchmark_result" : 1}
+
+def test_recursion_around_direct_depth():
+    for input in range(transpiler.direct_depth - 2, transpiler.direct_depth + 3):
+        assert runExample("test_subroutines_1.txt", "bool_even", input) == {"benchmark_result" : int(input % 2 == 0)}
+
+# count calls itself down to 0 and calls leaf, a function without calls, on the way
+leaf_calls = """FROM leaf TO DECLARE
+FROM count TO DECLARE
+
+FROM START TO leaf
+FROM INPUT TO x
+FROM 0 TO r
+FROM r TO OUTPUT
+FROM END TO leaf
+
+FROM START TO count
+FROM INPUT TO n
+FROM leaf : n TO m
+FROM n TO c
+FROM c TO == 0 : 5 ELSE 1
+FROM c TO LINE
+FROM n TO n + 1
+FROM count : n TO m2
+FROM m2 TO result
+FROM 2 TO LINE
+FROM m TO result
+FROM result TO OUTPUT
+FROM END TO count
+"""
+
+def test_leaf_call_on_trampoline():
+    for input in (3, transpiler.direct_depth + 1, 1000, 5000):
+        source = leaf_calls + "FROM count : " + str(input) + " TO benchmark_result\n"
+        tree, found_funcs = parser.Parser().parse(list(lexer.lexTokenize(source)))
+        assert transpiler.run(tree, found_funcs, sinks.ListSink()) == {"benchmark_result" : 0}
+
+def test_fib_on_trampoline(monkeypatch):
+    expected = runExample("fibonaci.txt", "fib", 15)
+    monkeypatch.setattr(transpiler, "direct_depth", 2)
+    assert runExample("fibonaci.txt", "fib", 15) == expected
+
+def test_max_depth():
+    for max_depth in (1, 100, 4999):
+        result = runExample("test_subroutines_1.txt", "bool_even", 5000, max_depth)
+        assert type(result) is support.Error
+        assert result.message == "function calls nested deeper than " + str(max_depth)
+        # the line of the call in the body of bool_even or bool_odd
+        assert result.line_nr == 7
+    assert runExample("test_subroutines_1.txt", "bool_even", 5000, 5001) == {"benchmark_result" : 1}
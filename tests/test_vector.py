@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+import batch
+import interpreter
+import lexer
+import parse_cache
+import parser
+import sinks
+import support
+import vector
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# spread jumps as far as its input, so every lane lands on another line,
+# unset_at_3 skips the assignment of y for input 3 only
+lane_programs = """FROM spread TO DECLARE
+FROM unset_at_3 TO DECLARE
+
+FROM START TO spread
+FROM INPUT TO x
+FROM 0 TO r
+FROM x TO LINE
+FROM r TO r - 1
+FROM r TO r - 10
+FROM r TO r - 100
+FROM r TO OUTPUT
+FROM END TO spread
+
+FROM START TO unset_at_3
+FROM INPUT TO x
+FROM x TO c
+FROM c TO == 3 : 2 ELSE 1
+FROM c TO LINE
+FROM x TO y
+FROM y TO OUTPUT
+FROM END TO unset_at_3
+"""
+
+# callOne :: dict, str, int -> Union[support.Error, support.lit_types]
+def callOne(found_funcs, function_name, input):
+    result = interpreter.Interpreter(found_funcs, sink=sinks.ListSink()).run(batch.callTree(function_name, input))
+    return result if type(result) is support.Error else result[batch.result_name]
+
+@pytest.mark.parametrize("file_name, function_name", [
+    ("fibonaci.txt", "fib"),
+    ("test_subroutines_2.txt", "sommig"),
+    ("test_subroutines_1.txt", "bool_even"),
+])
+def test_lanes_match_interpreter(file_name, function_name, tmp_path):
+    tree, found_funcs = parse_cache.ParseCache(str(tmp_path)).parseFile(os.path.join(package_dir, file_name))
+    inputs = list(range(0, 20))
+    outputs = vector.BatchInterpreter(found_funcs).run(function_name, numpy.array(inputs))
+    assert type(outputs) is numpy.ndarray
+    assert outputs.tolist() == [callOne(found_funcs, function_name, input) for input in inputs]
+
+def test_divergent_jumps():
+    tree, found_funcs = parser.Parser().parse(list(lexer.lexTokenize(lane_programs)))
+    inputs = [4, 1, 3, 2, 2, 1]
+    outputs = vector.BatchInterpreter(found_funcs).run("spread", inputs)
+    assert outputs.tolist() == [callOne(found_funcs, "spread", input) for input in inputs]
+    assert len(set(outputs.tolist())) == 4
+
+def test_error_lane():
+    tree, found_funcs = parser.Parser().parse(list(lexer.lexTokenize(lane_programs)))
+    machine = vector.BatchInterpreter(found_funcs)
+    assert machine.run("unset_at_3", [0, 1, 2, 4, 5]).tolist() == [0, 1, 2, 4, 5]
+    expected = callOne(found_funcs, "unset_at_3", 3)
+    assert type(expected) is support.Error
+    result = machine.run("unset_at_3", [0, 1, 2, 3, 4, 5])
+    assert type(result) is support.Error
+    assert result.message == expected.message == "Var y has no value"
+
+def test_batch_vector(tmp_path, monkeypatch):
+    monkeypatch.setenv("FHTT_PARSE_CACHE", str(tmp_path / "cache"))
+    results = list(batch.runVector(os.path.join(package_dir, "fibonaci.txt"), "fib", [5, 0, 9]))
+    assert [(result.source, result.value) for result in results] == [("fib(5)", 8), ("fib(0)", 1), ("fib(9)", 55)]
+    results = list(batch.runVector(os.path.join(package_dir, "fibonaci.txt"), "nope", [1]))
+    assert len(results) == 1 and results[0].error.message == "function nope not declared"
@@ -0,0 +1,35 @@
+import os
+
+import benchmark
+import lexer
+import parser
+import sinks
+import support
+import vm
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# f calls itself for every input and never returns
+runaway = "FROM f TO DECLARE\nFROM START TO f\nFROM INPUT TO x\nFROM f : x TO y\nFROM y TO OUTPUT\nFROM END TO f\nFROM f : 1 TO r\nFROM r TO OUT\n"
+
+def test_deep_recursion():
+    tree, found_funcs = benchmark.loadExample(os.path.join(package_dir, "test_subroutines_1.txt"), "bool_even", 5000)
+    assert vm.VirtualMachine(sinks.ListSink()).run(vm.Compiler().compile(tree, found_funcs)) == {"benchmark_result" : 1}
+
+def test_max_depth():
+    tree, found_funcs = benchmark.loadExample(os.path.join(package_dir, "test_subroutines_1.txt"), "bool_even", 5000)
+    program = vm.Compiler().compile(tree, found_funcs)
+    result = vm.VirtualMachine(sinks.ListSink(), max_depth=100).run(program)
+    assert type(result) is support.Error
+    assert result.message == "function calls nested deeper than 100"
+    # the line of the call in the body of bool_even or bool_odd
+    assert result.line_nr == 7
+    assert vm.VirtualMachine(sinks.ListSink(), max_depth=5001).run(program) == {"benchmark_result" : 1}
+
+def test_runaway_recursion():
+    tree, found_funcs = parser.Parser().parse(list(lexer.lexTokenize(runaway)))
+    sink = sinks.ListSink()
+    result = vm.VirtualMachine(sink).run(vm.Compiler().compile(tree, found_funcs))
+    assert type(result) is support.Error
+    assert result.message == "function calls nested deeper than 100000"
+    assert sink.lines() == []
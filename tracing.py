@@ -0,0 +1,245 @@
+from typing import List, Union, Tuple, Callable
+
+import enums
+import support
+import peephole
+import pycode
+
+class Trace(object):
+    """Trace class, one recorded pass through a hot loop compiled to a python function
+
+    The function runs the loop on int values only, every if statement and LINE jump
+    on a variable checks that the loop takes the same way as when it was recorded,
+    and hands the loop back to the interpreter when it does not.
+    """
+    def __init__(self, target : int, source : str, function : Callable, length : int):
+        """__init__ for Trace
+
+        Args:
+            target (int): index of the statement the loop jumps back to
+            source (str): generated python source
+            function (Callable): compiled function, takes the values of the frame, the write function of the sink and the amount of passes
+            length (int): amount of statements of one pass through the loop
+        """
+        self.target = target
+        self.source = source
+        self.function = function
+        self.length = length
+        self.runs = 0
+
+    def __str__(self) -> str:
+        return 'Trace(line {target}, {runs} runs)'.format(
+            target = self.target,
+            runs = self.runs
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # run :: List[support.lit_types], Callable, int -> Tuple[int, int]
+    def run(self, values : List[support.lit_types], write : Callable, passes : int = -1) -> Tuple[int, int]:
+        """run function, runs the loop until it leaves the recorded way or has made its passes
+
+        Args:
+            values (List[support.lit_types]): values of the frame, updated in place
+            write (Callable): write function of the sink OUT statements go to
+            passes (int, optional): passes through the loop the trace may make, below 0 for no limit. Defaults to -1.
+
+        Returns:
+            Tuple[int, int]: index of the statement the interpreter continues with and the amount of statements that ran
+        """
+        self.runs += 1
+        return self.function(values, write, passes)
+
+class TraceBuilder(object):
+    """TraceBuilder class, python source of a recorded path while it is generated"""
+    def __init__(self):
+        # lines of the loop body, (indent, index, statements of the pass that ran) where the trace hands the loop back
+        self.lines = []
+        # statements of the pass before the one that is added
+        self.statements = 0
+        self.read = set()
+        self.written = set()
+        # variables that must hold an int when the trace starts
+        self.guarded = set()
+
+    def __str__(self) -> str:
+        return 'TraceBuilder({amount} lines)'.format(
+            amount = len(self.lines)
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # operand :: support.Node -> Union[str, None]
+    def operand(self, node : support.Node) -> Union[str, None]:
+        """operand function, python expression of a variable or int literal, None for anything else
+
+        Args:
+            node (support.Node): operand of a statement
+
+        Returns:
+            Union[str, None]: expression of the operand
+        """
+        if type(node) is support.VariableNode and node.token_type == enums.token_types.VAR:
+            self.readSlot(node.slot)
+            return "s" + str(node.slot)
+        if type(node) is support.Node and type(node.value) is int:
+            return repr(node.value)
+        return None
+
+    # readSlot :: int -> None
+    def readSlot(self, slot : int) -> None:
+        if slot not in self.written:
+            self.guarded.add(slot)
+        self.read.add(slot)
+
+    # writeSlot :: int -> None
+    def writeSlot(self, slot : int) -> None:
+        self.written.add(slot)
+        self.read.add(slot)
+
+    # condition :: support.ConditionNode -> Union[str, None]
+    def condition(self, node : support.ConditionNode) -> Union[str, None]:
+        lhs = self.operand(node.value)
+        rhs = self.operand(node.condition)
+        if lhs is None or rhs is None or node.token_type not in pycode.condition_operators:
+            return None
+        return lhs + " " + pycode.condition_operators[node.token_type][1] + " " + rhs
+
+    # exit :: int, str, int -> None
+    def exit(self, program_counter : int, indent : str, ran : int) -> None:
+        # the variables written later in the loop are known once al statements are added, see source
+        self.lines.append((indent, program_counter, ran))
+
+    # source :: int -> str
+    def source(self, target : int) -> str:
+        """source function, python source of the trace function
+
+        Args:
+            target (int): index of the statement the loop jumps back to, returned when the guard at the start fails
+
+        Returns:
+            str: source that defines trace(values, write, passes), which gives back the index to continue with and the statements that ran
+        """
+        lines = ["def trace(values, write, passes):"]
+        lines += ["    s" + str(slot) + " = values[" + str(slot) + "]" for slot in sorted(self.read)]
+        if self.guarded:
+            checks = " or ".join("type(s" + str(slot) + ") is not int" for slot in sorted(self.guarded))
+            lines += ["    if " + checks + ":", "        return " + str(target) + ", 0"]
+        # the statements that ran follow from the passes that are left, the loop itself only counts passes
+        lines.append("    start = passes")
+        lines.append("    while passes:")
+        lines.append("        passes -= 1")
+        for line in self.lines:
+            if type(line) is str:
+                lines.append(line)
+                continue
+            indent, program_counter, ran = line
+            lines += [indent + "values[" + str(slot) + "] = s" + str(slot) for slot in sorted(self.written)]
+            lines.append(indent + "return " + str(program_counter) + ", (start - passes - 1) * " + str(self.statements) + " + " + str(ran))
+        lines += ["    values[" + str(slot) + "] = s" + str(slot) for slot in sorted(self.written)]
+        lines.append("    return " + str(target) + ", start * " + str(self.statements))
+        return "\n".join(lines) + "\n"
+
+# buildStatement :: TraceBuilder, support.Node, int, Union[bool, int, None] -> bool
+def buildStatement(builder : TraceBuilder, node : support.Node, program_counter : int, outcome : Union[bool, int, None]) -> bool:
+    """buildStatement function, adds the python code of one recorded statement to the trace
+
+    Args:
+        builder (TraceBuilder): trace that is generated
+        node (support.Node): statement that ran
+        program_counter (int): index of the statement
+        outcome (Union[bool, int, None]): outcome of a BranchNode, the jump of a LINE statement
+
+    Returns:
+        bool: False when the statement can not be part of a trace
+    """
+    indent = "        "
+    if type(node) is peephole.BranchNode:
+        condition = builder.condition(node.condition)
+        if condition is None:
+            return False
+        builder.readSlot(node.value.slot)
+        builder.lines.append(indent + "if " + ("not " if outcome else "") + "(" + condition + "):")
+        builder.exit(node.target_false if outcome else node.target_true, indent + "    ", builder.statements + 1)
+        return True
+
+    if type(node) is support.MathNode:
+        rhs = builder.operand(node.rhs)
+        if rhs is None or node.token_type not in pycode.math_operators or pycode.math_operators[node.token_type][1] is None:
+            return False
+        builder.readSlot(node.value.slot)
+        builder.writeSlot(node.value.slot)
+        name = "s" + str(node.value.slot)
+        builder.lines.append(indent + name + " = " + name + " " + pycode.math_operators[node.token_type][1] + " " + rhs)
+        return True
+
+    if type(node) is support.IfNode:
+        condition = builder.condition(node.condition)
+        new_values = [node.value if new_value is None else new_value for new_value in (node.new_value_true, node.new_value_false)]
+        new_values = [builder.operand(new_value) for new_value in new_values]
+        if condition is None or None in new_values:
+            return False
+        # the if statement gives an error on a variable without a value
+        builder.readSlot(node.value.slot)
+        builder.writeSlot(node.value.slot)
+        builder.lines.append(indent + "s" + str(node.value.slot) + " = " + new_values[0] + " if " + condition + " else " + new_values[1])
+        return True
+
+    if type(node) is not support.VariableNode:
+        return False
+    token_type = node.token_type
+    if token_type == enums.token_types.DECLARE:
+        return True
+    if token_type == enums.token_types.LINE:
+        if node.value.token_type != enums.token_types.VAR:
+            return type(node.value.value) is int
+        jump = builder.operand(node.value)
+        if jump is None:
+            return False
+        builder.lines.append(indent + "if " + jump + " != " + repr(outcome) + ":")
+        builder.exit(program_counter, indent + "    ", builder.statements)
+        return True
+    if token_type == enums.token_types.OUT:
+        value = builder.operand(node.value)
+        if value is None:
+            if type(node.value) is not support.Node or node.value.token_type != enums.token_types.STRING:
+                return False
+            value = repr(node.value.value)
+        builder.lines.append(indent + "write(" + value + ")")
+        return True
+    if token_type == enums.token_types.VAR or token_type == enums.token_types.OUTPUT:
+        if type(node.value) is support.Node and node.value.token_type != enums.token_types.INPUT and node.value.value != "INPUT":
+            # a literal keeps the value the variable already has, the guard makes sure it has one
+            builder.readSlot(node.slot)
+            return True
+        value = builder.operand(node.value)
+        if value is None:
+            return False
+        builder.writeSlot(node.slot)
+        builder.lines.append(indent + "s" + str(node.slot) + " = " + value)
+        return True
+    return False
+
+# compileTrace :: List[support.Node], int, List[Tuple[int, Union[bool, int, None]]] -> Union[Trace, None]
+def compileTrace(node_list : List[support.Node], target : int, path : List[Tuple[int, Union[bool, int, None]]]) -> Union[Trace, None]:
+    """compileTrace function, compiles the statements of one pass through a loop to a python function
+
+    Args:
+        node_list (List[support.Node]): statements of the code block
+        target (int): index of the statement the loop jumps back to
+        path (List[Tuple[int, Union[bool, int, None]]]): index and outcome of every statement of the pass, from Interpreter.recordLoop
+
+    Returns:
+        Union[Trace, None]: the compiled loop, None when a statement can not be traced
+    """
+    builder = TraceBuilder()
+    for program_counter, outcome in path:
+        if not buildStatement(builder, node_list[program_counter], program_counter, outcome):
+            return None
+        builder.statements += 1
+    source = builder.source(target)
+    namespace = {}
+    exec(pycode.compileSource(source), namespace)
+    return Trace(target, source, namespace["trace"], builder.statements)
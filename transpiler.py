@@ -0,0 +1,484 @@
+from typing import List, Union, Tuple, Set
+import argparse
+import operator
+import re
+import types
+
+import enums
+import support
+import symbol_table
+import interpreter
+import pycode
+import vm
+import closures
+import sinks
+import parse_cache
+
+# outcomes of conditions on values that are not both ints
+compare = vm.VirtualMachine().compare
+
+# unset :: str, int -> None
+def unset(variable_name : str, line_nr : int) -> None:
+    raise closures.Halt(support.Error("Var " + variable_name + " has no value", line_nr))
+
+# mixedMath :: Callable, support.lit_types, support.lit_types, int, str, str -> support.lit_types
+def mixedMath(function, lhs : support.lit_types, rhs : support.lit_types, line_nr : int, lhs_name : str, rhs_name : str) -> support.lit_types:
+    """mixedMath function, math statement on values that are not both ints, the same outcomes as the vm
+
+    Args:
+        function (Callable): operator of the statement
+        lhs (support.lit_types): value of the variable that is changed
+        rhs (support.lit_types): value of the right hand side
+        line_nr (int): line number of the statement
+        lhs_name (str): name of the variable that is changed, for the error when it has no value
+        rhs_name (str): name of the right hand side, for the error when it has no value
+
+    Returns:
+        support.lit_types: new value of the variable
+    """
+    if lhs is None:
+        unset(lhs_name, line_nr)
+    if rhs is None:
+        unset(rhs_name, line_nr)
+    try:
+        return function(interpreter.toOperand(lhs), interpreter.toOperand(rhs))
+    except TypeError:
+        raise closures.Halt(support.Error("cant use operator on variables of different type", line_nr))
+
+# mixedCompare :: Callable, support.lit_types, support.lit_types, int, str, str -> Union[bool, None]
+def mixedCompare(function, lhs : support.lit_types, rhs : support.lit_types, line_nr : int, lhs_name : str, rhs_name : str) -> Union[bool, None]:
+    if lhs is None:
+        unset(lhs_name, line_nr)
+    if rhs is None:
+        unset(rhs_name, line_nr)
+    return compare(function, interpreter.toOperand(lhs), interpreter.toOperand(rhs))
+
+# lineJump :: int, support.lit_types, int, int, str -> int
+def lineJump(index : int, value : support.lit_types, length : int, line_nr : int, variable_name : str) -> int:
+    if value is None:
+        unset(variable_name, line_nr)
+    if type(value) is not int:
+        text = str(value)
+        if not text.lstrip("-").isnumeric():
+            raise closures.Halt(support.Error("Line number to jump to not int", line_nr))
+        value = int(text)
+    return vm.jumpTarget(index, value, length)
+
+# calls nested this deep run directly on the python stack, deeper calls run on trampoline
+direct_depth = 200
+
+# trampoline :: types.GeneratorType, int, int, int -> support.lit_types
+def trampoline(generator : types.GeneratorType, depth : int, line_nr : int, max_depth : int) -> support.lit_types:
+    """trampoline function, runs the generator of a function in which a call yields the generator of its callee instead of calling it
+
+    The callers that wait for their callee are kept in a list and not on the python stack,
+    so a program can nest its calls deeper than the recursion limit of python.
+
+    Args:
+        generator (types.GeneratorType): generator of the called function
+        depth (int): amount of function calls that wait for their callee, the caller included
+        line_nr (int): line number of the call
+        max_depth (int): amount of function calls that may wait for their callee
+
+    Returns:
+        support.lit_types: output of the called function, errors stop the program with closures.Halt
+    """
+    if depth >= max_depth:
+        raise closures.Halt(support.Error("function calls nested deeper than " + str(max_depth), line_nr))
+    stack = []
+    value = None
+    while True:
+        try:
+            callee, line_nr = generator.send(value)
+        except StopIteration as stop:
+            if not stack:
+                return stop.value
+            generator = stack.pop()
+            value = stop.value
+            continue
+        if depth + 1 + len(stack) >= max_depth:
+            raise closures.Halt(support.Error("function calls nested deeper than " + str(max_depth), line_nr))
+        stack.append(generator)
+        generator = callee
+        value = None
+
+# names the generated code can use besides the functions it defines
+runtime = {
+    "Halt" : closures.Halt,
+    "unset" : unset,
+    "mixedMath" : mixedMath,
+    "mixedCompare" : mixedCompare,
+    "lineJump" : lineJump,
+    "add" : operator.add,
+    "sub" : operator.sub,
+    "mul" : operator.mul,
+    "divide" : support.divide,
+    "gt" : operator.gt,
+    "lt" : operator.lt,
+    "eq" : operator.eq,
+    "ge" : operator.ge,
+    "le" : operator.le,
+    "ne" : operator.ne,
+}
+
+# identifier :: str -> str
+def identifier(name : str) -> str:
+    return re.sub(r"\W", "_", name)
+
+class Body(object):
+    """Body class, python names of the variables of one code block while it is transpiled"""
+    def __init__(self, scope : symbol_table.Scope):
+        """__init__ for Body
+
+        Args:
+            scope (symbol_table.Scope): resolved scope of the code block
+        """
+        self.scope = scope
+        self.names = {}
+        for variable_name in scope.slot_names:
+            self.variable(variable_name)
+
+    def __str__(self) -> str:
+        return 'Body({name}: {names})'.format(
+            name = self.scope.name,
+            names = ", ".join(self.names.values())
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # variable :: str -> str
+    def variable(self, variable_name : str) -> str:
+        name = self.names.get(variable_name)
+        if name is None:
+            name = "v" + str(len(self.names)) + "_" + identifier(variable_name)
+            self.names[variable_name] = name
+        return name
+
+class Transpiler(object):
+    """Transpiler class, turns a parsed tree into python source
+
+    Every function becomes a def and the main code becomes run_main. A code block without
+    LINE statements is straight line code, otherwise it is a while loop over a program
+    counter with an if chain over the places a jump can land. Values are plain ints and
+    strings and the outcomes are the same as the vm, errors stop the program with closures.Halt.
+    A function that calls a function gets a second def, gen_ next to fn_, that is a generator:
+    fn_ calls fn_ directly up to direct_depth nested calls and then runs gen_ on trampoline,
+    a call in gen_ yields the gen_ of the callee and the line of the call to trampoline.
+    """
+    def __init__(self):
+        self.errors = []
+        self.found_funcs = {}
+        # functions that call a function and so have a generator
+        self.generators = set()
+        # whether the code block that is transpiled is a generator
+        self.generating = False
+
+    def __str__(self) -> str:
+        return 'Transpiler()'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # transpile :: List[support.Node], dict -> Tuple[str, List[support.Error]]
+    def transpile(self, tree : List[support.Node], found_funcs : dict) -> Tuple[str, List[support.Error]]:
+        """transpile function, python source of a program
+
+        Args:
+            tree (List[support.Node]): parsed main code
+            found_funcs (dict): al found functions
+
+        Returns:
+            Tuple[str, List[support.Error]]: source, and the errors it raises by index as the name errors
+        """
+        self.errors = []
+        self.found_funcs = found_funcs
+        self.generators = {function_name for function_name, function in found_funcs.items() if self.hasCalls(function.commands)}
+        table = symbol_table.resolveSlots(tree, found_funcs)
+        lines = []
+        for function_name, function in found_funcs.items():
+            for generating in [False, True] if function_name in self.generators else [False]:
+                self.generating = generating
+                body = Body(table.scope(function_name))
+                lines += ["def " + ("gen_" if generating else "fn_") + identifier(function_name) + "(INPUT" + ("" if generating else ", depth") + "):"]
+                lines += self.transpileBlock(body, [None] + function.commands, "INPUT")
+                output = body.variable("OUTPUT")
+                lines += ["    if " + output + " is None:",
+                          "        raise Halt(errors[" + str(self.error(support.Error("No output specified in function", function.line_nr))) + "])",
+                          "    return " + output,
+                          ""]
+        self.generating = False
+        body = Body(table.main)
+        lines += ["def run_main():", "    depth = 0"]
+        lines += self.transpileBlock(body, tree, None)
+        variables = ", ".join("(" + repr(variable_name) + ", " + name + ")" for variable_name, name in body.names.items())
+        lines += ["    return {name : value for name, value in (" + variables + (",)" if len(body.names) == 1 else ")") + " if value is not None}", ""]
+        return "\n".join(lines), self.errors
+
+    # hasCalls :: List[support.Node] -> bool
+    def hasCalls(self, node_list : List[support.Node]) -> bool:
+        return any(type(node) is support.FunctionCall and node.value in self.found_funcs for node in node_list)
+
+    # error :: support.Error -> int
+    def error(self, error : support.Error) -> int:
+        self.errors.append(error)
+        return len(self.errors) - 1
+
+    # jumpTargets :: List[support.Node] -> Union[Set[int], None]
+    def jumpTargets(self, node_list : List[support.Node]) -> Union[Set[int], None]:
+        """jumpTargets function, the statements a LINE statement can land on
+
+        A jump on a variable is known when the statement before it is an if statement that
+        gives that variable one of two ints, the loops and branches of the examples are written
+        like that, and no other jump lands on the LINE statement itself.
+
+        Args:
+            node_list (List[support.Node]): statements of the code block
+
+        Returns:
+            Union[Set[int], None]: indexes of the statements jumps land on, None when a jump can land anywhere
+        """
+        length = len(node_list)
+        targets = set()
+        guarded = []
+        for index, node in enumerate(node_list):
+            if node is None or node.token_type != enums.token_types.LINE or type(node) is not support.VariableNode:
+                continue
+            value = node.value
+            if value.token_type != enums.token_types.VAR:
+                jump = interpreter.toOperand(value.value)
+                if type(jump) is int:
+                    targets.add(vm.jumpTarget(index, jump, length))
+                continue
+            previous = node_list[index - 1] if index > 0 else None
+            if type(previous) is not support.IfNode or previous.value.variable_name != value.variable_name:
+                return None
+            condition = previous.condition
+            # an if statement on strings can leave the variable unchanged, then it is the compared string and not a line number
+            if condition.token_type != enums.token_types.EQUAL and condition.token_type != enums.token_types.NOTEQUAL and \
+                    not (condition.value.token_type == enums.token_types.VAR and condition.value.variable_name == value.variable_name):
+                return None
+            for new_value in (previous.new_value_true, previous.new_value_false):
+                if new_value is None or new_value.token_type == enums.token_types.VAR or type(new_value.value) is not int:
+                    return None
+                targets.add(vm.jumpTarget(index, new_value.value, length))
+            guarded.append(index)
+        if any(index in targets for index in guarded):
+            return None
+        return targets
+
+    # transpileBlock :: Body, List[support.Node], str -> List[str]
+    def transpileBlock(self, body : Body, node_list : List[support.Node], input_name : str) -> List[str]:
+        """transpileBlock function, python lines of the body of a def, indented once
+
+        Args:
+            body (Body): python names of the variables of the code block
+            node_list (List[support.Node]): statements of the code block, None for the INPUT assignment of a function
+            input_name (str): parameter with the input of a function, None for the main code
+
+        Returns:
+            List[str]: lines of the body
+        """
+        length = len(node_list)
+        statements = [[] if node is None else self.transpileStatement(body, node, index, length) for index, node in enumerate(node_list)]
+        lines = ["    " + name + " = None" for name in body.names.values()]
+        if input_name is not None:
+            lines += ["    " + body.variable("INPUT") + " = " + input_name]
+
+        has_jumps = any(node is not None and node.token_type == enums.token_types.LINE and type(node) is support.VariableNode for node in node_list)
+        if not has_jumps:
+            for statement in statements:
+                lines += ["    " + line for line in statement]
+            return lines + ["    pass"]
+
+        targets = self.jumpTargets(node_list)
+        if targets is None:
+            leaders = set(range(length))
+        else:
+            leaders = {0} | {target for target in targets if target < length}
+            leaders |= {index + 1 for index, node in enumerate(node_list) if node is not None and node.token_type == enums.token_types.LINE and index + 1 < length}
+        leaders = sorted(leaders)
+        lines += ["    pc = 0", "    while True:"]
+        for number, start in enumerate(leaders):
+            end = leaders[number + 1] if number + 1 < len(leaders) else length
+            lines += ["        " + ("if" if number == 0 else "elif") + " pc == " + str(start) + ":"]
+            for index in range(start, end):
+                lines += ["            " + line for line in statements[index]]
+            last = node_list[end - 1]
+            if last is None or last.token_type != enums.token_types.LINE:
+                lines += ["            pc = " + str(end)]
+        lines += ["        else:", "            break"]
+        return lines
+
+    # operand :: Body, support.Node -> str
+    def operand(self, body : Body, node : support.Node) -> str:
+        if node.token_type == enums.token_types.VAR:
+            return body.variable(node.variable_name)
+        return repr(support.literalValue(node.value))
+
+    # intCheck :: support.Node, str -> Union[str, bool]
+    def intCheck(self, node : support.Node, name : str) -> Union[str, bool]:
+        """intCheck function, test the int fast path needs for one operand
+
+        Args:
+            node (support.Node): variable or literal
+            name (str): python expression of the operand
+
+        Returns:
+            Union[str, bool]: python test for a variable, True for an int literal, False for another literal
+        """
+        if node.token_type == enums.token_types.VAR:
+            return "type(" + name + ") is int"
+        return type(support.literalValue(node.value)) is int
+
+    # check :: Body, support.Node -> List[str]
+    def check(self, body : Body, node : support.Node) -> List[str]:
+        if node.token_type == enums.token_types.VAR:
+            return ["if " + body.variable(node.variable_name) + " is None:", "    unset(" + repr(node.variable_name) + ", " + str(node.line_nr) + ")"]
+        return []
+
+    # transpileStatement :: Body, support.Node, int, int -> List[str]
+    def transpileStatement(self, body : Body, node : support.Node, index : int, length : int) -> List[str]:
+        """transpileStatement function, python lines of a single statement
+
+        Args:
+            body (Body): python names of the variables of the code block
+            node (support.Node): statement to transpile
+            index (int): index of the statement in the code block
+            length (int): amount of statements in the code block
+
+        Returns:
+            List[str]: lines of the statement, not indented, a LINE statement sets pc
+        """
+        line_nr = node.line_nr
+        node_type = type(node)
+
+        if node_type is support.MathNode:
+            operator_names = pycode.math_operators.get(node.token_type)
+            if operator_names is None:
+                return ["raise Halt(errors[" + str(self.error(support.Error("unknown operator in Math statement", line_nr))) + "])"]
+            function, symbol = operator_names
+            target = body.variable(node.value.variable_name)
+            rhs = self.operand(body, node.rhs)
+            rhs_name = node.rhs.variable_name if node.rhs.token_type == enums.token_types.VAR else rhs
+            fast_check = self.intCheck(node.rhs, rhs)
+            fast = target + " = " + (target + " " + symbol + " " + rhs if symbol is not None else function + "(" + target + ", " + rhs + ")")
+            slow = target + " = mixedMath(" + function + ", " + target + ", " + rhs + ", " + str(line_nr) + ", " + repr(node.value.variable_name) + ", " + repr(str(rhs_name)) + ")"
+            if fast_check is False:
+                return [slow]
+            fast_check = "type(" + target + ") is int" + ("" if fast_check is True else " and " + fast_check)
+            return ["if " + fast_check + ":", "    " + fast, "else:", "    " + slow]
+
+        elif node_type is support.IfNode:
+            condition = node.condition
+            operator_names = pycode.condition_operators.get(condition.token_type)
+            if operator_names is None:
+                return ["raise Halt(errors[" + str(self.error(support.Error("unknown operator in condition statement", line_nr))) + "])"]
+            function, symbol = operator_names
+            lhs = self.operand(body, condition.value)
+            rhs = self.operand(body, condition.condition)
+            lhs_name = condition.value.variable_name if condition.value.token_type == enums.token_types.VAR else lhs
+            rhs_name = condition.condition.variable_name if condition.condition.token_type == enums.token_types.VAR else rhs
+            target = body.variable(node.value.variable_name)
+            slow = "outcome = mixedCompare(" + function + ", " + lhs + ", " + rhs + ", " + str(line_nr) + ", " + repr(str(lhs_name)) + ", " + repr(str(rhs_name)) + ")"
+            fast_checks = [self.intCheck(side, name) for side, name in ((condition.value, lhs), (condition.condition, rhs))]
+            if False in fast_checks:
+                lines = [slow]
+            else:
+                lines = ["if " + " and ".join(check for check in fast_checks if check is not True) + ":",
+                         "    outcome = " + lhs + " " + symbol + " " + rhs,
+                         "else:",
+                         "    " + slow]
+            lines += ["if outcome:"]
+            lines += ["    " + line for line in self.check(body, node.new_value_true)]
+            lines += ["    " + target + " = " + self.operand(body, node.new_value_true)]
+            if node.new_value_false is not None:
+                lines += ["elif outcome is not None:"]
+                lines += ["    " + line for line in self.check(body, node.new_value_false)]
+                lines += ["    " + target + " = " + self.operand(body, node.new_value_false)]
+            return lines
+
+        elif node_type is support.FunctionCall:
+            if node.value not in self.found_funcs:
+                return ["raise Halt(errors[" + str(self.error(support.Error("function " + node.value + " not declared", line_nr))) + "])"]
+            name = identifier(node.value)
+            input = self.operand(body, node.input)
+            if node.value not in self.generators:
+                # gen_ has no depth, a function without calls never passes it on
+                call = "fn_" + name + "(" + input + (", 0)" if self.generating else ", depth + 1)")
+            elif self.generating:
+                call = "yield gen_" + name + "(" + input + "), " + str(line_nr)
+            else:
+                call = "fn_" + name + "(" + input + ", depth + 1) if depth < direct_depth else trampoline(gen_" + name + "(" + input + "), depth, " + str(line_nr) + ")"
+            return self.check(body, node.input) + [body.variable(node.output.variable_name) + " = " + call]
+
+        elif node_type is support.VariableNode:
+            token_type = node.token_type
+            value = node.value
+            if token_type == enums.token_types.VAR or token_type == enums.token_types.OUTPUT:
+                target = body.variable(node.variable_name)
+                if value.value == "INPUT" or value.token_type == enums.token_types.INPUT:
+                    source = support.VariableNode("INPUT", None, line_nr, enums.token_types.VAR)
+                    return self.check(body, source) + [target + " = " + body.variable("INPUT")]
+                elif value.token_type == enums.token_types.VAR:
+                    return self.check(body, value) + [target + " = " + body.variable(value.variable_name)]
+                # assigning a literal to an existing variable keeps its value
+                return ["if " + target + " is None:", "    " + target + " = " + self.operand(body, value)]
+
+            elif token_type == enums.token_types.OUT:
+                return self.check(body, value) + ["write(" + self.operand(body, value) + ")"]
+
+            elif token_type == enums.token_types.LINE:
+                if value.token_type == enums.token_types.VAR:
+                    return ["pc = lineJump(" + str(index) + ", " + body.variable(value.variable_name) + ", " + str(length) + ", " + str(line_nr) + ", " + repr(value.variable_name) + ")"]
+                jump = interpreter.toOperand(value.value)
+                if type(jump) is not int:
+                    return ["raise Halt(errors[" + str(self.error(support.Error("Line number to jump to not int", line_nr))) + "])"]
+                return ["pc = " + str(vm.jumpTarget(index, jump, length))]
+
+            elif token_type == enums.token_types.ERR:
+                return ["raise Halt(errors[" + str(self.error(support.Error(value, line_nr))) + "])"]
+
+        elif node_type is support.FunctionNode:
+            return ["raise Halt(errors[" + str(self.error(support.Error("function " + node.value + " has no END", line_nr))) + "])"]
+
+        return []
+
+# run :: List[support.Node], dict, sinks.Sink, int -> Union[support.Error, dict]
+def run(tree : List[support.Node], found_funcs : dict, sink : sinks.Sink = None, max_depth : int = 100000) -> Union[support.Error, dict]:
+    """run function, transpiles a program to python and runs it
+
+    Args:
+        tree (List[support.Node]): parsed main code
+        found_funcs (dict): al found functions
+        sink (sinks.Sink, optional): where OUT statements write to. Defaults to sinks.current().
+        max_depth (int, optional): amount of function calls that may wait for their callee. Defaults to 100000.
+
+    Returns:
+        Union[support.Error, dict]: the first error or the variables of the main code after the last statement
+    """
+    source, errors = Transpiler().transpile(tree, found_funcs)
+    namespace = dict(runtime)
+    namespace["errors"] = errors
+    namespace["write"] = (sinks.current() if sink is None else sink).write
+    namespace["direct_depth"] = min(direct_depth, max_depth)
+    namespace["trampoline"] = lambda generator, depth, line_nr: trampoline(generator, depth, line_nr, max_depth)
+    exec(pycode.compileSource(source), namespace)
+    try:
+        return namespace["run_main"]()
+    except closures.Halt as halt:
+        return halt.error
+
+def transpile():
+    argument_parser = argparse.ArgumentParser(description="prints the python source of a FROM HERE TO THERE program")
+    argument_parser.add_argument("file", nargs="?", default="code.txt", help="program to transpile")
+    arguments = argument_parser.parse_args()
+
+    tree, found_funcs = parse_cache.ParseCache().parseFile(arguments.file)
+    if len(tree) == 1 and type(tree[0]) == support.Error:
+        print(tree[0])
+    else:
+        print(Transpiler().transpile(tree, found_funcs)[0])
+
+if __name__ == "__main__":
+    transpile()
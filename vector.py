@@ -0,0 +1,294 @@
+from typing import Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import enums
+import support
+import symbol_table
+import interpreter
+import memo
+import vm
+
+class BatchInterpreter(object):
+    """BatchInterpreter class, runs one function over a whole array of inputs in lockstep
+
+    Every variable is a column with a value per input (a lane), math statements and
+    conditions are numpy operations on the lanes that are at that statement. Each lane
+    has its own program counter, the statement with the lowest program counter runs next
+    for al lanes that are at it, so lanes that jump to different lines wait for each other
+    instead of splitting the batch. A call runs the called function as a batch of its own
+    over the inputs of the lanes that make it that it has not seen before, the outputs
+    are kept per function, so recursion like fib runs each input once.
+
+    Only pure functions with int values run in a batch: OUT would print in a different
+    order and division gives floats. Values are 64 bit ints, larger results wrap around.
+    """
+    def __init__(self, found_funcs : dict = {}):
+        """__init__ for BatchInterpreter
+
+        Args:
+            found_funcs (dict, optional): al found functions. Defaults to {}.
+        """
+        self.found_funcs = found_funcs
+        self.scopes = {}
+        self.bodies = {}
+        self.known = {}
+
+    def __str__(self) -> str:
+        return 'BatchInterpreter({functions})'.format(
+            functions = ", ".join(self.found_funcs)
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # run :: str, Iterable[int] -> Union[support.Error, numpy.ndarray]
+    def run(self, function_name : str, inputs) -> Union[support.Error, "numpy.ndarray"]:
+        """run function, calls a function for every input
+
+        Args:
+            function_name (str): name of the function to call
+            inputs (Iterable[int]): inputs, anything numpy.asarray takes
+
+        Returns:
+            Union[support.Error, numpy.ndarray]: the first error or the outputs in the order of the inputs
+        """
+        function = self.found_funcs.get(function_name)
+        if function is None:
+            return support.Error("function " + function_name + " not declared", 0)
+        if numpy is None:
+            return support.Error("batch mode needs numpy", function.line_nr)
+        if function_name not in memo.pureFunctions(self.found_funcs):
+            return support.Error("batch mode only runs pure functions, " + function_name + " has OUT or ERR", function.line_nr)
+        inputs = numpy.asarray(inputs)
+        if inputs.dtype.kind not in "iu":
+            return support.Error("batch mode only runs int inputs", function.line_nr)
+
+        table = symbol_table.resolveSlots([], self.found_funcs)
+        self.scopes = table.scopes
+        self.known = {}
+        # the same INPUT assignment as Interpreter.run, kept so the jumps count the same statements
+        self.bodies = {name : [support.VariableNode("INPUT", None, found.line_nr, enums.token_types.DECLARE)] + found.commands
+                       for name, found in self.found_funcs.items()}
+        try:
+            return self.call(function, inputs.astype(numpy.int64).ravel())
+        except RecursionError:
+            return support.Error("function calls nested too deep for batch mode", function.line_nr)
+
+    # call :: support.FunctionNode, numpy.ndarray -> Union[support.Error, numpy.ndarray]
+    def call(self, function : support.FunctionNode, inputs : "numpy.ndarray") -> Union[support.Error, "numpy.ndarray"]:
+        """call function, runs a function for the inputs it has not seen before and looks the others up
+
+        Args:
+            function (support.FunctionNode): function to run
+            inputs (numpy.ndarray): input per lane
+
+        Returns:
+            Union[support.Error, numpy.ndarray]: the first error or the output per lane
+        """
+        distinct, lanes_of = numpy.unique(inputs, return_inverse=True)
+        known_inputs, known_outputs = self.known.get(function.value, (numpy.empty(0, dtype=numpy.int64), numpy.empty(0, dtype=numpy.int64)))
+        positions = numpy.searchsorted(known_inputs, distinct)
+        found = known_inputs[numpy.minimum(positions, max(len(known_inputs) - 1, 0))] == distinct if len(known_inputs) > 0 else numpy.zeros(len(distinct), dtype=bool)
+        new_inputs = distinct[~found]
+        if len(new_inputs) > 0:
+            new_outputs = self.execute(function, new_inputs)
+            if type(new_outputs) is support.Error:
+                return new_outputs
+            # a recursive call may have added outputs in the meantime
+            known_inputs, known_outputs = self.known.get(function.value, (known_inputs[:0], known_outputs[:0]))
+            known_inputs, first = numpy.unique(numpy.concatenate([known_inputs, new_inputs]), return_index=True)
+            known_outputs = numpy.concatenate([known_outputs, new_outputs])[first]
+            self.known[function.value] = (known_inputs, known_outputs)
+            positions = numpy.searchsorted(known_inputs, distinct)
+        return known_outputs[positions][lanes_of]
+
+    # execute :: support.FunctionNode, numpy.ndarray -> Union[support.Error, numpy.ndarray]
+    def execute(self, function : support.FunctionNode, inputs : "numpy.ndarray") -> Union[support.Error, "numpy.ndarray"]:
+        """execute function, runs the body of a function with a program counter per lane
+
+        Args:
+            function (support.FunctionNode): function to run
+            inputs (numpy.ndarray): input per lane
+
+        Returns:
+            Union[support.Error, numpy.ndarray]: the first error or the value of OUTPUT per lane
+        """
+        scope = self.scopes[function.value]
+        node_list = self.bodies[function.value]
+        program_length = len(node_list)
+        values = numpy.zeros((len(scope.slot_names), len(inputs)), dtype=numpy.int64)
+        is_set = numpy.zeros((len(scope.slot_names), len(inputs)), dtype=bool)
+        values[scope.input_slot] = inputs
+        is_set[scope.input_slot] = True
+        program_counters = numpy.zeros(len(inputs), dtype=numpy.int64)
+
+        while True:
+            waiting = program_counters[program_counters < program_length]
+            if len(waiting) == 0:
+                break
+            index = int(waiting.min())
+            lanes = numpy.flatnonzero(program_counters == index)
+            error = self.step(node_list[index], index, program_length, scope, lanes, values, is_set, program_counters)
+            if error is not None:
+                return error
+
+        if not is_set[scope.output_slot].all():
+            return support.Error("No output specified in function", function.line_nr)
+        return values[scope.output_slot]
+
+    # operand :: support.Node, numpy.ndarray, numpy.ndarray, numpy.ndarray -> Union[support.Error, numpy.ndarray, int]
+    def operand(self, node : support.Node, lanes : "numpy.ndarray", values : "numpy.ndarray", is_set : "numpy.ndarray") -> Union[support.Error, "numpy.ndarray", int]:
+        """operand function, value of a variable or literal for the given lanes
+
+        Args:
+            node (support.Node): variable or literal to read
+            lanes (numpy.ndarray): lanes to read it for
+            values (numpy.ndarray): variables by slot and lane
+            is_set (numpy.ndarray): which variables have a value in which lane
+
+        Returns:
+            Union[support.Error, numpy.ndarray, int]: column of values, the literal itself, or an error
+        """
+        if node.token_type == enums.token_types.VAR:
+            if not is_set[node.slot, lanes].all():
+                return support.Error("Var " + node.variable_name + " has no value", node.line_nr)
+            return values[node.slot, lanes]
+        if type(node.value) is not int:
+            return support.Error("batch mode only runs int values", node.line_nr)
+        return node.value
+
+    # jumpTargets :: int, numpy.ndarray, int -> numpy.ndarray
+    def jumpTargets(self, index : int, jumps : "numpy.ndarray", length : int) -> "numpy.ndarray":
+        """jumpTargets function, vm.jumpTarget for a column of jumps
+
+        Args:
+            index (int): index of the LINE statement
+            jumps (numpy.ndarray): amount of lines to jump per lane
+            length (int): amount of statements in the code block
+
+        Returns:
+            numpy.ndarray: statement every lane lands on
+        """
+        remaining = length - index - 1
+        forward = numpy.where(jumps > remaining, length, numpy.where(jumps == 0, length - 1 if remaining > 0 else length, index + jumps))
+        backward = index + jumps
+        backward = numpy.where(backward < 0, numpy.maximum(length + backward, 0), backward)
+        return numpy.where(jumps >= 0, forward, backward)
+
+    # step :: support.Node, int, int, symbol_table.Scope, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray -> Union[support.Error, None]
+    def step(self, node : support.Node, index : int, length : int, scope : symbol_table.Scope, lanes : "numpy.ndarray", values : "numpy.ndarray", is_set : "numpy.ndarray", program_counters : "numpy.ndarray") -> Union[support.Error, None]:
+        """step function, runs one statement for al lanes that are at it and moves their program counters
+
+        Args:
+            node (support.Node): statement to run
+            index (int): index of the statement in the function body
+            length (int): amount of statements in the function body
+            scope (symbol_table.Scope): scope of the function body
+            lanes (numpy.ndarray): lanes that are at the statement
+            values (numpy.ndarray): variables by slot and lane
+            is_set (numpy.ndarray): which variables have a value in which lane
+            program_counters (numpy.ndarray): program counter per lane
+
+        Returns:
+            Union[support.Error, None]: the first error, None when the statement ran
+        """
+        line_nr = node.line_nr
+        node_type = type(node)
+
+        if node_type is support.MathNode:
+            if node.token_type == enums.token_types.DIV:
+                return support.Error("batch mode does not run division, it gives floats", line_nr)
+            function = interpreter.math_functions.get(node.token_type)
+            if function is None:
+                return support.Error("unknown operator in Math statement", line_nr)
+            target = node.value.slot
+            if not is_set[target, lanes].all():
+                return support.Error("Math statement on unknown variable", line_nr)
+            rhs = self.operand(node.rhs, lanes, values, is_set)
+            if type(rhs) is support.Error:
+                return rhs
+            values[target, lanes] = function(values[target, lanes], rhs)
+
+        elif node_type is support.IfNode:
+            condition = node.condition
+            function = interpreter.condition_functions.get(condition.token_type)
+            if function is None:
+                return support.Error("unknown operator in condition statement", line_nr)
+            lhs = self.operand(condition.value, lanes, values, is_set)
+            if type(lhs) is support.Error:
+                return lhs
+            rhs = self.operand(condition.condition, lanes, values, is_set)
+            if type(rhs) is support.Error:
+                return rhs
+            outcome = numpy.broadcast_to(function(lhs, rhs), lanes.shape)
+            target = node.value.slot
+            for new_value, taken in ((node.new_value_true, lanes[outcome]), (node.new_value_false, lanes[~outcome])):
+                if new_value is None or len(taken) == 0:
+                    continue
+                if not is_set[target, taken].all():
+                    return support.Error("if statement on undeclared variable", line_nr)
+                new_column = self.operand(new_value, taken, values, is_set)
+                if type(new_column) is support.Error:
+                    return new_column
+                values[target, taken] = new_column
+
+        elif node_type is support.FunctionCall:
+            callee = self.found_funcs.get(node.value)
+            if callee is None:
+                return support.Error("function " + node.value + " not declared", line_nr)
+            inputs = self.operand(node.input, lanes, values, is_set)
+            if type(inputs) is support.Error:
+                return inputs
+            outputs = self.call(callee, numpy.broadcast_to(inputs, lanes.shape))
+            if type(outputs) is support.Error:
+                return outputs
+            values[node.output.slot, lanes] = outputs
+            is_set[node.output.slot, lanes] = True
+
+        elif node_type is support.VariableNode:
+            token_type = node.token_type
+            value = node.value
+            if token_type == enums.token_types.LINE:
+                if value.token_type == enums.token_types.VAR:
+                    jumps = self.operand(value, lanes, values, is_set)
+                    if type(jumps) is support.Error:
+                        return jumps
+                    program_counters[lanes] = self.jumpTargets(index, jumps, length)
+                    return None
+                jump = interpreter.toOperand(value.value)
+                if type(jump) is not int:
+                    return support.Error("Line number to jump to not int", line_nr)
+                program_counters[lanes] = vm.jumpTarget(index, jump, length)
+                return None
+
+            elif token_type == enums.token_types.VAR or token_type == enums.token_types.OUTPUT:
+                target = node.slot
+                if value.value == "INPUT" or value.token_type == enums.token_types.INPUT:
+                    values[target, lanes] = values[scope.input_slot, lanes]
+                    is_set[target, lanes] = True
+                elif value.token_type == enums.token_types.VAR:
+                    column = self.operand(value, lanes, values, is_set)
+                    if type(column) is support.Error:
+                        return column
+                    values[target, lanes] = column
+                    is_set[target, lanes] = True
+                else: #literals, assigning one to an existing variable keeps its value
+                    literal = self.operand(value, lanes, values, is_set)
+                    if type(literal) is support.Error:
+                        return literal
+                    unset = lanes[~is_set[target, lanes]]
+                    values[target, unset] = literal
+                    is_set[target, unset] = True
+
+            elif token_type == enums.token_types.OUT or token_type == enums.token_types.ERR:
+                return support.Error("batch mode only runs pure functions", line_nr)
+
+        elif node_type is support.FunctionNode:
+            return support.Error("function " + node.value + " has no END", line_nr)
+
+        program_counters[lanes] = index + 1
+        return None
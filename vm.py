@@ -0,0 +1,441 @@
+from typing import List, Union, Tuple
+import array
+
+import enums
+import support
+import symbol_table
+import interpreter
+import sinks
+
+STORE_CONST = int(enums.op_codes.STORE_CONST)
+MOVE = int(enums.op_codes.MOVE)
+ARITH = int(enums.op_codes.ARITH)
+SELECT = int(enums.op_codes.SELECT)
+JUMP = int(enums.op_codes.JUMP)
+JUMP_VAR = int(enums.op_codes.JUMP_VAR)
+CALL = int(enums.op_codes.CALL)
+RETURN = int(enums.op_codes.RETURN)
+OUT = int(enums.op_codes.OUT)
+ERROR = int(enums.op_codes.ERROR)
+HALT = int(enums.op_codes.HALT)
+
+# jumpTarget :: int, int, int -> int
+def jumpTarget(index : int, jump : int, length : int) -> int:
+    """jumpTarget function, statement a LINE jump lands on, the same places as Visitor.visitAl
+
+    Args:
+        index (int): index of the LINE statement
+        jump (int): amount of lines to jump
+        length (int): amount of statements in the code block
+
+    Returns:
+        int: index of the next statement, length when the code block is done
+    """
+    if jump >= 0:
+        remaining = length - index - 1
+        if jump > remaining:
+            return length
+        if jump == 0:
+            return length - 1 if remaining > 0 else length
+        return index + jump
+    target = index + jump
+    if target < 0:
+        target = max(length + target, 0)
+    return target
+
+class Block(object):
+    """Block class, slot layout and addresses of one code block: the main code or a function body
+
+    Variables and constants share one numbered set of slots, the template holds the
+    constants and None for every variable, a new frame is a copy of it.
+    """
+    def __init__(self, name : str, line_nr : int, scope : symbol_table.Scope = None):
+        """__init__ for Block
+
+        Args:
+            name (str): name of the code block, the function name for function bodies
+            line_nr (int): line number of the code block, used for errors about the block as a whole
+            scope (symbol_table.Scope, optional): resolved scope of the code block, its variables keep their slots. Defaults to None.
+        """
+        self.name = name
+        self.line_nr = line_nr
+        self.slots = {}
+        self.constant_slots = {}
+        self.names = []
+        self.template = []
+        self.addresses = []
+        self.entry = 0
+        self.input_slot = None
+        self.output_slot = None
+        if scope is not None:
+            self.slots = dict(scope.slots)
+            self.names = list(scope.slot_names)
+            self.template = [None] * len(scope.slot_names)
+            self.input_slot = scope.input_slot
+            self.output_slot = scope.output_slot
+
+    def __str__(self) -> str:
+        return 'Block({name}, entry={entry}, slots={slots})'.format(
+            name = self.name,
+            entry = self.entry,
+            slots = len(self.template)
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # variable :: str -> int
+    def variable(self, variable_name : str) -> int:
+        slot = self.slots.get(variable_name)
+        if slot is None:
+            slot = len(self.template)
+            self.slots[variable_name] = slot
+            self.names.append(variable_name)
+            self.template.append(None)
+        return slot
+
+    # constant :: support.lit_types -> int
+    def constant(self, value : support.lit_types) -> int:
+        value = support.literalValue(value)
+        key = (type(value), value)
+        slot = self.constant_slots.get(key)
+        if slot is None:
+            slot = len(self.template)
+            self.constant_slots[key] = slot
+            self.names.append(None)
+            self.template.append(value)
+        return slot
+
+class Program(object):
+    """Program class, flat instruction array of the main code and al functions"""
+    def __init__(self):
+        self.code = []
+        self.lines = array.array("I")
+        self.owners = []
+        self.main = None
+        self.functions = {}
+
+    def __str__(self) -> str:
+        listing = []
+        for address, instruction in enumerate(self.code):
+            operands = [operand.name if type(operand) is Block else getattr(operand, "__name__", str(operand))
+                        for operand in instruction[1:] if type(operand) is not list]
+            listing.append('{address:5} [{line_nr}] {op} {operands}'.format(
+                address = address,
+                line_nr = self.lines[address],
+                op = enums.op_codes(instruction[0]).name,
+                operands = " ".join(operands)
+            ))
+        return "\n".join(listing)
+
+    def __repr__(self) -> str:
+        return 'Program({length} instructions, {functions} functions)'.format(
+            length = len(self.code),
+            functions = len(self.functions)
+        )
+
+    # emit :: tuple, int, Block -> int
+    def emit(self, instruction : tuple, line_nr : int, block : Block) -> int:
+        self.code.append(instruction)
+        self.lines.append(line_nr or 0)
+        self.owners.append(block)
+        return len(self.code) - 1
+
+class Compiler(object):
+    """Compiler class, lowers a parsed tree into a Program for the VirtualMachine"""
+    def __init__(self):
+        self.program = None
+
+    # compile :: List[support.Node], dict -> Program
+    def compile(self, tree : List[support.Node], found_funcs : dict) -> Program:
+        """compile function, lowers the main code and al functions into one instruction array
+
+        Args:
+            tree (List[support.Node]): parsed main code
+            found_funcs (dict): al found functions
+
+        Returns:
+            Program: compiled program
+        """
+        program = Program()
+        self.program = program
+        table = symbol_table.resolveSlots(tree, found_funcs)
+        program.main = Block("main", 1, table.main)
+        for function_name, function in found_funcs.items():
+            program.functions[function_name] = Block(function_name, function.line_nr, table.scope(function_name))
+
+        self.compileBlock(program.main, tree, HALT)
+        for function_name, function in found_funcs.items():
+            block = program.functions[function_name]
+            # the Visitor runs a function as an INPUT assignment followed by the body, jumps count that first statement
+            self.compileBlock(block, [None] + function.commands, RETURN)
+        return program
+
+    # compileBlock :: Block, List[support.Node], int -> None
+    def compileBlock(self, block : Block, node_list : List[support.Node], end_op : int) -> None:
+        """compileBlock function, lowers the statements of one code block and fills in its jumps
+
+        Args:
+            block (Block): layout of the code block
+            node_list (List[support.Node]): statements of the code block, None for the INPUT assignment of a function
+            end_op (int): instruction that ends the block, HALT or RETURN
+        """
+        program = self.program
+        block.entry = len(program.code)
+        jumps = []
+        for index, node in enumerate(node_list):
+            block.addresses.append(len(program.code))
+            if node is not None:
+                self.compileStatement(block, node, index, len(node_list), jumps)
+        block.addresses.append(len(program.code))
+        if end_op == RETURN:
+            program.emit((RETURN, block.output_slot), block.line_nr, block)
+        else:
+            program.emit((HALT,), block.line_nr, block)
+        for address, target in jumps:
+            program.code[address] = (JUMP, block.addresses[target])
+
+    # compileStatement :: Block, support.Node, int, int, List[Tuple[int, int]] -> None
+    def compileStatement(self, block : Block, node : support.Node, index : int, length : int, jumps : List[Tuple[int, int]]) -> None:
+        """compileStatement function, lowers a single statement
+
+        Args:
+            block (Block): layout of the code block
+            node (support.Node): statement to lower
+            index (int): index of the statement in the code block
+            length (int): amount of statements in the code block
+            jumps (List[Tuple[int, int]]): jumps to fill in once al addresses are known, new ones are added
+        """
+        program = self.program
+        line_nr = node.line_nr
+        node_type = type(node)
+
+        if node_type is support.MathNode:
+            function = interpreter.math_functions.get(node.token_type)
+            if function is None:
+                program.emit((ERROR, support.Error("unknown operator in Math statement", line_nr)), line_nr, block)
+                return
+            program.emit((ARITH, function, block.variable(node.value.variable_name), self.operand(block, node.rhs)), line_nr, block)
+
+        elif node_type is support.IfNode:
+            condition = node.condition
+            function = interpreter.condition_functions.get(condition.token_type)
+            if function is None:
+                program.emit((ERROR, support.Error("unknown operator in condition statement", line_nr)), line_nr, block)
+                return
+            new_value_false = -1 if node.new_value_false is None else self.operand(block, node.new_value_false)
+            program.emit((SELECT, function, self.operand(block, condition.value), self.operand(block, condition.condition),
+                          block.variable(node.value.variable_name), self.operand(block, node.new_value_true), new_value_false), line_nr, block)
+
+        elif node_type is support.FunctionCall:
+            callee = program.functions.get(node.value)
+            if callee is None:
+                program.emit((ERROR, support.Error("function " + node.value + " not declared", line_nr)), line_nr, block)
+                return
+            program.emit((CALL, callee, self.operand(block, node.input), block.variable(node.output.variable_name)), line_nr, block)
+
+        elif node_type is support.VariableNode:
+            token_type = node.token_type
+            value = node.value
+            if token_type == enums.token_types.VAR or token_type == enums.token_types.OUTPUT:
+                target = block.variable(node.variable_name)
+                if value.value == "INPUT" or value.token_type == enums.token_types.INPUT:
+                    program.emit((MOVE, target, block.variable("INPUT")), line_nr, block)
+                elif value.token_type == enums.token_types.VAR:
+                    program.emit((MOVE, target, block.variable(value.variable_name)), line_nr, block)
+                else:
+                    program.emit((STORE_CONST, target, block.constant(value.value)), line_nr, block)
+
+            elif token_type == enums.token_types.OUT:
+                program.emit((OUT, self.operand(block, value)), line_nr, block)
+
+            elif token_type == enums.token_types.LINE:
+                if value.token_type == enums.token_types.VAR:
+                    program.emit((JUMP_VAR, block.variable(value.variable_name), index, block.addresses), line_nr, block)
+                    return
+                jump = interpreter.toOperand(value.value)
+                if type(jump) is not int:
+                    program.emit((ERROR, support.Error("Line number to jump to not int", line_nr)), line_nr, block)
+                    return
+                jumps.append((program.emit((JUMP, None), line_nr, block), jumpTarget(index, jump, length)))
+
+            elif token_type == enums.token_types.ERR:
+                program.emit((ERROR, support.Error(value, line_nr)), line_nr, block)
+
+        elif node_type is support.FunctionNode:
+            program.emit((ERROR, support.Error("function " + node.value + " has no END", line_nr)), line_nr, block)
+
+    # operand :: Block, support.Node -> int
+    def operand(self, block : Block, node : support.Node) -> int:
+        if node.token_type == enums.token_types.VAR:
+            return block.variable(node.variable_name)
+        return block.constant(node.value)
+
+class VirtualMachine(object):
+    """VirtualMachine class, runs a compiled Program with a dispatch loop
+
+    Values are plain ints and strings in numbered slots, function calls push the
+    caller on an explicit stack, so the depth of the guest recursion is not limited
+    by the Python stack, only by max_depth. Output matches support.Visitor for programs that only read
+    variables that have a value; an if statement with a variable as new value copies
+    the value that variable has at that moment.
+    """
+    def __init__(self, sink : sinks.Sink = None, max_depth : int = 100000):
+        """__init__ for VirtualMachine
+
+        Args:
+            sink (sinks.Sink, optional): where OUT instructions write to. Defaults to sinks.current() when a program runs.
+            max_depth (int, optional): amount of function calls that may wait for their callee. Defaults to 100000.
+        """
+        self.sink = sink
+        self.max_depth = max_depth
+
+    def __str__(self) -> str:
+        return 'VirtualMachine()'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # run :: Program -> Union[support.Error, dict]
+    def run(self, program : Program) -> Union[support.Error, dict]:
+        """run function, runs a compiled program from the start of the main code
+
+        Args:
+            program (Program): compiled program
+
+        Returns:
+            Union[support.Error, dict]: the first error or the variables of the main code after the last statement
+        """
+        code = program.code
+        to_operand = interpreter.toOperand
+        write = (sinks.current() if self.sink is None else self.sink).write
+        stack = []
+        slots = list(program.main.template)
+        pc = program.main.entry
+
+        while True:
+            instruction = code[pc]
+            op = instruction[0]
+
+            if op == ARITH:
+                lhs = slots[instruction[2]]
+                rhs = slots[instruction[3]]
+                if type(lhs) is int and type(rhs) is int:
+                    slots[instruction[2]] = instruction[1](lhs, rhs)
+                else:
+                    if lhs is None or rhs is None:
+                        return self.unsetError(program, pc, slots, instruction[2:4])
+                    try:
+                        slots[instruction[2]] = instruction[1](to_operand(lhs), to_operand(rhs))
+                    except TypeError:
+                        return support.Error("cant use operator on variables of different type", program.lines[pc])
+                pc += 1
+
+            elif op == SELECT:
+                _, function, lhs_slot, rhs_slot, target, new_value_true, new_value_false = instruction
+                lhs = slots[lhs_slot]
+                rhs = slots[rhs_slot]
+                if type(lhs) is int and type(rhs) is int:
+                    result = function(lhs, rhs)
+                else:
+                    if lhs is None or rhs is None:
+                        return self.unsetError(program, pc, slots, (lhs_slot, rhs_slot))
+                    result = self.compare(function, to_operand(lhs), to_operand(rhs))
+                    if result is None:
+                        pc += 1
+                        continue
+                source = new_value_true if result else new_value_false
+                if source >= 0:
+                    if slots[source] is None:
+                        return self.unsetError(program, pc, slots, (source,))
+                    slots[target] = slots[source]
+                pc += 1
+
+            elif op == JUMP:
+                pc = instruction[1]
+
+            elif op == MOVE:
+                value = slots[instruction[2]]
+                if value is None:
+                    return self.unsetError(program, pc, slots, instruction[2:3])
+                slots[instruction[1]] = value
+                pc += 1
+
+            elif op == STORE_CONST:
+                if slots[instruction[1]] is None:
+                    slots[instruction[1]] = slots[instruction[2]]
+                pc += 1
+
+            elif op == CALL:
+                callee = instruction[1]
+                value = slots[instruction[2]]
+                if value is None:
+                    return self.unsetError(program, pc, slots, instruction[2:3])
+                if len(stack) >= self.max_depth:
+                    return support.Error("function calls nested deeper than " + str(self.max_depth), program.lines[pc])
+                stack.append((pc + 1, slots, instruction[3]))
+                slots = list(callee.template)
+                slots[callee.input_slot] = value
+                pc = callee.entry
+
+            elif op == RETURN:
+                value = slots[instruction[1]]
+                if value is None:
+                    return support.Error("No output specified in function", program.lines[pc])
+                pc, slots, output_slot = stack.pop()
+                slots[output_slot] = value
+
+            elif op == JUMP_VAR:
+                value = slots[instruction[1]]
+                if value is None:
+                    return self.unsetError(program, pc, slots, instruction[1:2])
+                if type(value) is not int:
+                    text = str(value)
+                    if not text.lstrip("-").isnumeric():
+                        return support.Error("Line number to jump to not int", program.lines[pc])
+                    value = int(text)
+                addresses = instruction[3]
+                pc = addresses[jumpTarget(instruction[2], value, len(addresses) - 1)]
+
+            elif op == OUT:
+                value = slots[instruction[1]]
+                if value is None:
+                    return self.unsetError(program, pc, slots, instruction[1:2])
+                write(value)
+                pc += 1
+
+            elif op == ERROR:
+                return instruction[1]
+
+            else:
+                block = program.main
+                return {name : slots[slot] for name, slot in block.slots.items() if slots[slot] is not None}
+
+    # compare :: Callable, support.lit_types, support.lit_types -> Union[bool, None]
+    def compare(self, function, lhs : support.lit_types, rhs : support.lit_types) -> Union[bool, None]:
+        """compare function, condition on operands that are not both ints, the same outcomes as Visitor.visitCondition
+
+        Args:
+            function (Callable): compare operator
+            lhs (support.lit_types): left operand
+            rhs (support.lit_types): right operand
+
+        Returns:
+            Union[bool, None]: outcome, None when the if statement does nothing
+        """
+        if type(lhs) == str and type(rhs) == str:
+            if function is interpreter.condition_functions[enums.token_types.EQUAL] or function is interpreter.condition_functions[enums.token_types.NOTEQUAL]:
+                return function(lhs, rhs)
+            return None
+        elif type(lhs) == int and type(rhs) == int:
+            return function(lhs, rhs)
+        # the Visitor takes the else branch when the types differ
+        return False
+
+    # unsetError :: Program, int, list, Tuple[int] -> support.Error
+    def unsetError(self, program : Program, pc : int, slots : list, read_slots : Tuple[int]) -> support.Error:
+        block = program.owners[pc]
+        for slot in read_slots:
+            if slots[slot] is None:
+                return support.Error("Var " + block.names[slot] + " has no value", program.lines[pc])
+        return support.Error("Var has no value", program.lines[pc])